@@ -3,6 +3,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param days int 1 : last N days
 --
 
 SELECT
@@ -33,7 +34,7 @@ FROM change_configuration_audit
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
-WHERE timestamp > sysdate - INTERVAL '1' DAY -- last N days
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 ORDER BY timestamp ASC -- first/oldest records
 -- ORDER BY timestamp DESC -- most recent records
 -- FETCH FIRST 50 ROWS ONLY -- limit default number of rows returned for large datasets
\ No newline at end of file
@@ -3,6 +3,7 @@
 -- Shows details of ISE nodes' key performance metrics (KPM) like average TPS, average load etc.
 --
 -- 💡 Un/Comment columns to quickly customize queries. Remember the last SELECT column must not end with a `,`.
+-- @param days int 1 : last N days
 --
 
 SELECT
@@ -21,6 +22,6 @@ FROM key_performance_metrics
 -- WHERE logged_time > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE logged_time > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE logged_time > sysdate - INTERVAL '1' HOUR -- last N hours
-WHERE logged_time > sysdate - INTERVAL '1' DAY -- last N days
+WHERE logged_time > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 ORDER BY logged_time ASC -- first/oldest records
 -- ORDER BY logged_time DESC -- most recent records
@@ -14,13 +14,13 @@ SELECT
     http_method as method, -- [DELETE, GET, PATCH, PUT, POST]
     http_code AS status, -- HTTP numeric status code
     http_status, -- ⚠ text, not status code
-    -- request_body, -- ⚠ may contain JSON and may be very large!
+    -- request_body, -- ⚠ may contain JSON and may be very large! Use `isedc.py --lob-dir DIR` for sidecar files
     -- request_id,
     request_name, -- URL of API endpoint
     response_duration AS time, -- milliseconds
     error_message AS error,
     message_text AS text -- ?
-    -- response, -- ⚠ contains the JSON response and may be very large!
+    -- response, -- ⚠ contains the JSON response and may be very large! Use `isedc.py --lob-dir DIR` for sidecar files
 FROM openapi_operations
 ORDER BY timestamp ASC -- first/oldest records
 -- ORDER BY timestamp DESC -- most recent records
@@ -2,6 +2,7 @@
 -- Show a practical view of the radius_accounting table.
 --
 -- 💡 Un/Comment columns to quickly customize queries. Remember the last SELECT column must not end with a `,`.
+-- @param hours int 1 : last N hours
 --
 
 SELECT
@@ -73,7 +74,7 @@ FROM radius_accounting
 -- WHERE acct_session_time > (60*60*24*3) -- sessions > 3 days
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
-WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:hours, 'HOUR') -- last N hours
 -- WHERE timestamp > sysdate - INTERVAL '1' DAY -- last N days
 -- WHERE TO_CHAR(timestamp, 'YYYY-MM-DD') = '2024-11-01' -- match a timestamp by day
 -- WHERE TO_CHAR(timestamp, 'YYYY-MM-DD HH24:MI:SS') = '2024-11-01 00:08:27' -- match a timestamp (YYYY-MM-DD HH24:MI:SS.ffffff)
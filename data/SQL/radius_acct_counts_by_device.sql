@@ -4,6 +4,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param days int 30 : last N days
 --
 
 SELECT
@@ -76,7 +77,7 @@ SELECT
     -- vn,
     COUNT(*) AS total -- total
 FROM radius_accounting
-WHERE timestamp > sysdate - INTERVAL '30' DAY -- last N days
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 -- WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
@@ -6,6 +6,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param hours int 1 : last N hours
 --
 
 SELECT
@@ -50,7 +51,7 @@ FROM radius_authentications
 -- WHERE username = 'INVALID'
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
-WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:hours, 'HOUR') -- last N hours
 -- WHERE timestamp > sysdate - INTERVAL '1' DAY -- last N days
 -- WHERE TO_CHAR(timestamp, 'YYYY-MM-DD') = '2024-11-01' -- match a timestamp by day
 -- WHERE TO_CHAR(timestamp, 'YYYY-MM-DD HH24:MI:SS') = '2024-11-01 00:08:27' -- match a timestamp (YYYY-MM-DD HH24:MI:SS.ffffff)
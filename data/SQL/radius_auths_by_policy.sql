@@ -3,6 +3,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param days int 30 : last N days
 --
 
 SELECT
@@ -54,7 +55,7 @@ FROM radius_authentications
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
-WHERE timestamp > sysdate - INTERVAL '30' DAY -- last N days
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 GROUP BY policy_set_name, access_service, authentication_method, authentication_protocol, authorization_rule, authorization_profiles
 -- GROUP BY policy_set_name
 ORDER BY policy_set_name ASC, total DESC 
@@ -1,6 +1,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param days int 1 : last N days
 --
 
 SELECT
@@ -12,7 +13,7 @@ FROM radius_authentications
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
-WHERE timestamp > sysdate - INTERVAL '1' DAY -- last N days
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 GROUP BY username
 ORDER BY username ASC
 -- FETCH FIRST 50 ROWS ONLY -- limit default number of rows returned for large datasets
@@ -3,6 +3,7 @@
 --
 -- Author: Thomas Howard, thomas@cisco.com
 -- License: MIT - https://mit-license.org
+-- @param days int 30 : last N days
 --
 
 SELECT
@@ -53,7 +54,7 @@ WHERE failure_reason LIKE '22056%'
 -- AND timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- AND timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- AND timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
-  AND timestamp > sysdate - INTERVAL '30' DAY -- last N days
+  AND timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 -- AND TO_CHAR(timestamp, 'YYYY-MM-DD') = '2024-11-01' -- match a timestamp by day
 -- AND TO_CHAR(timestamp, 'YYYY-MM-DD HH24:MI:SS') = '2024-11-01 00:08:27' -- match a timestamp (YYYY-MM-DD HH24:MI:SS.ffffff)
 -- AND timestamp > TIMESTAMP '2024-11-01 00:00:00' -- after a timestamp
@@ -5,6 +5,7 @@
 -- License: MIT - https://mit-license.org
 --
 -- 💡 Un/Comment columns to quickly customize queries. Remember the last SELECT column must not end with a `,`.
+-- @param hours int 1 : last N hours
 --
 
 SELECT
@@ -23,7 +24,7 @@ SELECT
 FROM system_summary
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
-WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
+WHERE timestamp > sysdate - NUMTODSINTERVAL(:hours, 'HOUR') -- last N hours
 -- WHERE timestamp > sysdate - INTERVAL '1' DAY -- last N days
     -- AND ise_node = 'ise-ppan'
 ORDER BY timestamp ASC
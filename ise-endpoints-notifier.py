@@ -3,7 +3,8 @@
 Periodically queries ISE via the Data Connect feature for new endpoints and sends a notification when new endpoint(s) are detected.
 The default query period is 1 minute.
 The endpoint data is augmented with the respective IEEE OUI Organization name.
-You may optionally specify an initial `--after` datetime for the first query.
+Only endpoints created after the persistent watermark (saved in `isedc_watermarks.json`) are returned so none are missed or repeated across restarts.
+You may optionally specify an `--after` datetime to reset the watermark.
 The default notification goes to ntfy.sh using the public `ise-endpoints-notifier` topic but you may create your own topic or alternate notification mechanism (email, SMS, webhook, etc.).
 
 Rquired environment variables:
@@ -26,7 +27,6 @@ Usage:
 __license__ = "MIT - https://mit-license.org/"
 
 from isedc import ISEDC
-from string import Template
 from typing import Union
 import argparse
 import csv
@@ -90,6 +90,8 @@ def ntfy(topic: str = None, title: str = "", data: str = None, headers: dict = {
     requests.post(f"https://ntfy.sh/{topic}", data=data.encode("utf-8"), headers=headers)
 
 
+WATERMARK_NAME = "ise-endpoints-notifier"  # incremental query name
+
 SQL_ENDPOINTS_CREATED = """
 SELECT
     mac_address AS mac,
@@ -100,11 +102,10 @@ SELECT
     endpoint_policy, -- endpoint profile classification
     -- static_group_assignment AS static_grp,
     -- static_assignment AS static, -- 
-    matched_value AS cf -- Matched Certainty Factor (CF)
+    matched_value AS cf, -- Matched Certainty Factor (CF)
+    create_time -- incremental query watermark column
 FROM endpoints_data
-WHERE create_time >= TIMESTAMP '$timestamp' -- after time of last query
-  AND NOT REGEXP_LIKE(mac_address, '^.[26AE].*') -- do not include randomized MACs
-ORDER BY create_time ASC
+WHERE NOT REGEXP_LIKE(mac_address, '^.[26AE].*') -- do not include randomized MACs
 """
 
 
@@ -142,24 +143,22 @@ def show(endpoints: [dict] = None, format: str = "table") -> None:
     print(tabulate.tabulate(endpoints, headers="keys", tablefmt=format), file=sys.stdout)
 
 
-def get_endpoints_after(timestamp: int = 0) -> [dict]:
+def get_new_endpoints(overlap: int = 0) -> [dict]:
     """
-    Returns a list of of endpoint dictionaries for all new endpoints after `timestamp`.
-    - timestamp (int) : seconds since the Unix epoch
+    Returns a list of of endpoint dictionaries for all new endpoints since the last query watermark.
+    - overlap (int) : seconds to re-read before the watermark for late-committed endpoints
     - returns ([dict]) : list of new endpoints as dictionaries
     """
-    timestamp = int(timestamp)  # remove milli/micro-seconds
-    timestamp_dt_str = datetime.datetime.fromtimestamp(timestamp).strftime(FS_ISO8601_DT)
-    dhms = timestamp_to_dhms(datetime.datetime.now().timestamp() - timestamp)
-    after_dt_str = datetime.datetime.fromtimestamp(timestamp).strftime(FS_ISO8601_DT)
-    sql_endpoints_created_after = Template(SQL_ENDPOINTS_CREATED).substitute(timestamp=after_dt_str)
-    cursor = isedc.query(sql_endpoints_created_after)
-    rows = cursor.fetchall()
+    watermark = isedc.get_watermark(WATERMARK_NAME)
     endpoints = []
-    if len(rows) > 0:
-        headers = [f"{column[0]}".lower() for column in cursor.description]
-        endpoints = [dict(zip(headers, row)) for row in rows]  # make a list of dicts
-    log.info(f"{len(endpoints)} new endpoints since ⏲ {timestamp_dt_str} ▽ {timestamp} ⧖ {dhms} ago")
+    for headers, rows in isedc.query_incremental(WATERMARK_NAME, SQL_ENDPOINTS_CREATED, column="create_time", key="mac", overlap=overlap):
+        endpoints.extend([dict(zip(headers, row)) for row in rows])  # make a list of dicts
+    for endpoint in endpoints:
+        endpoint.pop("create_time")  # use the `created` string without fractional seconds
+    if watermark:
+        timestamp = datetime.datetime.fromisoformat(watermark["timestamp"])
+        dhms = timestamp_to_dhms(datetime.datetime.now().timestamp() - timestamp.timestamp())
+        log.info(f"{len(endpoints)} new endpoints since ⏲ {timestamp.strftime(FS_ISO8601_DT)} ⧖ {dhms} ago")
     return endpoints
 
 
@@ -183,10 +182,11 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, lambda signum, frame: sys.exit(0))  # Handle CTRL+C interrupts gracefully
 
     argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
-    argp.add_argument("-a", "--after", type=str, default=None, help="query after datetime, YYYY-MM-DD HH:MM:SS")
+    argp.add_argument("-a", "--after", type=str, default=None, help="reset the watermark to datetime, YYYY-MM-DD HH:MM:SS")
     argp.add_argument("-f", "--format", choices=["github", "markdown", "table"], default="table", help="output format or styling")
     argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certs (allow self-signed)")
     argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
+    argp.add_argument("-o", "--overlap", type=int, default=0, help="seconds to re-read before the watermark for late-committed endpoints")
     argp.add_argument("-p", "--period", type=int, default=PERIOD_DEFAULT, help="query period, in seconds")
     argp.add_argument("-s", "--show", action="store_true", help="show new endpoints")
     args = argp.parse_args()
@@ -204,12 +204,11 @@ if __name__ == "__main__":
         level=args.level,
     ) as isedc:
 
-        # find new endpoints
-        now_ts = datetime.datetime.now(tz=None).timestamp()
-        period_start = datetime.datetime.strptime(args.after, FS_ISO8601_DT).timestamp() if args.after else now_ts
+        # find new endpoints after the saved watermark, `--after`, or now
+        if args.after:
+            isedc.set_watermark(WATERMARK_NAME, datetime.datetime.strptime(args.after, FS_ISO8601_DT))
         while True:
-            endpoints = get_endpoints_after(timestamp=period_start)
-            period_start = datetime.datetime.now(tz=None).timestamp()  # tz=None uses the local system's timezone
+            endpoints = get_new_endpoints(overlap=args.overlap)
             if ieee_oui_dict:
                 endpoints = add_ieee_oui_attributes(endpoints)
             send_endpoints_notification(endpoints, NTFY_TOPIC)
@@ -3,6 +3,7 @@
 # Verify using `env` for `echo $ISE_PPAN`
 export ISE_PPAN=1.2.3.4               # hostname or IP address of ISE Primary PAN
 export ISE_PMNT=1.2.3.4               # hostname or IP address of ISE Primary MNT
+# export ISE_SMNT=1.2.3.5             # Optional: ISE Secondary MNT(s), comma-separated, for isedc.py query sharing and failover
 export ISE_REST_USERNAME=admin        # ISE REST API admin or operator username
 export ISE_REST_PASSWORD='ISEisC00L'  # ISE REST API admin or operator password
 export ISE_VERIFY=false               # validate the ISE certificate or not
@@ -7,6 +7,12 @@ Examples:
   ise-post-endpoints.py
   ise-post-endpoints.py 10
   ise-post-endpoints.py 100 -v
+  ise-post-endpoints.py 500000 --bulk 500
+  ise-post-endpoints.py --file endpoints.json --bulk 1000
+  ise-post-endpoints.py --file data/YAML/endpoint-example.yaml
+
+The `--bulk` option requires ISE 3.2+ for the OpenAPI bulk endpoint resource (/api/v1/endpoint/bulk).
+Endpoints are sent in batches of the specified size and several batches are sent concurrently.
 
 Requires setting the these environment variables using the `export` command:
   export ISE_PPAN='1.2.3.4'             # hostname or IP address of ISE Primary PAN
@@ -30,7 +36,10 @@ import io
 import json
 import os
 import random
+import sys
+import yaml
 from faker import Faker     # generate fake endpoints, MACs, IPs
+from mac_index import MACIndex
 
 JSON_HEADERS = {'Accept':'application/json', 'Content-Type':'application/json'}
 REST_PAGE_SIZE_DEFAULT=20
@@ -44,6 +53,12 @@ TCP_LIMIT_DEFAULT=10
 TCP_LIMIT_MAX=30
 TCP_LIMIT=5
 
+# ISE 3.2+ OpenAPI bulk endpoint create/update/delete
+# 💡 Very large batches may time out; 500-1000 endpoints per request works well
+BULK_PATH='/api/v1/endpoint/bulk'
+BULK_SIZE_DEFAULT=500
+BULK_SIZE_MAX=5000
+
 # ISE Context Visibility > Export columns
 # ⚠ Note that ISE does not include custom endpoint attributes!
 ISE_CV_DEFAULT_ENDPOINT_EXPORT_COLUMNS = [
@@ -83,6 +98,7 @@ ISE_CV_DEFAULT_ENDPOINT_EXPORT_COLUMNS = [
 
 faker = Faker('en-US')  # fake data generator
 mac_cache = {}          # MAC cache to ensure uniqueness
+mac_index = None        # optional persistent index of existing ISE endpoint MACs
 
 
 def get_random_mac ():
@@ -91,12 +107,58 @@ def get_random_mac ():
     """
     n = 1
     mac = faker.mac_address().upper()
-    while (mac in mac_cache):
+    while (is_existing(mac)):
         mac = faker.mac_address().upper()
-    mac_cache[mac] = 1    # cache it
+    mac_cache[normalize_mac(mac)] = 1    # cache it
     return mac
 
 
+def normalize_mac (mac:str=None):
+    """
+    Returns the MAC address in the `XX:XX:XX:XX:XX:XX` format used as the mac_cache key.
+    Invalid MAC addresses are returned stripped and uppercased so they are still de-duplicated.
+    """
+    try:
+        return MACIndex.to_mac(MACIndex.to_int(mac))
+    except ValueError:
+        return str(mac).strip().upper()
+
+
+def is_existing (mac:str=None):
+    """
+    Returns True if the MAC address is already known to exist in ISE.
+    """
+    mac = normalize_mac(mac)
+    return mac in mac_cache or (mac_index is not None and mac in mac_index)
+
+
+def is_new (mac:str=None):
+    """
+    Returns True and caches the MAC address if it does not already exist in ISE or the cache.
+    """
+    if is_existing(mac):
+        return False
+    mac_cache[normalize_mac(mac)] = True
+    return True
+
+
+def unwrap_endpoint (resource:dict=None):
+    """
+    Returns the endpoint attributes from an ERS `{ "ERSEndPoint": {...} }` resource or a plain endpoint.
+    """
+    return resource.get('ERSEndPoint', resource)
+
+
+def save_mac_index ():
+    """
+    Add the newly created MACs to the persistent MAC index, if any.
+    ⚠ MACs from failed requests are also added and will be skipped on the next run until the index is rebuilt.
+    """
+    if mac_index is not None:
+        mac_index.update(mac_cache.keys())
+        mac_index.save()
+
+
 async def get_ise_endpointgroup_id(session:aiohttp.ClientSession=None, name:str='Unknown'):
     """
     Returns the id of the endpoint group with the specified name.
@@ -134,6 +196,133 @@ def generate_random_endpoint (groupid:str=None):
     return resource
 
 
+def load_endpoints (filepath:str=None):
+    """
+    Returns a list of endpoint objects loaded from a JSON, YAML or CSV file.
+    JSON and YAML files use the `{ "endpoint": [ {...}, ... ] }` format of `make-ise-endpoint.py` and `data/YAML`.
+    CSV files use the ISE Context Visibility endpoint export columns (`MACAddress`, `Description`, ...).
+    """
+    with open(filepath, mode='r', encoding='utf-8', newline='') as fh:
+        if filepath.lower().endswith('.csv'):
+            endpoints = []
+            for row in csv.DictReader(fh):
+                endpoints.append({
+                    'name': row.get('MACAddress'),
+                    'mac': row.get('MACAddress'),
+                    'description': row.get('Description', ''),
+                })
+            return endpoints
+        data = yaml.safe_load(fh)   # YAML is a superset of JSON
+    return data.get('endpoint', data.get('endpoints', [])) if isinstance(data, dict) else data
+
+
+def to_openapi_endpoint (resource:dict=None, groupid:str=None):
+    """
+    Returns the endpoint in the ISE OpenAPI (/api/v1/endpoint) format.
+    ERS endpoints are unwrapped from `ERSEndPoint` and the ERS-only `*Defined` flags are removed.
+    """
+    endpoint = dict(unwrap_endpoint(resource))
+    endpoint = { k:v for k,v in endpoint.items() if not k.endswith('Defined') }
+    endpoint['name'] = endpoint.get('name') or endpoint['mac']
+    endpoint['groupId'] = endpoint.get('groupId') or groupid
+    custom = endpoint.get('customAttributes')
+    if isinstance(custom, dict) and 'customAttributes' in custom:  # ERS nests custom attributes
+        endpoint['customAttributes'] = custom['customAttributes']
+    return endpoint
+
+
+def bulk_failures (batch:list=None, status:int=None, data=None):
+    """
+    Returns a list of (mac, message) tuples for the items that failed in a bulk response.
+    A failed request fails every item in the batch. A successful response may report each item in a list of results or in
+    a bulk status (`{ "BulkStatus": { "resourcesStatus": [...] } }`); any other body, like a bulk request id, has no item failures.
+    """
+    if status not in [200, 201, 202]:
+        message = data
+        if isinstance(data, dict):  # OpenAPI error: { "message": "..." } or ERS: { "ERSResponse": { "messages": [...] } }
+            message = data.get('message') or json.dumps(data)
+        return [ (endpoint['mac'], f"{status} {message}") for endpoint in batch ]
+    if isinstance(data, dict):
+        data = data.get('BulkStatus', data).get('resourcesStatus')
+    failures = []
+    for n,item in enumerate(data if isinstance(data, list) else []):
+        if not isinstance(item, dict):
+            continue
+        state = str(item.get('resourceExecutionStatus') or item.get('status') or 'SUCCESS').upper()  # bulk status or result status
+        if item.get('error') or state not in ['SUCCESS', 'SUCCEEDED']:
+            mac = item.get('mac') or item.get('name') or (batch[n]['mac'] if n < len(batch) else '?')
+            failures.append( (mac, item.get('error') or item.get('message') or item.get('status') or state) )
+    return failures
+
+
+async def post_bulk_endpoints (session:aiohttp.ClientSession=None, batch_q:asyncio.Queue=None, results:dict=None, unauthorized:asyncio.Event=None):
+    """
+    Take batches of endpoints from the queue and POST each batch to the ISE OpenAPI bulk endpoint resource.
+    After a 401 or 403, the workers only drain the queue so no more requests are sent with bad credentials.
+    """
+    while True:
+        n, batch = await batch_q.get()  # Wait for a batch in the queue
+        try:
+            if unauthorized.is_set():
+                continue
+            async with session.post(BULK_PATH, data=json.dumps(batch)) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:  # not JSON
+                    data = await response.text()
+                failures = bulk_failures(batch, response.status, data)
+            if response.status in [401, 403]:
+                if not unauthorized.is_set():
+                    print(f"Set the environment variables and verify your credentials are correct! {response.status} {data}", file=sys.stderr)
+                unauthorized.set()  # abort all workers
+            results['sent'] += len(batch)
+            results['failed'] += len(failures)
+            if failures:
+                print(f"✖ batch {n} {response.status} {len(failures)}/{len(batch)} failed")
+                for mac, message in failures:
+                    print(f"✖ {mac} {message}")
+            elif args.verbose:
+                print(f"✔ batch {n} {response.status} {len(batch)} endpoints")
+        except Exception as e:  # catch *all* exceptions so the worker continues
+            results['sent'] += len(batch)
+            results['failed'] += len(batch)
+            print(f"✖ batch {n} {e.__class__.__name__} {e}", file=sys.stderr)
+        finally:
+            batch_q.task_done()  # Notify queue item is done
+
+
+async def create_bulk_endpoints (session:aiohttp.ClientSession=None, endpoints=None, bulk_size:int=BULK_SIZE_DEFAULT):
+    """
+    Create the endpoints in batches of `bulk_size` with up to TCP_LIMIT concurrent bulk requests.
+    - endpoints: an iterable of OpenAPI endpoint objects
+    """
+    batch_q = asyncio.Queue(maxsize=TCP_LIMIT * 2)  # bound the generated batches waiting in memory
+    results = { 'sent': 0, 'failed': 0, 'unauthorized': False }
+    unauthorized = asyncio.Event()
+    workers = [ asyncio.create_task(post_bulk_endpoints(session, batch_q, results, unauthorized)) for n in range(TCP_LIMIT) ]
+    try:
+        batch = []
+        n = 0
+        for endpoint in endpoints:
+            if unauthorized.is_set():
+                batch = []
+                break  # stop generating batches
+            batch.append(endpoint)
+            if len(batch) >= bulk_size:
+                n += 1
+                await batch_q.put((n, batch))
+                batch = []
+        if batch:
+            n += 1
+            await batch_q.put((n, batch))
+        await batch_q.join()  # Block until all batches are processed
+    finally:
+        [ worker.cancel() for worker in workers ]
+    results['unauthorized'] = unauthorized.is_set()
+    print(f"{'✖' if results['failed'] else '✔'} {results['sent'] - results['failed']}/{results['sent']} endpoints created in {n} batches")
+    return results
+
+
 async def get_resource (session:aiohttp.ClientSession=None, url:str=None):
     async with session.get(url) as resp:
         response = await resp.json()
@@ -171,16 +360,20 @@ async def cache_existing_endpoints (session:aiohttp.ClientSession=None):
 
     # Add endpoint MACs to the cache with a simple flag
     for resource in resources:
-        mac_cache[resource['name']] = True
+        mac_cache[normalize_mac(resource['name'])] = True
 
 
 async def create_ise_endpoints ():
 
     argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
-    argp.add_argument('number', action='store', type=int, default=1, help='Number of endpoints to create',)
+    argp.add_argument('number', action='store', type=int, nargs='?', default=1, help='Number of endpoints to create',)
+    argp.add_argument('--bulk', '-b', action='store', type=int, default=0, help=f'ISE 3.2+ bulk create with N endpoints per request (default N={BULK_SIZE_DEFAULT}, max {BULK_SIZE_MAX})', nargs='?', const=BULK_SIZE_DEFAULT)
+    argp.add_argument('--file', '-f', action='store', type=str, default=None, help='JSON, YAML or CSV file of endpoints to create instead of random endpoints',)
+    argp.add_argument('--index', '-x', action='store', type=str, default=None, help='persistent MAC index file of existing endpoints (see mac_index.py) instead of reading all ERS endpoints',)
     argp.add_argument('--verbose', '-v', action='count', default=0, help='Verbosity',)
 
     global args     # promote to global scope for use in other functions
+    global mac_index
     args = argp.parse_args()
 
     # Load Environment Variables
@@ -195,14 +388,41 @@ async def create_ise_endpoints ():
     session = aiohttp.ClientSession(base_url, auth=auth, connector=tcp_conn, headers=JSON_HEADERS)
 
     # Cache existing ISE endpoints to prevent duplicates and HTTP 400 errors 
-    await asyncio.wait_for(cache_existing_endpoints(session), 60)
-    if args.verbose: print(f"ⓘ mac_cache size: {len(mac_cache)}")
+    if args.index:
+        mac_index = MACIndex(args.index)
+        if len(mac_index) == 0:  # build the index once with an ERS walk
+            await mac_index.build_from_ers(session, REST_PAGE_SIZE, TCP_LIMIT)
+        if args.verbose: print(f"ⓘ mac_index size: {len(mac_index)}")
+    else:
+        await asyncio.wait_for(cache_existing_endpoints(session), 60)
+        if args.verbose: print(f"ⓘ mac_cache size: {len(mac_cache)}")
 
     # 💡 No guarantee of default identifiers across ISE deployments!
     endpoint_group_id = await get_ise_endpointgroup_id(session, 'Unknown')
 
+    if args.bulk:
+        if args.bulk < 1 or args.bulk > BULK_SIZE_MAX:
+            raise ValueError(f'--bulk must be 1-{BULK_SIZE_MAX}')
+        if args.file:
+            endpoints = ( to_openapi_endpoint(e, endpoint_group_id) for e in load_endpoints(args.file) if is_new(unwrap_endpoint(e)['mac']) )
+        else:  # generate endpoints lazily as batches are queued
+            endpoints = ( to_openapi_endpoint(generate_random_endpoint(endpoint_group_id)) for n in range(args.number) )
+        results = await create_bulk_endpoints(session, endpoints, args.bulk)
+        await session.close()
+        save_mac_index()
+        if results['unauthorized']:
+            sys.exit(1)
+        return
+
     # Generate requested number of endpoints
     endpoints = []
+    if args.file:
+        for endpoint in load_endpoints(args.file):
+            endpoint = unwrap_endpoint(endpoint)
+            if not is_new(endpoint['mac']):
+                continue
+            endpoints.append({ 'ERSEndPoint': { 'name': endpoint['mac'], 'groupId': endpoint_group_id, **endpoint } })
+        args.number = 0  # do not generate random endpoints
     for n in range(1, args.number + 1):
         endpoints.append( generate_random_endpoint(endpoint_group_id) )
     if args.verbose: print(f"ⓘ Generated {len(endpoints)} endpoints")
@@ -221,6 +441,7 @@ async def create_ise_endpoints ():
             print(f"✖ {n} {response.status}:\n{json.dumps(await response.json(), indent=2)}")
 
     await session.close()
+    save_mac_index()
 
 
 def main ():
@@ -7,6 +7,25 @@ Examples:
   ise-post-internalusers.py
   ise-post-internalusers.py -n 10
   ise-post-internalusers.py -n 100 -vt
+  ise-post-internalusers.py -n 100000 --policy password-policy.yaml --retries 1
+  ise-post-internalusers.py --file data/CSV/internalusers-pseudoco.csv -t
+
+The `--file` option streams users from an ISE internal users import CSV file (see `data/CSV/internalusers-*.csv`).
+
+Each user gets a unique, random password that is validated locally against the ISE internal user password policy
+before it is sent so that ISE does not reject it. ISE has no REST API to read this policy so it is read once from the
+optional `--policy` YAML/JSON file with the same settings as Administration > Identity Management > Settings >
+User Authentication Settings > Password Policy, otherwise the ISE defaults are used:
+
+  min_length: 4               # minimum password length
+  max_length: 127             # maximum password length (ISE maximum)
+  lowercase: true             # require lowercase alphabetic characters
+  uppercase: true             # require uppercase alphabetic characters
+  digits: true                # require numeric characters
+  special: false              # require non-alphanumeric characters
+  no_username: true           # must not contain the username or its characters in reverse order
+  no_words: [cisco]           # must not contain these words or their characters in reverse order
+  max_repeat: 4               # must not contain a character repeated this many times consecutively
 
 Requires setting the these environment variables using the `export` command:
   export ISE_PPAN='1.2.3.4'             # hostname or IP address of ISE Primary PAN
@@ -31,18 +50,37 @@ import csv
 import io
 import json
 import os
-import random
+import secrets
+import string
 import sys
 import time
+import yaml
 
 # Globals
 REST_PAGE_SIZE_DEFAULT = 20
 REST_PAGE_SIZE_MAX = 100
 REST_PAGE_SIZE = REST_PAGE_SIZE_MAX
 WORKERS_MAX = 20
+RETRIES_DEFAULT = 2  # maximum retries per user before giving up
+PASSWORD_LENGTH = 16  # generated password length, if allowed by the policy
+PASSWORD_SPECIALS = "!#%*+-.:=?@^_~"  # special characters safe for JSON, CSV and shells
+
+# ISE default internal user password policy
+PASSWORD_POLICY_DEFAULT = {
+    "min_length": 4,
+    "max_length": 127,
+    "lowercase": True,
+    "uppercase": True,
+    "digits": True,
+    "special": False,
+    "no_username": True,
+    "no_words": ["cisco"],
+    "max_repeat": 4,
+}
 
 faker = Faker("en-US")  # fake data generator
 username_cache = {}  # NAS identifier name cache to ensure uniqueness
+password_cache = set()  # generated passwords to ensure uniqueness
 
 
 def make_username(firstname=faker.first_name(), lastname=faker.last_name()):
@@ -59,6 +97,61 @@ def make_username(firstname=faker.first_name(), lastname=faker.last_name()):
     return username
 
 
+def load_password_policy(filepath: str = None) -> dict:
+    """
+    Returns the password policy from the YAML or JSON file merged with the ISE default password policy.
+    """
+    policy = dict(PASSWORD_POLICY_DEFAULT)
+    if filepath:
+        with open(filepath, mode="r", encoding="utf-8") as fh:
+            policy.update(yaml.safe_load(fh) or {})  # YAML is a superset of JSON
+    return policy
+
+
+def password_violations(password: str = None, username: str = None, policy: dict = PASSWORD_POLICY_DEFAULT) -> list:
+    """
+    Returns a list of the password policy violations for the password, if any.
+    """
+    violations = []
+    if len(password) < policy["min_length"]:
+        violations.append(f"shorter than {policy['min_length']}")
+    if len(password) > policy["max_length"]:
+        violations.append(f"longer than {policy['max_length']}")
+    if policy["lowercase"] and not any(c in string.ascii_lowercase for c in password):
+        violations.append("no lowercase")
+    if policy["uppercase"] and not any(c in string.ascii_uppercase for c in password):
+        violations.append("no uppercase")
+    if policy["digits"] and not any(c in string.digits for c in password):
+        violations.append("no digits")
+    if policy["special"] and all(c.isalnum() for c in password):
+        violations.append("no special characters")
+    words = list(policy["no_words"]) + ([username] if policy["no_username"] and username else [])
+    for word in words:
+        if word.lower() in password.lower() or word[::-1].lower() in password.lower():
+            violations.append(f"contains '{word}'")
+    repeat = policy["max_repeat"]
+    if repeat and any(password[i : i + repeat] == password[i] * repeat for i in range(len(password) - repeat + 1)):
+        violations.append(f"{repeat}+ repeated characters")
+    return violations
+
+
+def make_password(username: str = None, policy: dict = PASSWORD_POLICY_DEFAULT) -> str:
+    """
+    Returns a unique, random password that complies with the password policy.
+    """
+    length = min(max(PASSWORD_LENGTH, policy["min_length"]), policy["max_length"])
+    classes = [string.ascii_lowercase, string.ascii_uppercase, string.digits] + ([PASSWORD_SPECIALS] if policy["special"] else [])
+    alphabet = "".join(classes)
+    while True:
+        chars = [secrets.choice(c) for c in classes]  # at least one of each character class
+        chars += [secrets.choice(alphabet) for n in range(length - len(chars))]
+        secrets.SystemRandom().shuffle(chars)  # cryptographically secure, like secrets.choice()
+        password = "".join(chars)
+        if password not in password_cache and not password_violations(password, username, policy):
+            password_cache.add(password)
+            return password
+
+
 async def get_ise_identitygroup_id(session: aiohttp.ClientSession = None, name: str = "Employee"):
     """
     Returns the id of the ISE identitygroup with the specified name.
@@ -67,14 +160,14 @@ async def get_ise_identitygroup_id(session: aiohttp.ClientSession = None, name:
     return (await response.json()).popitem()[1]["id"]  # popitem returns (k,v)
 
 
-def generate_random_internaluser_data(username: str = None, password: str = None, groupid: str = None):
+def generate_random_internaluser_data(username: str = None, password: str = None, groupid: str = None, policy: dict = PASSWORD_POLICY_DEFAULT):
     """
     Return an internaluser object ready for conversion to JSON.
     """
     firstname = faker.first_name()
     lastname = faker.last_name()
     username = make_username(firstname, lastname) if username is None else username
-    password = "C1sco12345" if password is None else password
+    password = make_password(username, policy) if password is None else password
 
     resource = {
         "InternalUser": {
@@ -131,6 +224,90 @@ def generate_random_internaluser_data(username: str = None, password: str = None
     return resource
 
 
+async def get_ise_identitygroups(session: aiohttp.ClientSession = None) -> dict:
+    """
+    Returns a dict of all ISE identitygroup { name : id }.
+    """
+    rest_endpoint_path = "/ers/config/identitygroup"
+    response = await session.get(f"{rest_endpoint_path}?size={REST_PAGE_SIZE}")
+    json = await response.json()
+    resources = json["SearchResult"]["resources"]
+    total = json["SearchResult"]["total"]
+    pages = int(total / REST_PAGE_SIZE) + (1 if total % REST_PAGE_SIZE else 0)
+    urls = [f"{rest_endpoint_path}?size={REST_PAGE_SIZE}&page={page}" for page in range(2, pages + 1)]
+    [resources.extend(response) for response in await asyncio.gather(*[get_resource(session, url) for url in urls])]
+    return {resource["name"]: resource["id"] for resource in resources}
+
+
+def parse_csv_header(header: str = None) -> tuple:
+    """
+    Returns the (name, type) of an ISE import CSV header with an optional type in parentheses.
+    Example: "Enable User(Yes/No)" returns ("Enable User", "Yes/No").
+    """
+    name, _, type = header.partition("(")
+    return (name.strip(), type.rstrip(")").strip() or None)
+
+
+def parse_csv_value(value: str = None, type: str = None):
+    """
+    Returns the CSV value converted to the header type: `True/False` and `Yes/No` to bool, `MM/dd/yyyy` to `yyyy-MM-dd`.
+    """
+    value = value.strip() if value else ""
+    if type in ["True/False", "Yes/No"]:
+        return value[0:1].lower() in ["t", "y"]
+    if type == "MM/dd/yyyy" and value:
+        month, day, year = value.split("/")
+        year = f"20{year}" if len(year) == 2 else year  # 1/1/24
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return value
+
+
+def read_internalusers_csv(filepath: str = None, identitygroups: dict = {}):
+    """
+    Yield internaluser objects from an ISE internal users import CSV file, one row at a time.
+    `User Identity Groups` names are resolved to IDs with the `identitygroups` { name : id } dict.
+    Rows with encrypted passwords are rejected because ERS only accepts plaintext passwords.
+    """
+    with open(filepath, mode="r", encoding="utf-8-sig", newline="") as fh:
+        reader = csv.reader(fh)
+        headers = [parse_csv_header(header) for header in next(reader)]
+        for row in reader:
+            if not row:
+                continue
+            user = {name: parse_csv_value(value, type) for (name, type), value in zip(headers, row)}
+            encrypted = [name for name in ["Is Password Encrypted", "Is Enable Password Encrypted"] if user.get(name)]
+            if encrypted:
+                print(f"✖ {user['User Name']} {' and '.join(encrypted)}: ERS requires plaintext passwords", file=sys.stderr)
+                continue
+            groups = [group.strip() for group in user.get("User Identity Groups", "").split(",") if group.strip()]
+            missing = [group for group in groups if group not in identitygroups]
+            if missing:
+                print(f"✖ {user['User Name']} unknown identity groups: {', '.join(missing)}", file=sys.stderr)
+                continue
+            internaluser = {
+                "name": user["User Name"],
+                "description": user.get("User Details", ""),
+                "enabled": user.get("Enable User", True),
+                "password": user["Password"],
+                "email": user.get("Email", ""),
+                "firstName": user.get("First Name", ""),
+                "lastName": user.get("Last Name", ""),
+                "identityGroups": ",".join([identitygroups[group] for group in groups]),
+                "passwordIDStore": user.get("Password ID Store") or "Internal Users",
+                "changePassword": user.get("Change Password on Next Login", False),
+                "expiryDateEnabled": bool(user.get("Expiry Date")),
+                "passwordNeverExpires": user.get("Password Never Expires", True),
+                "customAttributes": {},
+            }
+            if user.get("Enable Password"):
+                internaluser["enablePassword"] = user["Enable Password"]
+            if user.get("Expiry Date"):
+                internaluser["expiryDate"] = user["Expiry Date"]
+            if user.get("Account Name Alias"):
+                internaluser["accountNameAlias"] = user["Account Name Alias"]
+            yield {"InternalUser": internaluser}
+
+
 async def get_resource(session, url):
     async with session.get(url, ssl=False) as resp:
         response = await resp.json()
@@ -166,43 +343,59 @@ async def cache_existing_internalusers(session):
     return username_cache
 
 
-async def ise_internaluser_creator(queue, session):
+async def ise_internaluser_creator(queue, session, unauthorized: asyncio.Event = None):
+    """
+    Take users from the queue and POST them with retries.
+    After a 401, the workers only drain the queue so no more requests are sent with bad credentials.
+    """
     PATH = "/ers/config/internaluser"
     while True:
         user_dict = await queue.get()  # Get an item from the queue
-        response = await session.post(PATH, data=json.dumps(user_dict))
-        if response.status == 201:
-            print(
-                f"✔ {response.status} | {user_dict['InternalUser']['name']} | {response.headers['Location'].split('/')[-1]}",
-                file=sys.stderr,
-            )
-        elif response.status == 400 and (await response.json())["ERSResponse"]["messages"][0]["title"].find("Password"):
-            # 🐞 ISE will randomly complain about Password Policy even though it's fine
-            print(f"🐞 Password Policy error: Re-queue {user_dict['InternalUser']['name']}", file=sys.stderr)
-            queue.put_nowait(user_dict)
-        elif response.status == 401:
-            print(f"Set the environment variables and verify your credentials are correct! {await response.json()}", file=sys.stderr)
-            break
-        else:
-            error = await response.json()
-            print(
-                f"✖ {response.status} {user_dict['InternalUser']['name']} {error['ERSResponse']['messages'][0]['title']}", file=sys.stderr
-            )
-        queue.task_done()  # Notify queue the item is processed
+        username = user_dict["InternalUser"]["name"]
+        try:
+            if unauthorized.is_set():
+                continue
+            for attempt in range(args.retries + 1):
+                response = await session.post(PATH, data=json.dumps(user_dict))
+                if response.status == 201:
+                    print(f"✔ {response.status} | {username} | {response.headers['Location'].split('/')[-1]}", file=sys.stderr)
+                    break
+                elif response.status == 401:
+                    if not unauthorized.is_set():
+                        print(f"Set the environment variables and verify your credentials are correct! {await response.text()}", file=sys.stderr)
+                    unauthorized.set()  # abort all workers
+                    break
+                error = (await response.json())["ERSResponse"]["messages"][0]["title"]
+                if response.status == 400 and "Password" in error and attempt < args.retries:
+                    # 🐞 ISE will randomly complain about Password Policy even though it's fine
+                    print(f"🐞 Password Policy error: Retry {username} ({attempt + 1}/{args.retries})", file=sys.stderr)
+                    if args.file is None:  # never change a password from a file
+                        user_dict["InternalUser"]["password"] = make_password(username, policy)
+                else:
+                    print(f"✖ {response.status} {username} {error}", file=sys.stderr)
+                    break
+        except Exception as e:  # catch *all* exceptions so the worker continues
+            print(f"✖ {username} {e.__class__.__name__} {e}", file=sys.stderr)
+        finally:
+            queue.task_done()  # Notify queue the item is processed
 
 
 async def main():
     """
     Entrypoint for packaged script.
     """
-    global args
+    global args, policy
     argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
-    argp.add_argument("number", action="store", type=int, default=1, help="Number of users to create")
+    argp.add_argument("number", action="store", type=int, nargs="?", default=1, help="Number of users to create")
+    argp.add_argument("-f", "--file", action="store", type=str, default=None, help="ISE internal users import CSV file (data/CSV/internalusers-*.csv)")
+    argp.add_argument("-p", "--policy", action="store", type=str, default=None, help="password policy YAML/JSON file")
+    argp.add_argument("-r", "--retries", action="store", type=int, default=RETRIES_DEFAULT, help="maximum retries per user")
     argp.add_argument("-t", "--timer", action="store_true", default=False, help="time", required=False)
     argp.add_argument("-v", "--verbose", action="count", default=0, help="Verbosity")
     args = argp.parse_args()
     if args.timer:
         start_time = time.time()
+    policy = load_password_policy(args.policy)  # read the password policy once
 
     env = {k: v for (k, v) in os.environ.items()}  # Load environment variables
 
@@ -216,17 +409,36 @@ async def main():
         username_cache = await asyncio.wait_for(cache_existing_internalusers(session), 60)
         if args.verbose:
             print(f"ⓘ Cached {len(username_cache)} existing users")
-        users_queue = asyncio.Queue()  # Create a queue for the user workload
+        users_queue = asyncio.Queue(maxsize=WORKERS_MAX * 2)  # bound the users waiting in memory
 
-        # 💡 No guarantee of default identitygroup IDs across ISE deployments!
-        identitygroup_id = await get_ise_identitygroup_id(session, "Employee")
+        if args.file:
+            # Resolve all identity group names to IDs with one cached lookup
+            identitygroups = await get_ise_identitygroups(session)
+            users = read_internalusers_csv(args.file, identitygroups)
+        else:
+            # 💡 No guarantee of default identitygroup IDs across ISE deployments!
+            identitygroup_id = await get_ise_identitygroup_id(session, "Employee")
+            users = (generate_random_internaluser_data(groupid=identitygroup_id, policy=policy) for n in range(args.number))
 
         # Create worker tasks to process the queue concurrently
-        tasks = [asyncio.create_task(ise_internaluser_creator(users_queue, session)) for ii in range(WORKERS_MAX)]
-        [
-            users_queue.put_nowait(generate_random_internaluser_data(groupid=identitygroup_id)) for n in range(1, args.number + 1)
-        ]  # enqueue a user for creation
+        unauthorized = asyncio.Event()
+        tasks = [asyncio.create_task(ise_internaluser_creator(users_queue, session, unauthorized)) for ii in range(WORKERS_MAX)]
+        for user_dict in users:
+            if unauthorized.is_set():
+                break  # stop reading users
+            username = user_dict["InternalUser"]["name"]
+            if args.file and username in username_cache:
+                print(f"✖ {username} exists", file=sys.stderr)
+                continue
+            violations = password_violations(user_dict["InternalUser"]["password"], username, policy)
+            if violations:  # validate before sending
+                print(f"✖ {username} password: {', '.join(violations)}", file=sys.stderr)
+                continue
+            await users_queue.put(user_dict)  # enqueue a user for creation
         await users_queue.join()  # Wait until the queue is finished
+        [task.cancel() for task in tasks]
+        if unauthorized.is_set():
+            sys.exit(1)
 
     if args.timer:
         print(f"⏲ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Create or update (upsert) ISE ERS resources streamed from JSON Lines, CSV, JSON or YAML files.
+Existing resource names are prefetched into an index so existing resources are updated with a PUT and new resources are created with a POST.
+Records are sent through a bounded pool of workers with retries so large inventories are loaded incrementally and in parallel.
+See https://cs.co/ise-api for REST API resource names.
+
+File formats (by file extension):
+  .jsonl : one JSON resource object per line
+  .csv   : one resource per row; use `.` in column names for nested attributes (`authenticationSettings.radiusSharedSecret`)
+           and `|` to separate the values of list attributes (`NetworkDeviceGroupList`, see LIST_FIELDS)
+  .json  : a list of resources or `{ "resource": [ ... ] }`
+  .yaml  : the `data/YAML/*.yaml` format `{ resource: [ ... ] }`
+Records may be wrapped in the ERS object name (`{ "NetworkDevice": { ... } }`) or not.
+Records with the same name are upserted in file order. Referenced names (internaluser `identityGroups`) are resolved to IDs.
+
+Examples:
+  ise-upsert-ers.py networkdevicegroup data/YAML/networkdevicegroup-medical.yaml
+  ise-upsert-ers.py networkdevice devices.jsonl -tv
+  ise-upsert-ers.py sgt data/YAML/sgt-default.yaml --workers 5 --retries 5
+  cat devices.jsonl | ise-upsert-ers.py networkdevice - --format jsonl
+
+Requires setting the these environment variables using the `export` command:
+  export ISE_PPAN='1.2.3.4'             # hostname or IP address of ISE Primary PAN
+  export ISE_REST_USERNAME='admin'      # ISE ERS admin or operator username
+  export ISE_REST_PASSWORD='C1sco12345' # ISE ERS admin or operator password
+  export ISE_CERT_VERIFY=false          # validate the ISE certificate
+
+You may add these export lines to a text file and load with `source`:
+  source ise-env.sh
+
+"""
+__author__ = "Thomas Howard"
+__email__ = "thomas@cisco.com"
+__license__ = "MIT - https://mit-license.org/"
+
+
+import aiohttp
+import argparse
+import asyncio
+import csv
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+import yaml
+
+ICONS = {
+    "ERROR": "⛒",
+    "FAIL": "✖",
+    "INFO": "ℹ",
+    "PASS": "✔",
+    "RETRY": "↻",
+    "WATCH": "⏱",
+}
+
+FORMATS = ["csv", "json", "jsonl", "yaml"]
+REST_PAGE_SIZE = 100
+RETRIES_DEFAULT = 3
+RETRY_STATUSES = [429, 500, 502, 503, 504]  # retry rate limits and transient server errors
+TCP_LIMIT = 10  # 🔺ISE ERS APIs for GuestType and InternalUser can have problems with 10+ concurrent connections!
+
+# CSV column leaf names with list values separated by `|`
+LIST_FIELDS = ["NetworkDeviceGroupList", "sgacls"]
+
+# ERS resource name : { attribute : referenced ERS resource } for comma-separated names resolved to IDs
+REFERENCE_FIELDS = {
+    "internaluser": {"identityGroups": "identitygroup"},
+}
+
+# ERS resource name : ERS object name used to wrap the resource in requests
+ERS_OBJECT_NAMES = {
+    "allowedprotocols": "AllowedProtocols",
+    "authorizationprofile": "AuthorizationProfile",
+    "downloadableacl": "DownloadableAcl",
+    "egressmatrixcell": "EgressMatrixCell",
+    "endpoint": "ERSEndPoint",
+    "endpointgroup": "EndPointGroup",
+    "guestuser": "GuestUser",
+    "identitygroup": "IdentityGroup",
+    "internaluser": "InternalUser",
+    "networkdevice": "NetworkDevice",
+    "networkdevicegroup": "NetworkDeviceGroup",
+    "portal": "ERSPortal",
+    "sgacl": "Sgacl",
+    "sgmapping": "SGMapping",
+    "sgt": "Sgt",
+    "sxpconnections": "ERSSxpConnection",
+    "tacacscommandsets": "TacacsCommandSets",
+    "tacacsprofile": "TacacsProfile",
+}
+
+
+def read_records(filepath: str = "-", format: str = None, resource: str = None):
+    """
+    Yield resource records (dicts) from the file without loading JSON Lines or CSV files into memory.
+
+    :param filepath (str) : the file path or `-` for stdin
+    :param format (str) : one of FORMATS; Default: the file extension
+    :param resource (str) : the ERS resource name used as the list name in JSON and YAML files
+    """
+    format = format or os.path.splitext(filepath)[1].lstrip(".").lower().replace("yml", "yaml")
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format: {format}")
+    fh = sys.stdin if filepath == "-" else open(filepath, mode="r", encoding="utf-8", newline="")
+    try:
+        if format == "jsonl":
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+        elif format == "csv":
+            for row in csv.DictReader(fh):
+                yield csv_row_to_record(row)
+        else:  # JSON and YAML are small configuration files; YAML is a superset of JSON
+            data = yaml.safe_load(fh)
+            if isinstance(data, dict):
+                data = data.get(resource, data.get(ERS_OBJECT_NAMES.get(resource), []))
+            for record in data or []:
+                yield record
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def csv_row_to_record(row: dict = None) -> dict:
+    """
+    Returns a nested resource dict from a flat CSV row.
+    Column names with `.` are nested objects and LIST_FIELDS values are split on `|` into lists. Empty values are omitted.
+    """
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        *parents, leaf = key.split(".")
+        value = value.split("|") if leaf in LIST_FIELDS else value
+        node = record
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return record
+
+
+async def get_name_index(session: aiohttp.ClientSession = None, path: str = None) -> dict:
+    """
+    Returns a dict of { name : id } for all existing resources at the ERS path, fetching all pages concurrently.
+    """
+    async with session.get(f"{path}?size={REST_PAGE_SIZE}&page=1") as response:
+        if response.status != 200:
+            raise ValueError(f"{response.status} GET {path}: {await response.text()}")
+        data = await response.json()
+    total = data["SearchResult"]["total"]
+    resources = data["SearchResult"]["resources"]
+
+    async def get_page(page: int):
+        async with session.get(f"{path}?size={REST_PAGE_SIZE}&page={page}") as response:
+            return (await response.json())["SearchResult"]["resources"]
+
+    pages = int(total / REST_PAGE_SIZE) + (1 if total % REST_PAGE_SIZE else 0)
+    for page_resources in await asyncio.gather(*[get_page(page) for page in range(2, pages + 1)]):
+        resources.extend(page_resources)
+    return {resource["name"]: resource["id"] for resource in resources}
+
+
+async def get_id(session: aiohttp.ClientSession = None, path: str = None, name: str = None) -> str:
+    """
+    Returns the id of the resource with the name at the ERS path or None if it does not exist or the request fails.
+    """
+    try:
+        async with session.get(path, params={"filter": f"name.EQ.{name}"}) as response:
+            if response.status != 200:
+                return None
+            resources = (await response.json())["SearchResult"]["resources"]
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+    return next((resource["id"] for resource in resources if resource.get("name") == name), None)
+
+
+def resolve_references(resource: dict = None, references: dict = None) -> dict:
+    """
+    Returns the resource with the comma-separated (or list of) names in reference attributes replaced by their IDs.
+    Values that are already IDs are kept. Raises ValueError for unknown names.
+
+    :param resource (dict) : the unwrapped ERS resource
+    :param references (dict) : { attribute : { name : id } } for the resource type
+    """
+    for attribute, index in (references or {}).items():
+        value = resource.get(attribute)
+        if not value:
+            continue
+        names = value if isinstance(value, list) else [name.strip() for name in value.split(",") if name.strip()]
+        ids = set(index.values())
+        missing = [name for name in names if name not in index and name not in ids]
+        if missing:
+            raise ValueError(f"unknown {attribute}: {', '.join(missing)}")
+        resource = {**resource, attribute: ",".join([index.get(name, name) for name in names])}
+    return resource
+
+
+async def upsert_worker(session: aiohttp.ClientSession = None, path: str = None, object_name: str = None, record_q: asyncio.Queue = None):
+    """
+    Take records from the queue and PUT existing resources or POST new resources with retries.
+
+    :param session (aiohttp.ClientSession): the aiohttp session to reuse
+    :param path (str) : the ERS resource path
+    :param object_name (str) : the ERS object name used to wrap the resource
+    :param record_q (asyncio.Queue) : the queue of (number, record) tuples
+    """
+    while True:
+        n, record = await record_q.get()  # Wait for item in the queue
+        try:
+            resource = record.get(object_name, record)  # unwrap, if necessary
+            name = resource.get("name")
+            try:
+                resource = resolve_references(resource, references)
+            except ValueError as e:
+                results["failed"] += 1
+                print(f"{ICONS['FAIL']} {n} | {name} | {e}")
+                continue
+            async with name_locks.setdefault(name, asyncio.Lock()):  # serialize records with the same name so a later record PUTs the created resource
+                await upsert(session, path, object_name, n, name, resource)
+        except Exception as e:  # catch *all* exceptions so the worker continues
+            results["failed"] += 1
+            tb_text = "\n".join(traceback.format_exc().splitlines()[1:])  # remove 'Traceback (most recent call last):'
+            print(f"{ICONS['ERROR']} {n} {e.__class__} {tb_text}", file=sys.stderr)
+        finally:
+            record_q.task_done()  # Notify queue item is done
+
+
+async def upsert(session: aiohttp.ClientSession = None, path: str = None, object_name: str = None, n: int = 0, name: str = None, resource: dict = None):
+    """
+    PUT the existing resource or POST the new resource with retries.
+    A POST is only retried after checking the resource was not created by the failed attempt.
+    """
+    id = name_index.get(name)
+    if id:
+        method, url = "PUT", f"{path}/{id}"
+        resource = {**resource, "id": id}
+    else:
+        method, url = "POST", path
+    body = json.dumps({object_name: resource})
+
+    for attempt in range(1, args.retries + 2):
+        try:
+            async with session.request(method, url, data=body) as response:
+                status = response.status
+                text = await response.text()
+                location = response.headers.get("Location", "")
+            if status not in RETRY_STATUSES:
+                break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status, text = None, str(e)
+        if attempt <= args.retries:
+            if method == "POST" and status != 429:  # the failed POST may have created the resource
+                created_id = await get_id(session, path, name)
+                if created_id:
+                    status, location = 201, f"{path}/{created_id}"
+                    break
+            if args.verbosity >= 2:
+                print(f"{ICONS['RETRY']} {n} {method} {status} | {name} | retry {attempt}/{args.retries}", file=sys.stderr)
+            await asyncio.sleep(2 ** (attempt - 1))  # exponential backoff
+
+    if status in [200, 201]:
+        results["updated" if method == "PUT" else "created"] += 1
+        if id is None and location:
+            name_index[name] = location.split("/")[-1]  # PUT any later record with the same name
+        if args.verbosity:
+            print(f"{ICONS['PASS']} {n} {method} {status} | {name}")
+    else:
+        results["failed"] += 1
+        try:
+            text = json.loads(text)["ERSResponse"]["messages"][0]["title"]
+        except Exception:
+            pass  # show the raw response text
+        print(f"{ICONS['FAIL']} {n} {method} {status} | {name} | {text}")
+
+
+async def ise_upsert(resource: str = None, filepaths: list = None):
+    """
+    Upsert the resources from the files.
+    """
+    global name_index, name_locks, references, results
+    path = f"/ers/config/{resource}"
+    object_name = args.object or ERS_OBJECT_NAMES.get(resource)
+    if object_name is None:
+        sys.exit(f"{ICONS['FAIL']} Unknown ERS object name for '{resource}'; use --object")
+
+    env = {k: v for (k, v) in os.environ.items() if k.startswith("ISE_")}  # Load environment variables
+    verify_ssl = False if args.insecure or env.get("ISE_CERT_VERIFY", "True")[0:1].lower() in ["f", "n"] else True
+    async with aiohttp.ClientSession(
+        f"https://{env['ISE_PPAN']}",
+        auth=aiohttp.BasicAuth(login=env["ISE_REST_USERNAME"], password=env["ISE_REST_PASSWORD"]),
+        connector=aiohttp.TCPConnector(limit=args.workers, ssl=verify_ssl),
+        headers={"Accept": "application/json", "Content-Type": "application/json"},
+    ) as session:
+
+        name_index = await get_name_index(session, path)
+        name_locks = {}  # { name : asyncio.Lock }
+        references = {
+            attribute: await get_name_index(session, f"/ers/config/{referenced}")
+            for attribute, referenced in REFERENCE_FIELDS.get(resource, {}).items()
+        }
+        results = {"created": 0, "updated": 0, "failed": 0}
+        if args.verbosity:
+            print(f"{ICONS['INFO']} Indexed {len(name_index)} existing '{resource}' resources", file=sys.stderr)
+
+        record_q = asyncio.Queue(maxsize=args.workers * 2)  # bound the records read ahead of the workers
+        workers = [asyncio.create_task(upsert_worker(session, path, object_name, record_q)) for idx in range(args.workers)]
+        try:
+            n = 0
+            for filepath in filepaths:
+                for record in read_records(filepath, args.format, resource):
+                    n += 1
+                    await record_q.put((n, record))
+            await record_q.join()  # Block until all records are processed
+        finally:
+            [worker.cancel() for worker in workers]
+
+        print(f"{ICONS['INFO']} {results['created']} created, {results['updated']} updated, {results['failed']} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    """
+    Run from script
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("resource", type=str, help="ERS resource name")
+    argp.add_argument("files", type=str, nargs="+", help="JSON Lines, CSV, JSON or YAML file(s); `-` for stdin")
+    argp.add_argument("-f", "--format", choices=FORMATS, default=None, help="file format; Default: file extension")
+    argp.add_argument("-o", "--object", type=str, default=None, help="ERS object name (NetworkDevice, Sgt, ...) for unlisted resources")
+    argp.add_argument("-w", "--workers", type=int, default=TCP_LIMIT, help=f"concurrent requests; Default: {TCP_LIMIT}")
+    argp.add_argument("-r", "--retries", type=int, default=RETRIES_DEFAULT, help=f"retries per resource; Default: {RETRIES_DEFAULT}")
+    argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates for TLS (allow self-signed certs)")
+    argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total runtime, in seconds")
+    argp.add_argument("-v", "--verbosity", action="count", default=0, help="verbosity")
+    args = argp.parse_args()
+    if args.timer:
+        start_time = time.time()
+
+    signal.signal(signal.SIGINT, lambda signum, frame: sys.exit(1))  # Handle CTRL+C interrupts gracefully
+    asyncio.run(ise_upsert(args.resource, args.files))
+
+    if args.timer:
+        print(f"{ICONS['WATCH']} {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
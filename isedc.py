@@ -10,15 +10,49 @@ Usage with environment variables:
   export ISE_PMNT='1.2.3.4'             # hostname or IP address of ISE Primary MNT
   export ISE_DC_PASSWORD='DataC0nnect$' # Data Connect password
   export ISE_VERIFY=False               # Optional: Disable TLS certificate verification (allow self-signed certs)
+  export ISE_SMNT='1.2.3.5'             # Optional: Secondary MNT to share queries and fail over to
 
   isedc.py "SELECT * FROM node_list" -f yaml
   isedc.py -it "SELECT * FROM radius_accounting ORDER BY timestamp ASC FETCH FIRST 10 ROWS ONLY"
   isedc.py data/SQL/node_list.sql
   isedc.py "$(cat data/SQL/radius_auths_by_policy.sql)" -f table
+  isedc.py @radius_auths_by_policy --days 7 -f table  # data/SQL query with bind variables; see `isedc_catalog.py`
 
 Without environment variables:
   isedc.py -it -n ise.example.org -u dataconnect -p "D@t@C0nnect" "SELECT * FROM node_list" -f table
 
+Fetch Tuning:
+  Each fetch round trip returns `arraysize` rows (oracledb default: 100) and `prefetchrows` rows are returned with the execute.
+  Large exports need far fewer round trips with a larger arraysize. The adaptive mode starts at `arraysize` and doubles
+  the batch size while the rows per second improve, without exceeding `ARRAYSIZE_MAX` or the `FETCH_BYTES_MAX` memory cap.
+    isedc.py "SELECT * FROM radius_authentications_week" --arraysize 5000 > auths.csv
+    isedc.py "SELECT * FROM radius_authentications_week" --adaptive > auths.csv
+
+Time-Sliced Queries:
+  Large time-ranged queries may be split into slices of a timestamp column which run concurrently over a session pool.
+  The query is wrapped as `SELECT * FROM (<query>) WHERE <column> >= :slice_start AND <column> < :slice_end` so it must
+  not contain its own `FETCH FIRST` row limit. Results stream slice by slice in time order (rows within a slice keep the
+  query's order) or, with `--unordered`, as slices finish. Slices finished ahead of the output are spooled to temporary files.
+    isedc.py data/SQL/radius_authentications_week.sql --slice-column timestamp --start 2024-09-01 --slices 7 > week.csv
+
+Offline Tests and Benchmarks:
+  `--fake` queries a SQLite database with the Data Connect views and synthetic data instead of the MNT. See `isedc_fake.py`.
+    isedc_fake.py fake_dc.db --rows 1000000
+    isedc.py --fake fake_dc.db @radius_auths --hours 24 -t > auths.csv
+
+Streamed Tables:
+  The markdown, table and text formats normally buffer all rows to size the columns. With `--stream`, the column widths
+  come from a saved profile of the queried table (one aggregate query of every column's maximum length, null count and
+  approximate distinct count) so rows are printed as they are fetched.
+    isedc.py "SELECT * FROM radius_authentications_week" -f table --stream
+
+  Use `ISEDC(..., pool_max=4)` to create an `oracledb` session pool instead of a single, standalone connection.
+  Each `query()` borrows a pooled session so several queries may run at once from different threads.
+  Pooled sessions are pinged when idle and sessions killed by ORA-02399 or ORA-03113 are dropped and replaced.
+    with ISEDC(hostname=..., password=..., pool_min=1, pool_max=4) as isedc:
+        with isedc.acquire() as connection:  # borrow a session for several statements
+            ...
+
 ⚠ Thin vs Thick oracledb Clients
   This script uses the oracledb package and runs as a "thin" client without the need for additional ODBC drivers.
   The main limitation with the ISE database has been timestamp fields containing TimeZone information.
@@ -38,18 +72,32 @@ __email__ = "thomas@cisco.com"
 __license__ = "MIT - https://mit-license.org/"
 
 import argparse  # https://docs.python.org/3/library/argparse.html
+import concurrent.futures
 import csv
+import datetime
+import decimal
+import io
+import itertools
 import json
 import logging
 import oracledb  # https://python-oracledb.readthedocs.io/en/latest/
 import os
+import pickle
+import queue
+import re
 import requests
 import signal  # handle Ctrl+C gracefully
+import sqlite3  # FakeDataConnect errors
 import ssl  # handle self-signed certificates
 import sys
 import tabulate  # https://pypi.org/project/tabulate/
+import tempfile
+import threading
+import time
 import traceback
+import weakref
 import yaml
+import zlib
 from typing import Union
 
 # -----------------------------------------------------------------------------
@@ -66,6 +114,76 @@ from typing import Union
 # -----------------------------------------------------------------------------
 
 
+class CompressedWriter(io.RawIOBase):
+    """
+    A binary file that compresses and writes its data in a worker thread so fetching rows and compression overlap.
+    Writes are copied to a bounded queue and block when the compressor falls behind.
+    Use it as a text file with `io.TextIOWrapper(io.BufferedWriter(CompressedWriter(fh, "gzip"), CHUNK_SIZE), encoding="utf-8")`.
+    """
+
+    COMPRESSIONS = ["gzip", "zstd"]
+    CHUNK_SIZE = 1024 * 1024  # bytes per queued chunk
+    QUEUE_SIZE = 8  # chunks buffered ahead of the compressor
+
+    def __init__(self, fh=None, compression: str = "gzip", level: int = None, close_fh: bool = True) -> None:
+        """
+        - fh (file): a binary file to write the compressed data to
+        - compression (str): `gzip` (zlib) or `zstd` (requires `pyarrow`)
+        - level (int): the compression level. Default: the codec default
+        - close_fh (bool): close `fh` when closed. Use False for `sys.stdout.buffer`
+        """
+        assert compression in self.COMPRESSIONS, f"compression is not one of {self.COMPRESSIONS}"
+        super().__init__()
+        self.fh = fh
+        self.close_fh = close_fh
+        self.bytes_in = 0
+        self.error = None  # an exception in the worker thread
+        if compression == "gzip":
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, 31)  # 31: gzip header
+            self._compress, self._finish = lambda chunk: fh.write(compressor.compress(chunk)), lambda: fh.write(compressor.flush())
+        else:
+            import pyarrow as pa  # lazy load optional dependency
+
+            codec = pa.Codec("zstd", compression_level=level)  # releases the GIL while compressing
+            self._compress, self._finish = lambda chunk: fh.write(codec.compress(chunk, asbytes=True)), lambda: None  # a frame per chunk
+        self.queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.thread = threading.Thread(target=self._run, name="CompressedWriter", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                self._compress(chunk)
+            self._finish()
+        except Exception as e:
+            self.error = e
+            while self.queue.get() is not None:  # drain so writers never block
+                pass
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self.error:
+            raise self.error
+        self.queue.put(bytes(b))  # copy; the caller may reuse its buffer
+        self.bytes_in += len(b)
+        return len(b)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.fh.close() if self.close_fh else self.fh.flush()
+        super().close()
+        if self.error:
+            raise self.error
+
+
 class ISEDC:
 
     # Class variables
@@ -76,6 +194,42 @@ class ISEDC:
     DATACONNECT_USERNAME = "dataconnect"  # Data Connect username
     DATACONNECT_PASSWORD_DAYS_DEFAULT = 90
     DATACONNECT_PASSWORD_DAYS_MAX = 3650
+    ARRAYSIZE_DEFAULT = 100  # oracledb default rows per fetch round trip
+    ARRAYSIZE_MAX = 100000  # maximum rows per fetch round trip
+    PREFETCHROWS_DEFAULT = 2  # oracledb default rows returned with the execute round trip
+    FETCH_BYTES_MAX = 64 * 1024 * 1024  # adaptive fetch memory cap per batch
+    STMT_CACHE_SIZE = 50  # parsed statements cached per session for repeated bind variable queries
+    SLICES_DEFAULT = 7  # time slices for query_slices(), e.g. one per day of a week
+    SLICE_QUEUE_SIZE = 4  # fetched batches held in memory per slice ahead of the consumer; ordered slices spool the rest to a temporary file
+    FETCH_DF_BATCH_SIZE = 100000  # rows per Arrow batch for to_parquet()
+    CACHE_TTL_DEFAULT = 300  # seconds a cached query result may be reused
+    WATERMARKS_FILEPATH = "isedc_watermarks.json"  # persistent incremental query watermarks
+    WATERMARK_OVERLAP = 0  # seconds to re-read before the watermark for late-committed rows
+    LOB_INLINE_MAX = 32767  # characters or bytes of a LOB value written inline; larger values go to sidecar files
+    LOB_CHUNK_SIZE = 1024 * 1024  # characters or bytes read per LOB round trip when streaming a LOB locator
+    PLAN_STATEMENT_ID = "ISEDC"  # the plan_table statement_id of explain()
+    RESUME_RETRIES = 10  # session replacements allowed in one query_resumable() extract
+    POOL_PING_INTERVAL = 60  # seconds a pooled session may be idle before it is pinged when acquired
+    POOL_WAIT_TIMEOUT = 60000  # milliseconds to wait for a free pooled session
+    NODE_RETRY_INTERVAL = 60  # seconds before an MNT node that failed to connect is tried again
+    SESSION_ERRORS = ["DPY-1001", "DPY-4011", "ORA-02399", "ORA-03113", "ORA-03135"]  # the session is dead and must be replaced
+    # ⚠ DPY-1001 (not connected) is an oracledb.InterfaceError so session errors are caught as oracledb.Error
+    PROFILE_LOB_TYPES = ["BLOB", "CLOB", "LONG", "LONG RAW", "NCLOB"]  # no APPROX_COUNT_DISTINCT()
+    PROFILE_LONG_TYPES = ["LONG", "LONG RAW"]  # no SQL functions, not even COUNT(column)
+    COLUMN_WIDTH_MAX = 40  # fixed_stream() width of columns without a profile
+    STREAM_FORMATS = ["markdown", "table", "text"]  # fixed-width formats that fixed_stream() prints without buffering
+    METRICS_SQL_MAX = 200  # characters of the query text saved with its metrics
+    TIMESTAMP_FORMATS = {  # Oracle format models of DATE/TIMESTAMP columns fetched as strings for each output format; None for datetimes
+        "csv": "YYYY-MM-DD HH24:MI:SS.FF6",
+        "grid": "YYYY-MM-DD HH24:MI:SS",
+        "json": 'YYYY-MM-DD"T"HH24:MI:SS.FF6',  # ISO 8601
+        "line": 'YYYY-MM-DD"T"HH24:MI:SS.FF6',
+        "markdown": "YYYY-MM-DD HH24:MI:SS",
+        "pretty": 'YYYY-MM-DD"T"HH24:MI:SS.FF6',
+        "table": "YYYY-MM-DD HH24:MI:SS",
+        "text": "YYYY-MM-DD HH24:MI:SS",
+        "yaml": None,  # YAML timestamps
+    }
     FORMATS = ["csv", "grid", "json", "line", "markdown", "pretty", "table", "text", "yaml"]
 
     def __init__(
@@ -86,6 +240,16 @@ class ISEDC:
         password: str = None,
         insecure: bool = False,  # Do not perform server certificate validation
         level: Union[int, str] = "WARN",  # logging threshold level
+        pool_min: int = 0,  # minimum pooled sessions
+        pool_max: int = 0,  # maximum pooled sessions; 0 for a single standalone connection
+        arraysize: int = ARRAYSIZE_DEFAULT,  # rows per fetch round trip
+        prefetchrows: int = PREFETCHROWS_DEFAULT,  # rows returned with the execute round trip
+        cache=None,  # an isedc_cache.QueryCache for cached() results
+        backend=None,  # an alternative database backend such as isedc_fake.FakeDataConnect
+        metrics_hook=None,  # a function called with the metrics dict of each query
+        fetch_lobs: bool = False,  # fetch CLOB/BLOB columns as LOB locators instead of str/bytes
+        timestamp_format: str = None,  # fetch DATE/TIMESTAMP columns as strings in this Oracle format
+        hostnames: list = None,  # additional MNT nodes with the same data, e.g. the secondary MNT
     ):
         """
         Creates an ISEDC instance with the spcecific configuration options.
@@ -96,6 +260,22 @@ class ISEDC:
         password (str): the ISE Data Connect password. Default: None
         insecure (bool): do not perform server certificate validation
         level (Union[int, str]): logging threshold level
+        pool_min (int): the minimum number of pooled sessions. Default: 0
+        pool_max (int): the maximum number of pooled sessions. Default: 0 (no pool; use a single standalone connection)
+        arraysize (int): the number of rows fetched in each round trip. Default: 100
+        prefetchrows (int): the number of rows returned with the execute round trip. Default: 2
+        cache (QueryCache): an optional on-disk query result cache used by `cached()`. Default: None
+        backend (object): an alternative database with a `connect()` method returning a DB-API connection for offline tests and
+          benchmarks, e.g. `isedc_fake.FakeDataConnect`. Default: None (ISE Data Connect)
+        metrics_hook (function): called with the metrics dict of each query when its results are fetched. Default: None
+        fetch_lobs (bool): fetch CLOB/BLOB values as LOB locators that are read later with a round trip per value (True) or inline
+          as str/bytes with the rows (False). Default: False
+        hostnames (list): additional MNT node hostnames or IP addresses with the same Data Connect data, e.g. the secondary MNT.
+          Pooled sessions are spread over the healthy nodes with the fewest busy sessions and a node that fails to connect is
+          skipped for `NODE_RETRY_INTERVAL` seconds. Default: None (only `hostname`)
+        timestamp_format (str): an Oracle format model, e.g. `YYYY-MM-DD HH24:MI:SS`, for the database to convert DATE and TIMESTAMP
+          columns to strings when they are fetched instead of datetimes; see `TIMESTAMP_FORMATS`. `query_incremental()` and
+          `query_resumable()` need datetimes or a format with all fractional seconds. Default: None (datetimes)
         """
 
         # Create a default logger to sys.stderr
@@ -115,6 +295,9 @@ class ISEDC:
         assert isinstance(hostname, str), "hostname is not a string"
         assert hostname != "", "hostname is empty"
         self.hostname = hostname
+        assert hostnames is None or all(isinstance(h, str) and h != "" for h in hostnames), "hostnames is not a list of hostnames"
+        self.hostnames = [hostname] + [h for h in (hostnames or []) if h != hostname]  # in order of preference
+        self.nodes_down = {}  # { hostname : time.monotonic() of the last failure }
 
         assert port is not None, "port is not None"
         assert isinstance(port, int), "port is not an int"
@@ -143,22 +326,59 @@ class ISEDC:
             self.ssl_context.verify_mode = ssl.CERT_NONE  # any cert is accepted; validation errors are ignored
             self.log.debug(f"{'⚠' if self.insecure else '✔'} TLS security {'dis' if self.insecure else 'en'}abled")
 
-        self.params = oracledb.ConnectParams(
+        assert isinstance(pool_min, int) and pool_min >= 0, "pool_min is not an int >= 0"
+        assert isinstance(pool_max, int) and pool_max >= pool_min, "pool_max is not an int >= pool_min"
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+
+        assert isinstance(arraysize, int) and 0 < arraysize <= self.ARRAYSIZE_MAX, f"arraysize is not an int in 1-{self.ARRAYSIZE_MAX}"
+        assert isinstance(prefetchrows, int) and prefetchrows >= 0, "prefetchrows is not an int >= 0"
+        self.arraysize = arraysize
+        self.prefetchrows = prefetchrows
+        self.cache = cache
+        self.backend = backend
+        assert isinstance(fetch_lobs, bool), "fetch_lobs is not a bool"
+        self.fetch_lobs = fetch_lobs
+        assert timestamp_format is None or (isinstance(timestamp_format, str) and "'" not in timestamp_format), "timestamp_format is invalid"
+        self.timestamp_format = timestamp_format
+        self.metrics = []  # the metrics dict of each query
+        self.metrics_hooks = [metrics_hook] if metrics_hook else []
+        self._metrics_lock = threading.Lock()
+        self._pending_metrics = weakref.WeakKeyDictionary()  # { cursor : metrics } of executed, unfinished queries
+        self._local = threading.local()  # round trips per thread
+
+        self.params = oracledb.ConnectParams(**self._params_kwargs())
+        self.log.debug(f"OracleDB Connection String: {self.params.get_connect_string()}")
+        self.connection = None
+        self.pool = None  # the session pool of `hostname`
+        self.pools = {}  # { hostname : session pool }
+        self._pools_lock = threading.Lock()  # pool creation and node selection by concurrent threads
+        self._acquiring = {}  # { hostname : sessions being acquired } not yet counted as busy by the pool
+        self._connection_nodes = weakref.WeakKeyDictionary()  # { connection : hostname }
+        self._query_sessions = weakref.WeakKeyDictionary()  # { cursor : pooled session } of `query()` cursors
+        self.schema = None  # isedc_schema.SchemaCatalog
+
+    def _params_kwargs(self, hostname: str = None) -> dict:
+        """
+        Returns the keyword arguments shared by oracledb.ConnectParams and oracledb.PoolParams.
+        - hostname (str): the MNT node. Default: `hostname`
+        """
+        return dict(
             protocol="tcps",  # tcp "secure" with TLS
-            host=self.hostname,  # name or IP address of database host machine
+            host=hostname or self.hostname,  # name or IP address of database host machine
             port=self.port,  # Oracle Default: 1521
             service_name=self.DATACONNECT_SID,
             user=self.username,  # the name of the user to connect to
             password=self.password,
             retry_count=3,  # connection attempts retries before being terminated. Default: 0
             retry_delay=3,  # seconds to wait before a new connection attempt. Default: 0
+            stmtcachesize=self.STMT_CACHE_SIZE,  # reuse parsed statements. Default: 20
+            round_trip_callback=self._on_round_trip,  # count the round trips of each query (thin mode)
             ssl_context=self.ssl_context,  # an SSLContext object which is used for connecting to the database using TLS
             ssl_server_dn_match=False,  # boolean indicating if the server certificate distinguished name (DN) should be matched. Default: True
             # ssl_server_cert_dn=False # the distinguished name (DN), which should be matched with the server
             # wallet_location=DIR_EWALLET, # the directory containing the PEM-encoded wallet file, ewallet.pem
         )
-        self.log.debug(f"OracleDB Connection String: {self.params.get_connect_string()}")
-        self.connection = None
 
     def __enter__(self):
         return self
@@ -174,36 +394,211 @@ class ISEDC:
     def connect(self):
         """
         Connect to the database and return the connection.
+        With a session pool, a pooled session is borrowed and returned to the pool when it is closed or no longer referenced.
         Connection timeout after ~12 * 60s = 720s
         https://python-oracledb.readthedocs.io/en/latest/user_guide/troubleshooting.html#dpy-4011
         """
+        if self.pool_max > 0:
+            return self.acquire()
+
         if self.connection != None:
             return self.connection
 
+        if self.backend is not None:
+            self.connection = self.backend.connect()
+            return self.connection
+
         for attempt in range(self.DB_CONNECT_RETRIES):
+            for hostname in self.nodes():  # fail over to the next node
+                try:
+                    self.log.info(f"Attempting to connect to {hostname} ({attempt + 1}/{self.DB_CONNECT_RETRIES})...")
+                    params = self.params if hostname == self.hostname else oracledb.ConnectParams(**self._params_kwargs(hostname))
+                    self.connection = oracledb.connect(params=params, tcp_connect_timeout=self.DB_CONNECT_TIMEOUT)
+                    if self.connection:
+                        self.log.info(f"Connected successfully to {hostname}")
+                        self.nodes_down.pop(hostname, None)
+                        self._connection_nodes[self.connection] = hostname
+                        self.init_session(self.connection)
+                        return self.connection
+                except oracledb.DatabaseError as e:
+                    self.log.error(f"{hostname}: {e}")
+                    self.nodes_down[hostname] = time.monotonic()
+        raise Exception(f"Failed to connect to the database after {self.DB_CONNECT_RETRIES} attempts")
+
+    def create_pool(self, hostname: str = None) -> oracledb.ConnectionPool:
+        """
+        Create and return the session pool of an MNT node, if it does not already exist.
+        Idle sessions are pinged when acquired after `POOL_PING_INTERVAL` seconds and replaced if they are dead.
+        - hostname (str): the MNT node. Default: `hostname`
+        """
+        hostname = hostname or self.hostname
+        with self._pools_lock:  # one pool per node when threads acquire concurrently
+            if hostname not in self.pools:
+                self.log.info(f"Creating session pool for {hostname} (min={self.pool_min}, max={self.pool_max})")
+                self.pools[hostname] = oracledb.create_pool(
+                    params=oracledb.PoolParams(
+                        min=self.pool_min,
+                        max=self.pool_max,
+                        increment=1,
+                        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,  # wait for a free session
+                        wait_timeout=self.POOL_WAIT_TIMEOUT,
+                        ping_interval=self.POOL_PING_INTERVAL,
+                        tcp_connect_timeout=self.DB_CONNECT_TIMEOUT,
+                        **self._params_kwargs(hostname),
+                    ),
+                    session_callback=(lambda connection, tag: self.init_session(connection)),  # new sessions only
+                )
+                if hostname == self.hostname:
+                    self.pool = self.pools[hostname]
+            return self.pools[hostname]
+
+    def nodes(self) -> list:
+        """
+        Returns the MNT node hostnames in order of preference without the nodes that failed in the last `NODE_RETRY_INTERVAL`
+        seconds. All nodes are returned when they have all failed so they are tried again.
+        """
+        now = time.monotonic()
+        nodes = [h for h in self.hostnames if now - self.nodes_down.get(h, -self.NODE_RETRY_INTERVAL) >= self.NODE_RETRY_INTERVAL]
+        return nodes or list(self.hostnames)
+
+    def node(self, connection=None) -> str:
+        """
+        Returns the MNT node hostname of a connection or None for backend connections.
+        """
+        try:
+            return self._connection_nodes.get(connection)
+        except TypeError:  # not weakly referenceable
+            return None
+
+    def health(self) -> dict:
+        """
+        Returns a dict of { hostname : seconds to acquire and ping a session or None when the node is down } for all MNT nodes.
+        Nodes that are down are skipped by `acquire()` and `connect()` for `NODE_RETRY_INTERVAL` seconds.
+        """
+        latencies = {}
+        for hostname in self.hostnames:
+            start = time.perf_counter()
             try:
-                self.log.info(f"Attempting to connect ({attempt + 1}/{self.DB_CONNECT_RETRIES})...")
-                self.connection = oracledb.connect(params=self.params, tcp_connect_timeout=self.DB_CONNECT_TIMEOUT)
-                if self.connection:
-                    self.log.info(f"Connected successfully")
-                    return self.connection
-            except oracledb.DatabaseError as e:
-                self.log.error(e)
-        raise Exception("Failed to connect to the database after {self.DB_CONNECT_RETRIES} attempts")
+                if self.pool_max > 0:
+                    connection = self.create_pool(hostname).acquire()
+                    connection.ping()
+                    self.create_pool(hostname).release(connection)
+                else:
+                    params = self.params if hostname == self.hostname else oracledb.ConnectParams(**self._params_kwargs(hostname))
+                    with oracledb.connect(params=params, tcp_connect_timeout=self.DB_CONNECT_TIMEOUT) as connection:
+                        connection.ping()
+                latencies[hostname] = time.perf_counter() - start
+                self.nodes_down.pop(hostname, None)
+            except oracledb.Error as e:
+                self.log.warning(f"{hostname}: {e}")
+                latencies[hostname] = None
+                self.nodes_down[hostname] = time.monotonic()
+        return latencies
+
+    def init_session(self, connection: oracledb.Connection = None) -> None:
+        """
+        Set the session NLS date and timestamp formats used when DATE and TIMESTAMP columns are fetched as strings.
+        """
+        if self.timestamp_format is None:
+            return
+        date_format = re.sub(r"\.FF\d?", "", self.timestamp_format)  # DATE has no fractional seconds
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER SESSION SET NLS_DATE_FORMAT = '{date_format}' NLS_TIMESTAMP_FORMAT = '{self.timestamp_format}'")
+
+    def output_type_handler(self, cursor: oracledb.Cursor = None, metadata: oracledb.FetchInfo = None):
+        """
+        Fetch DATE and TIMESTAMP columns as strings converted by the database with the session NLS formats (`init_session()`)
+        instead of datetimes that are converted again by each output format. NUMBER columns are already fetched as int or float.
+        """
+        if metadata.type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+            return cursor.var(oracledb.DB_TYPE_VARCHAR, arraysize=cursor.arraysize)
+
+    def acquire(self) -> oracledb.Connection:
+        """
+        Borrow a session from the pool, creating the pool if necessary.
+        Use it as a context manager to return it to the pool: `with isedc.acquire() as connection:`
+        """
+        assert self.pool_max > 0, "acquire() requires pool_max > 0"
+        if self.backend is not None:
+            return self.backend.connect()  # a new backend connection stands in for a pooled session
+
+        # the healthy node with the fewest busy sessions; slow nodes keep their sessions busy longer
+        with self._pools_lock:  # count the sessions other threads are acquiring so they do not all pick the same node
+            nodes = sorted(self.nodes(), key=lambda h: (self.pools[h].busy if h in self.pools else 0) + self._acquiring.get(h, 0))
+            self._acquiring[nodes[0]] = self._acquiring.get(nodes[0], 0) + 1
+        for n, hostname in enumerate(nodes):
+            if n > 0:  # failing over
+                with self._pools_lock:
+                    self._acquiring[hostname] = self._acquiring.get(hostname, 0) + 1
+            try:
+                connection = self.create_pool(hostname).acquire()
+                self._connection_nodes[connection] = hostname
+                self.nodes_down.pop(hostname, None)
+                return connection
+            except oracledb.Error as e:
+                self.nodes_down[hostname] = time.monotonic()
+                if n == len(nodes) - 1:
+                    raise
+                self.log.warning(f"{hostname}: {e}; failing over")
+            finally:
+                with self._pools_lock:
+                    self._acquiring[hostname] -= 1
+
+    def release(self, connection: oracledb.Connection = None, dead: bool = False) -> None:
+        """
+        Release a connection back to the pool or drop it from the pool when the session is dead.
+        A dead standalone connection is closed so the next `connect()` replaces it.
+        """
+        try:
+            pool = self.pools.get(self.node(connection))
+            if pool is not None:
+                pool.drop(connection) if dead else pool.release(connection)
+            elif self.backend is not None and self.pool_max > 0:
+                connection.close()
+            elif dead:  # close only this connection; the session pools and logging are still in use
+                if connection is self.connection:
+                    self.connection = None
+                connection.close()
+        except oracledb.Error as e:
+            self.log.debug(f"release: {e}")
+
+    def release_cursor(self, cursor: oracledb.Cursor = None) -> None:
+        """
+        Close a `query()` cursor and release its pooled session after its rows are fetched.
+        Cursors of standalone connections are left open. Releasing a cursor more than once is harmless.
+        """
+        connection = self._query_sessions.pop(cursor, None) if self.pool_max > 0 else None
+        if connection is not None:
+            try:
+                cursor.close()
+            except oracledb.Error as e:
+                self.log.debug(f"release_cursor: {e}")
+            self.release(connection)
 
     def close(self):
-        """Close the database connection."""
+        """Close the database connection and session pool."""
         if self.connection:
             self.connection.close()
             self.connection = None
             self.log.info(f"Connection closed")
             logging.shutdown()
+        with self._pools_lock:
+            for hostname, pool in self.pools.items():
+                pool.close(force=True)
+                self.log.info(f"Session pool for {hostname} closed")
+            self.pools = {}
+            self.pool = None
 
     def version(self):
         """
         Returns the ISE Data Connect Oracle database version.
         """
-        return self.connect().version
+        connection = self.connect()
+        try:
+            return connection.version
+        finally:
+            if self.pool_max > 0:
+                self.release(connection)
 
     def get_connect_string(self):
         """
@@ -211,23 +606,27 @@ class ISEDC:
         """
         return self.params.get_connect_string()
 
-    def query(self, q: str = None):
+    def query(self, q: str = None, parameters: Union[list, dict] = None):
         """
-        Returns the results of the query, `q`.
+        Returns the results of the query, `q`. After a session error the query is run again from the start;
+        use `query_resumable()` for long extracts that may exceed the maximum connect time.
         - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values for `:name` placeholders in the query
+        With a session pool, the session is released when the cursor is exhausted by `fetch_batches()` or by `release_cursor()`.
         """
         assert isinstance(q, str)
         assert q is not None
         assert q != ""
 
-        q = self.read_sql_file(q) if q.strip().lower().endswith(".sql") else q  # load SQL query from file?
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
         self.log.debug(f"SQL query:\n-----\n{q}\n-----")
 
+        connection = self.connect()
         try:
             # ⚠ Do not close the cursor or it cannot be used by the calling function!
             # execute() returns a cursor
-            return self.connect().cursor().execute(q)
-        except oracledb.DatabaseError as e:
+            return self._hold(self._execute(self.cursor(connection), q, parameters))
+        except oracledb.Error as e:
             if "DPY-4011" in str(e):
                 self.log.error(f"DPY-4011: Database connection closed")
             elif "ORA-02399" in str(e):
@@ -239,14 +638,638 @@ class ISEDC:
             else:
                 self.log.error(f"Unknown error: {str(e)}")
 
-            self.close()
-            return self.connect().cursor().execute(q)
+            # Replace the session and try once more
+            self.release(connection, dead=(not self.pools or self.is_session_error(e)))
+            return self._hold(self._execute(self.cursor(self.connect()), q, parameters, reconnects=1))
+
+    def _hold(self, cursor: oracledb.Cursor = None) -> oracledb.Cursor:
+        """
+        Remember the pooled session of a `query()` cursor for `release_cursor()` and return the cursor.
+        """
+        if self.pool_max > 0:
+            self._query_sessions[cursor] = cursor.connection
+        return cursor
+
+    def explain(self, q: str = None) -> dict:
+        """
+        Returns the optimizer's estimates for the query, `q`, with `EXPLAIN PLAN` without running it:
+          { rows : estimated rows, cost : estimated cost, bytes : estimated bytes, plan : [ plan lines ] }
+        `EXPLAIN PLAN` does not accept bind values (ORA-01006) so bind variables are estimated without their values.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        """
+        assert isinstance(q, str) and q != "", "q is empty"
+        q, parameters = self.load_sql(q)  # load SQL query from file?
+        connection = self.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{self.PLAN_STATEMENT_ID}' FOR\n{q}")
+            cursor.execute(
+                "SELECT id, depth, operation, options, object_name, cardinality, cost, bytes FROM plan_table WHERE statement_id = :id ORDER BY id",
+                {"id": self.PLAN_STATEMENT_ID},
+            )
+            steps = cursor.fetchall()
+            connection.rollback()  # discard the plan rows
+        finally:
+            if self.pool_max > 0:
+                self.release(connection)
+        assert steps, "no plan"
+        lines = [
+            f"{'  ' * int(depth or 0)}{' '.join(filter(None, [operation, options, object_name]))}  rows={rows} cost={cost}"
+            for id, depth, operation, options, object_name, rows, cost, bytes in steps
+        ]
+        id, depth, operation, options, object_name, rows, cost, bytes = steps[0]  # the statement total
+        return {"rows": int(rows or 0), "cost": int(cost or 0), "bytes": int(bytes or 0), "plan": lines}
+
+    def guard(self, q: str = None, parameters: Union[list, dict] = None, max_rows: int = None, max_cost: int = None, cap: bool = True) -> str:
+        """
+        Returns the query, `q`, after checking its `explain()` estimates against the limits to protect the MNT from runaway queries.
+        A query estimated to return more than `max_rows` is capped with `FETCH FIRST max_rows ROWS ONLY`.
+        Raises ValueError when the estimated cost is more than `max_cost` or, without `cap`, the estimated rows exceed `max_rows`.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        - max_rows (int): the maximum estimated rows. Default: None (no limit)
+        - max_cost (int): the maximum estimated optimizer cost. Default: None (no limit)
+        - cap (bool): cap the rows instead of refusing the query
+        """
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        if max_rows is None and max_cost is None:
+            return q
+        estimate = self.explain(q)
+        self.log.info(f"estimated {estimate['rows']} rows, cost {estimate['cost']}")
+        if max_cost is not None and estimate["cost"] > max_cost:
+            raise ValueError(f"estimated cost {estimate['cost']} exceeds the maximum cost {max_cost}")
+        if max_rows is not None and estimate["rows"] > max_rows:
+            if not cap:
+                raise ValueError(f"estimated {estimate['rows']} rows exceeds the maximum rows {max_rows}")
+            self.log.warning(f"estimated {estimate['rows']} rows; capped at {max_rows} rows")
+            return f"SELECT * FROM (\n{q}\n) FETCH FIRST {max_rows} ROWS ONLY"  # newlines end any `--` comments
+        return q
+
+    def cursor(self, connection: oracledb.Connection = None) -> oracledb.Cursor:
+        """
+        Returns a new cursor for the connection with the configured `arraysize` and `prefetchrows`.
+        - connection (Connection): a connection. Default: `connect()`
+        """
+        cursor = (connection or self.connect()).cursor()
+        cursor.arraysize = self.arraysize
+        cursor.prefetchrows = self.prefetchrows  # must be set before execute()
+        if self.timestamp_format and self.backend is None:
+            cursor.outputtypehandler = self.output_type_handler
+        return cursor
+
+    def fetch_batches(self, cursor: oracledb.Cursor = None, adaptive: bool = False, max_bytes: int = FETCH_BYTES_MAX):
+        """
+        Yield the cursor rows in batches (lists of tuples), one batch per fetch round trip.
+        - cursor (Cursor): an executed cursor
+        - adaptive (bool): double the batch size while rows per second improve, up to `ARRAYSIZE_MAX` rows and `max_bytes`
+        - max_bytes (int): the approximate memory cap for one adaptive batch
+        """
+        size = cursor.arraysize
+        best_rate = 0
+        metrics = self._pending_metrics.get(cursor)
+        try:
+            while True:
+                start, round_trips = time.perf_counter(), self.round_trips()
+                rows = cursor.fetchmany(size)
+                if metrics:
+                    self._count_fetch(metrics, rows, time.perf_counter() - start, self.round_trips() - round_trips)
+                if not rows:
+                    break
+                yield rows
+                if adaptive and size < self.ARRAYSIZE_MAX:
+                    rate = len(rows) / max(time.perf_counter() - start, 1e-6)  # rows per second
+                    row_bytes = self.row_bytes(rows[0])
+                    if len(rows) == size and rate > best_rate and (size * 2 * row_bytes) <= max_bytes:
+                        best_rate = rate
+                        size = min(size * 2, self.ARRAYSIZE_MAX)
+                        cursor.arraysize = size  # rows per round trip
+                        self.log.debug(f"adaptive arraysize={size} @ {int(rate)} rows/s")
+        finally:
+            if metrics:
+                self._finish_metrics(cursor)  # exhausted or closed early by the consumer
+            self.release_cursor(cursor)
+
+    def _on_round_trip(self, *args) -> None:
+        """Count a database round trip of the current thread (oracledb `round_trip_callback`)."""
+        self._local.round_trips = getattr(self._local, "round_trips", 0) + 1
+
+    def round_trips(self) -> int:
+        """
+        Returns the number of database round trips made by the current thread. Always 0 in thick mode and with a backend.
+        """
+        return getattr(self._local, "round_trips", 0)
+
+    @classmethod
+    def row_bytes(cls, row: tuple = None) -> int:
+        """
+        Returns the approximate client memory size of a fetched row in bytes.
+        """
+        return sum(sys.getsizeof(value) for value in row) + sys.getsizeof(row)
+
+    def _execute(self, cursor=None, q: str = None, parameters: Union[list, dict] = None, reconnects: int = 0):
+        """
+        Execute the query with the cursor, start its metrics and return the cursor.
+        The metrics are finished when the cursor is exhausted by `fetch_batches()`.
+        - reconnects (int): the number of sessions replaced before this execute
+        """
+        start, round_trips = time.perf_counter(), self.round_trips()
+        cursor.execute(q, parameters, fetch_lobs=self.fetch_lobs)
+        execute = time.perf_counter() - start
+        with self._metrics_lock:
+            self._pending_metrics[cursor] = {
+                "timestamp": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                "sql": " ".join(q.split())[0 : self.METRICS_SQL_MAX],
+                "start": start,
+                "execute": execute,  # parse, execute and prefetch round trip
+                "first_row": None,  # seconds from execute to the first fetched row
+                "fetch": 0.0,  # seconds waiting for fetch round trips
+                "rows": 0,
+                "batches": 0,
+                "round_trips": self.round_trips() - round_trips,
+                "bytes": 0,
+                "reconnects": reconnects,
+                "node": self.node(getattr(cursor, "connection", None)),
+                "arraysize": cursor.arraysize,
+                "prefetchrows": getattr(cursor, "prefetchrows", None),
+            }
+        return cursor
+
+    def _count_fetch(self, metrics: dict = None, rows: list = None, seconds: float = 0, round_trips: int = 0) -> None:
+        """
+        Add one `fetchmany()` to the query metrics.
+        """
+        metrics["fetch"] += seconds
+        metrics["round_trips"] += round_trips
+        if rows:
+            if metrics["first_row"] is None:
+                metrics["first_row"] = time.perf_counter() - metrics["start"]
+            metrics["rows"] += len(rows)
+            metrics["batches"] += 1
+            metrics["bytes"] += self.row_bytes(rows[0]) * len(rows)  # sample one row per batch
+
+    def _finish_metrics(self, cursor=None) -> dict:
+        """
+        Complete the metrics of the cursor's query, save them to `metrics`, call the metrics hooks and return the metrics.
+        Client time is the time spent by the consumer of the rows between fetches, e.g. formatting and writing them.
+        """
+        with self._metrics_lock:
+            metrics = self._pending_metrics.pop(cursor, None)
+        if metrics is None:
+            return None
+        start = metrics.pop("start")
+        elapsed = time.perf_counter() - start
+        metrics["arraysize"] = cursor.arraysize  # adaptive fetches may grow it
+        metrics["elapsed"] = elapsed
+        metrics["client"] = max(elapsed - metrics["execute"] - metrics["fetch"], 0.0)
+        metrics["rows_per_second"] = int(metrics["rows"] / elapsed) if elapsed > 0 else 0
+        with self._metrics_lock:
+            self.metrics.append(metrics)
+        for hook in self.metrics_hooks:
+            try:
+                hook(metrics)
+            except Exception as e:  # never fail a query for its instrumentation
+                self.log.warning(f"metrics hook {hook}: {e}")
+        self.log.debug(f"metrics: {self.format_metrics(metrics)}")
+        return metrics
+
+    def add_metrics_hook(self, hook=None) -> None:
+        """
+        Add a function to be called with the metrics dict of each query when its results have been fetched.
+        Hooks are called in the thread that fetched the results and must be thread-safe with `query_slices()`.
+        """
+        assert callable(hook), "hook is not callable"
+        self.metrics_hooks.append(hook)
+
+    @classmethod
+    def metrics_jsonl(cls, filepath: str = None):
+        """
+        Returns a metrics hook appending each query's metrics to a JSON Lines file.
+        - filepath (str): the JSON Lines file path
+        """
+        assert isinstance(filepath, str) and filepath != "", "filepath is empty"
+        lock = threading.Lock()
+
+        def hook(metrics: dict) -> None:
+            with lock, open(filepath, mode="a", encoding="utf-8") as fh:
+                fh.write(json.dumps(metrics, default=str) + "\n")
+
+        return hook
+
+    @classmethod
+    def format_metrics(cls, metrics: dict = None) -> str:
+        """
+        Returns a one-line summary of the query metrics.
+        A long `execute` or `first_row` is time spent in the database; a long `fetch` with many round trips suggests a larger
+        `arraysize`; a long `client` time is spent formatting and writing the rows.
+        """
+        return (
+            f"{metrics['rows']} rows in {metrics['elapsed']:.3f}s ({metrics['rows_per_second']} rows/s) | "
+            f"execute {metrics['execute']:.3f}s, first row {metrics['first_row'] or 0:.3f}s, fetch {metrics['fetch']:.3f}s, "
+            f"client {metrics['client']:.3f}s | {metrics['round_trips']} round trips, {metrics['batches']} batches, "
+            f"arraysize {metrics['arraysize']}, ~{metrics['bytes'] // 1024} KiB, {metrics['reconnects']} reconnects"
+        )
+
+    @classmethod
+    def time_slices(cls, start: datetime.datetime = None, end: datetime.datetime = None, slices: int = SLICES_DEFAULT) -> list:
+        """
+        Returns a list of `slices` contiguous (start, end) datetime tuples covering [start, end).
+        """
+        assert isinstance(start, datetime.datetime), "start is not a datetime"
+        assert isinstance(end, datetime.datetime), "end is not a datetime"
+        assert start < end, "start is not before end"
+        assert isinstance(slices, int) and slices > 0, "slices is not an int > 0"
+        step = (end - start) / slices
+        bounds = [start + step * n for n in range(slices)] + [end]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def query_slices(
+        self,
+        q: str = None,
+        column: str = "timestamp",
+        start: datetime.datetime = None,
+        end: datetime.datetime = None,
+        slices: int = SLICES_DEFAULT,
+        ordered: bool = True,
+        parameters: dict = None,
+    ):
+        """
+        Split the query, `q`, into time slices of `column` between `start` and `end` and run them concurrently over the session pool.
+        Yields ([headers], [rows]) batches slice by slice in time order or, when `ordered` is False, in the order they are fetched.
+        `ordered` only orders the slices; rows within a slice are in the query's order. Slices fetched ahead of the consumer are
+        spooled to temporary files so the total time is about that of the slowest slice instead of the sum of all slices.
+        - q (str): a PL/SQL query string or `*.sql` filepath without a `FETCH FIRST` limit
+        - column (str): the DATE or TIMESTAMP column to slice
+        - start (datetime): the inclusive start time
+        - end (datetime): the exclusive end time. Default: now
+        - slices (int): the number of slices. Default: 7
+        - ordered (bool): yield the slices in time order (not the rows within a slice)
+        - parameters (dict): bind variable values for the query
+        """
+        assert isinstance(q, str) and q != "", "q is empty"
+        assert isinstance(column, str) and column.replace("_", "").isalnum(), "column is not a column name"
+        assert self.pool_max > 0, "query_slices() requires pool_max > 0"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        sliced_q = f"SELECT * FROM (\n{q}\n) WHERE {column} >= :slice_start AND {column} < :slice_end"  # newlines end any `--` comments
+        self.log.debug(f"SQL query:\n-----\n{sliced_q}\n-----")
+        bounds = self.time_slices(start, end or datetime.datetime.now(), slices)
+
+        stop = threading.Event()  # the consumer stopped early
+        queues = [queue.Queue() for bound in bounds] if ordered else [queue.Queue(maxsize=self.SLICE_QUEUE_SIZE * self.pool_max)]
+
+        def put(q, item):  # never block forever on a consumer that has stopped
+            while not stop.is_set():
+                try:
+                    return q.put(item, timeout=0.5)
+                except queue.Full:
+                    pass
+
+        def run_slice(n: int, slice_start: datetime.datetime, slice_end: datetime.datetime):
+            out = queues[n] if ordered else queues[0]
+            spool = None  # a temporary file of the batches beyond SLICE_QUEUE_SIZE so later slices never wait for the consumer
+            try:
+                for attempt in range(2):  # replace a dead session and try once more
+                    connection = self.acquire()
+                    try:
+                        cursor = self._execute(
+                            self.cursor(connection), sliced_q, {**(parameters or {}), "slice_start": slice_start, "slice_end": slice_end}, attempt
+                        )
+                        headers = [f"{description[0]}".lower() for description in cursor.description]
+                        self.log.debug(f"slice {n}: {slice_start} - {slice_end}")
+                        for rows in self.fetch_batches(cursor):
+                            if stop.is_set():
+                                break
+                            if ordered and (spool or out.qsize() >= self.SLICE_QUEUE_SIZE):
+                                spool = spool or tempfile.TemporaryFile()
+                                pickle.dump((headers, rows), spool, protocol=pickle.HIGHEST_PROTOCOL)
+                            else:
+                                put(out, (headers, rows))
+                        self.release(connection)
+                        break
+                    except oracledb.Error as e:
+                        dead = self.is_session_error(e)
+                        self.release(connection, dead=dead)
+                        if not dead or attempt > 0:
+                            raise
+                        self.log.warning(f"slice {n}: {e}; retrying")
+                done = None  # slice done
+            except Exception as e:
+                done = e
+            if spool:
+                out.put(spool)  # ordered queues are unbounded
+            put(out, done)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(self.pool_max, len(bounds)))
+        try:
+            [executor.submit(run_slice, n, *bound) for n, bound in enumerate(bounds)]  # FIFO so earlier slices start first
+            for out in queues if ordered else [queues[0]] * len(bounds):
+                while True:
+                    item = out.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    if isinstance(item, tuple):
+                        yield item
+                        continue
+                    with item:  # the rest of the slice from its spool file
+                        item.seek(0)
+                        while True:
+                            try:
+                                yield pickle.load(item)
+                            except EOFError:
+                                break
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for out in queues:  # close the spool files of unconsumed slices
+                while not out.empty():
+                    item = out.get_nowait()
+                    if item is not None and not isinstance(item, (tuple, Exception)):
+                        item.close()
+
+    def cached(self, q: str = None, parameters: Union[list, dict] = None, ttl: int = CACHE_TTL_DEFAULT, refresh: bool = False):
+        """
+        Yield ([headers], [rows]) batches for the query, `q`, from the result cache when a result is younger than `ttl` seconds.
+        Otherwise the query is run and its results are saved to the cache as they are yielded.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        - ttl (int): the maximum age of a cached result, in seconds. Default: 300
+        - refresh (bool): ignore any cached result and replace it
+        """
+        assert isinstance(q, str) and q != "", "q is empty"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        if self.cache is None:
+            cursor = self.query(q, parameters)
+            headers = [f"{column[0]}".lower() for column in cursor.description]
+            yield headers, []
+            for rows in self.fetch_batches(cursor):
+                yield headers, rows
+            return
+
+        source = f"{self.hostname}:{self.port}"  # results are cached per MNT
+        if self.backend is not None:  # or per backend database, like a FakeDataConnect file
+            source = f"{type(self.backend).__name__}:{os.path.abspath(getattr(self.backend, 'filepath', ''))}"
+        key = self.cache.key(q, parameters, self.timestamp_format, source)
+        filepath = None if refresh else self.cache.get(key, ttl)
+        if filepath:
+            self.log.info(f"Cache hit {key}")
+            yield from self.cache.read(filepath)
+        else:
+            self.log.info(f"Cache miss {key}")
+            cursor = self.query(q, parameters)
+            yield from self.cache.write(key, cursor.description, self.fetch_batches(cursor), self.timestamp_format)
+
+    def to_arrow(self, q: str = None, parameters: Union[list, dict] = None):
+        """
+        Returns a pyarrow Table of the query results fetched directly into columnar Arrow buffers with `fetch_df_all()`.
+        No Python objects are created for the rows or values. Column names are the Oracle (uppercase) names.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        """
+        import pyarrow as pa  # lazy load optional dependency
+
+        assert isinstance(q, str) and q != "", "q is empty"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        connection = self.connect()
+        try:
+            if not hasattr(connection, "fetch_df_all"):  # a DB-API backend without the oracledb DataFrame API
+                cursor = self.cursor(connection).execute(q, parameters)
+                headers = [f"{column[0]}".upper() for column in cursor.description]
+                columns = list(zip(*cursor.fetchall())) or [[]] * len(headers)
+                return pa.table({header: list(column) for header, column in zip(headers, columns)})
+            return pa.table(connection.fetch_df_all(q, parameters, arraysize=self.arraysize))
+        finally:
+            if self.pool_max > 0:
+                self.release(connection)
+
+    def to_arrow_batches(self, q: str = None, parameters: Union[list, dict] = None, size: int = None):
+        """
+        Yield pyarrow Tables of up to `size` rows of the query results fetched with `fetch_df_batches()` for large results.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        - size (int): rows per batch. Default: `arraysize`
+        """
+        import pyarrow as pa  # lazy load optional dependency
+
+        assert isinstance(q, str) and q != "", "q is empty"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        connection = self.connect()
+        try:
+            for df in connection.fetch_df_batches(q, parameters, size=size or self.arraysize):
+                yield pa.table(df)
+        finally:
+            if self.pool_max > 0:
+                self.release(connection)
+
+    def to_dataframe(self, q: str = None, parameters: Union[list, dict] = None):
+        """
+        Returns a pandas DataFrame of the query results converted from `to_arrow()`.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        """
+        return self.to_arrow(q, parameters).to_pandas()
+
+    def to_parquet(self, q: str = None, filepath: str = None, parameters: Union[list, dict] = None, compression: str = "zstd") -> int:
+        """
+        Stream the query results to a Parquet file in Arrow batches and return the number of rows.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - filepath (str): the Parquet filepath
+        - parameters (list|dict): bind variable values
+        - compression (str): the Parquet compression codec. Default: zstd
+        """
+        import pyarrow.parquet as pq  # lazy load optional dependency
+
+        assert isinstance(filepath, str) and filepath != "", "filepath is empty"
+        writer, count = None, 0
+        try:
+            for table in self.to_arrow_batches(q, parameters, size=max(self.arraysize, self.FETCH_DF_BATCH_SIZE)):
+                if writer is None:
+                    writer = pq.ParquetWriter(filepath, table.schema, compression=compression)
+                writer.write_table(table)
+                count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+
+    def get_watermark(self, name: str = None, filepath: str = WATERMARKS_FILEPATH) -> dict:
+        """
+        Returns the saved watermark for the named incremental query or None.
+        - name (str): the incremental query name
+        - filepath (str): the watermarks file
+        """
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, mode="r", encoding="utf-8") as fh:
+            return json.load(fh).get(name)
+
+    def set_watermark(self, name: str = None, timestamp: datetime.datetime = None, keys: dict = {}, filepath: str = WATERMARKS_FILEPATH) -> None:
+        """
+        Save the watermark for the named incremental query.
+        - name (str): the incremental query name
+        - timestamp (datetime): the newest timestamp consumed; later queries return rows at or after it
+        - keys (dict): { key : ISO timestamp } of the rows already consumed at or near the timestamp
+        - filepath (str): the watermarks file
+        """
+        assert isinstance(name, str) and name != "", "name is empty"
+        assert isinstance(timestamp, datetime.datetime), "timestamp is not a datetime"
+        watermarks = {}
+        if os.path.exists(filepath):
+            with open(filepath, mode="r", encoding="utf-8") as fh:
+                watermarks = json.load(fh)
+        watermarks[name] = {"timestamp": timestamp.isoformat(), "keys": keys}
+        tmp_filepath = f"{filepath}.tmp"
+        with open(tmp_filepath, mode="w", encoding="utf-8") as fh:
+            json.dump(watermarks, fh, indent=2)
+        os.replace(tmp_filepath, filepath)  # never leave a partial watermarks file
+        self.log.debug(f"watermark {name}: {timestamp.isoformat()} ({len(keys)} keys)")
+
+    def query_incremental(
+        self,
+        name: str = None,
+        q: str = None,
+        column: str = None,
+        key: str = None,
+        start: datetime.datetime = None,
+        overlap: int = WATERMARK_OVERLAP,
+        filepath: str = WATERMARKS_FILEPATH,
+        parameters: dict = None,
+    ):
+        """
+        Yield ([headers], [rows]) batches of only the rows of the query, `q`, newer than the named watermark.
+        The watermark is advanced and saved after the last batch is consumed so an interrupted run is fetched again.
+        - name (str): the incremental query name for the persistent watermark
+        - q (str): a PL/SQL query string or `*.sql` filepath with the `column` and `key` result columns
+        - column (str): the DATE or TIMESTAMP result column
+        - key (str): the unique key result column to break timestamp ties (id, mac_address, ...)
+        - start (datetime): the first watermark when none is saved. Default: now
+        - overlap (int): seconds to re-read before the watermark for rows committed late. Default: 0
+        - filepath (str): the watermarks file
+        - parameters (dict): bind variable values for the query
+        """
+        assert isinstance(q, str) and q != "", "q is empty"
+        assert isinstance(column, str) and column.replace("_", "").isalnum(), "column is not a column name"
+        assert isinstance(key, str) and key.replace("_", "").isalnum(), "key is not a column name"
+        assert isinstance(overlap, int) and overlap >= 0, "overlap is not an int >= 0"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+
+        watermark = self.get_watermark(name, filepath)
+        if watermark:
+            timestamp = datetime.datetime.fromisoformat(watermark["timestamp"])
+            seen = watermark["keys"]  # { key : ISO timestamp }
+        else:
+            timestamp = start or datetime.datetime.now()
+            seen = {}
+        since = timestamp - datetime.timedelta(seconds=overlap)
+
+        # bind the watermark; newlines end any `--` comments
+        cursor = self.query(f"SELECT * FROM (\n{q}\n) WHERE {column} >= :watermark ORDER BY {column} ASC", {**(parameters or {}), "watermark": since})
+        headers = [f"{description[0]}".lower() for description in cursor.description]
+        column_idx = headers.index(column.lower())
+        key_idx = headers.index(key.lower())
+        try:
+            for rows in self.fetch_batches(cursor):
+                rows = [row for row in rows if str(row[key_idx]) not in seen]  # dedupe boundary rows
+                for row in rows:
+                    seen[str(row[key_idx])] = row[column_idx].isoformat()
+                    timestamp = max(timestamp, row[column_idx])
+                if rows:
+                    yield headers, rows
+        finally:
+            self.release_cursor(cursor)  # also when the consumer stops early
+
+        # keep only the keys that the next query may return again
+        since = timestamp - datetime.timedelta(seconds=overlap)
+        seen = {k: ts for k, ts in seen.items() if datetime.datetime.fromisoformat(ts) >= since}
+        self.set_watermark(name, timestamp, seen, filepath)
+
+    @classmethod
+    def keyset_sql(cls, q: str = None, keys: list = None, resume: bool = False) -> str:
+        """
+        Returns the query, `q`, ordered by the key columns and, when resuming, only the rows after the `:key_0`, `:key_1`, ... values.
+        - q (str): a PL/SQL query string with the key result columns
+        - keys (list): the unique, not NULL ordering key columns, e.g. ["timestamp", "id"]
+        - resume (bool): add the keyset predicate
+        """
+        where = ""
+        if resume:  # (k0 > :key_0) OR (k0 = :key_0 AND k1 > :key_1) OR ...
+            terms = [" AND ".join([f"{k} = :key_{n}" for n, k in enumerate(keys[0:i])] + [f"{keys[i]} > :key_{i}"]) for i in range(len(keys))]
+            where = f" WHERE ({') OR ('.join(terms)})"
+        return f"SELECT * FROM (\n{q}\n){where} ORDER BY {', '.join(f'{k} ASC' for k in keys)}"  # newlines end any `--` comments
+
+    def query_resumable(self, q: str = None, keys: list = None, parameters: dict = None, after: list = None, retries: int = RESUME_RETRIES):
+        """
+        Yield ([headers], [rows]) batches of a long extract ordered by a unique key that survives the MNT's maximum connect time
+        (ORA-02399) and session timeouts (ORA-03113). After a session error, the session is replaced and the query resumes after
+        the key of the last yielded row instead of starting again, so no rows are repeated or lost.
+        - q (str): a PL/SQL query string or `*.sql` filepath with the key result columns and without a `FETCH FIRST` limit
+        - keys (list): the unique, not NULL ordering key columns, e.g. ["timestamp", "id"]
+        - parameters (dict): bind variable values for the query
+        - after (list): the key values of the last row of a previous extract to continue from. Default: the first row
+        - retries (int): the maximum number of resumes. Default: 10
+        """
+        assert isinstance(q, str) and q != "", "q is empty"
+        assert isinstance(keys, (list, tuple)) and len(keys) > 0, "keys is not a list of column names"
+        assert all(isinstance(k, str) and k.replace("_", "").isalnum() for k in keys), "keys are not column names"
+        assert after is None or len(after) == len(keys), "after does not have a value for each key"
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+
+        last = list(after) if after else None  # the key values of the last yielded row
+        for attempt in range(retries + 1):
+            connection = self.connect()
+            try:
+                binds = {**(parameters or {}), **({f"key_{n}": v for n, v in enumerate(last)} if last else {})}
+                cursor = self._execute(self.cursor(connection), self.keyset_sql(q, keys, resume=last is not None), binds, reconnects=attempt)
+                headers = [f"{description[0]}".lower() for description in cursor.description]
+                key_idxs = [headers.index(k.lower()) for k in keys]
+                if attempt == 0:
+                    yield headers, []
+                for rows in self.fetch_batches(cursor):
+                    yield headers, rows
+                    last = [rows[-1][i] for i in key_idxs]
+                if self.pool_max > 0:
+                    self.release(connection)
+                return
+            except oracledb.Error as e:
+                if not self.is_session_error(e) or attempt >= retries:
+                    raise
+                self.log.warning(f"{e}; resuming after {keys}={last} ({attempt + 1}/{retries})")
+                self.release(connection, dead=True)
+
+    @classmethod
+    def is_cursor(cls, o) -> bool:
+        """Returns True if the object is an oracledb cursor or a DB-API cursor from a backend, not ([headers], [rows]) batches."""
+        return isinstance(o, oracledb.Cursor) or (hasattr(o, "description") and hasattr(o, "fetchmany"))
+
+    @classmethod
+    def is_session_error(cls, e: Exception = None) -> bool:
+        """
+        Returns True if the exception means the database session is dead and must be replaced.
+        """
+        return any(code in str(e) for code in cls.SESSION_ERRORS)
 
     def _handle_exception(self, e: Exception = None) -> None:
         """Handle an Exception."""
         tb_text = "\n".join(traceback.format_exc().splitlines()[1:])  # remove 'Traceback (most recent call last):'
         self.log.error(f"{e.__class__} | {tb_text}")
 
+    def load_sql(self, q: str = None, parameters: Union[list, dict] = None) -> tuple:
+        """
+        Returns the (SQL, parameters) for the query string or `*.sql` filepath.
+        Bind variables declared with `-- @param` in a SQL file header use their declared defaults unless given.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        """
+        if not q.strip().lower().endswith(".sql"):
+            return q, parameters
+        from isedc_catalog import QueryCatalog  # lazy load
+
+        declared = QueryCatalog.parse_header(q)["params"]
+        if declared and (parameters is None or isinstance(parameters, dict)):
+            defaults = {name: QueryCatalog.TYPES[spec["type"]](spec["default"]) for name, spec in declared.items() if spec["default"] is not None}
+            parameters = {**defaults, **(parameters or {})}
+        return self.read_sql_file(q), parameters
+
     def read_sql_file(self, filepath: str = None) -> str:
         """
         Read and return the file contents at the filepath.
@@ -262,41 +1285,130 @@ class ISEDC:
         with open(filepath, mode="r", encoding="utf-8") as fh:
             return fh.read()
 
-    def csv_stream(self, cursor: oracledb.Cursor = None, filepath="-"):
+    @classmethod
+    def open_output(cls, filepath: str = "-", compression: str = None):
+        """
+        Returns a text file for writing to the filepath or `sys.stdout` ('-'), optionally compressed in a worker thread.
+        Close it unless it is `sys.stdout`.
+        - filepath (str): the output file path or '-' for `sys.stdout`
+        - compression (str): None, `gzip` or `zstd`
+        """
+        if compression is None:
+            return sys.stdout if filepath == "-" else open(filepath, "w")
+        binary_fh = sys.stdout.buffer if filepath == "-" else open(filepath, "wb")
+        writer = CompressedWriter(binary_fh, compression, close_fh=(filepath != "-"))
+        return io.TextIOWrapper(io.BufferedWriter(writer, CompressedWriter.CHUNK_SIZE), encoding="utf-8", newline="")
+
+    def csv_stream(self, cursor=None, filepath="-", adaptive: bool = False, compression: str = None):
         """
         Return the query results in a stream of comma-separated values (CSV) format.
-        - cursor (Cursor): cursor
+        - cursor (Cursor): cursor or an iterable of ([headers], [rows]) batches from `query_slices()`, `cached()`, ...
         - file (File): file
+        - adaptive (bool): grow the fetch batch size while rows per second improve
+        - compression (str): compress the CSV with `gzip` or `zstd` in a worker thread while the rows are fetched. Default: None
         """
         self.log.debug(f"cursor={cursor}, filepath={filepath}")
 
-        assert isinstance(cursor, oracledb.Cursor)
+        assert cursor is not None
         assert isinstance(filepath, str)
         assert filepath is not None
         assert filepath != ""
-        fh = sys.stdout if filepath == "-" else open(filepath, "w")  # write to sys.stdout/terminal by default
 
-        # Get header names from cursor.description, a list of sets about each column:
-        #   [ (name, type_code, display_size, internal_size, precision, scale, null_ok), ... ]
-        headers = [f"{column[0]}".lower() for column in cursor.description]
-        writer = csv.writer(fh, quoting=0, skipinitialspace=True)
-        writer.writerow(headers)
-        while True:
-            rows = cursor.fetchmany()  # use default Cursor.arraysize
-            if not rows:
-                break
-            writer.writerows(rows)
+        if self.is_cursor(cursor):
+            # Get header names from cursor.description, a list of sets about each column:
+            #   [ (name, type_code, display_size, internal_size, precision, scale, null_ok), ... ]
+            headers = [f"{column[0]}".lower() for column in cursor.description]
+            batches = itertools.chain([(headers, [])], ((headers, rows) for rows in self.fetch_batches(cursor, adaptive=adaptive)))
+        else:
+            batches = cursor
+
+        fh = self.open_output(filepath, compression)  # write to sys.stdout/terminal by default
+        try:
+            writer = csv.writer(fh, quoting=0, skipinitialspace=True)
+            for n, (headers, rows) in enumerate(batches):
+                if n == 0:
+                    writer.writerow(headers)
+                writer.writerows(rows)
+        finally:
+            if fh is not sys.stdout:
+                fh.close()
+
+    def write_lob(self, value=None, filepath: str = None) -> None:
+        """
+        Write a str, bytes or LOB locator value to a file. LOB locators are read in chunks of about `LOB_CHUNK_SIZE`.
+        """
+        binary = isinstance(value, bytes) or (isinstance(value, oracledb.LOB) and value.type == oracledb.DB_TYPE_BLOB)
+        with open(filepath, mode="wb" if binary else "w", encoding=None if binary else "utf-8") as fh:
+            if not isinstance(value, oracledb.LOB):
+                fh.write(value)
+                return
+            chunk_size = max(value.getchunksize(), self.LOB_CHUNK_SIZE // value.getchunksize() * value.getchunksize())  # whole LOB chunks
+            offset = 1  # LOB offsets start at 1
+            while True:
+                data = value.read(offset, chunk_size)
+                if not data:
+                    break
+                fh.write(data)
+                offset += len(data)
+
+    def lob_sidecars(self, cursor=None, directory: str = None, max_size: int = LOB_INLINE_MAX):
+        """
+        Yield ([headers], [rows]) batches with the LOB values larger than `max_size` written to sidecar files in the directory.
+        The value in the row is replaced by the sidecar filepath, `<directory>/<column>_<row>.txt|bin`.
+        LOB locators (`fetch_lobs=True`) of up to `max_size` are read inline; larger ones are streamed in chunks.
+        - cursor (Cursor): cursor or an iterable of ([headers], [rows]) batches
+        - directory (str): the sidecar files directory
+        - max_size (int): the maximum characters or bytes of an inline value. Default: 32767 (the VARCHAR2 maximum)
+        """
+        assert isinstance(directory, str) and directory != "", "directory is empty"
+        assert isinstance(max_size, int) and max_size >= 0, "max_size is not an int >= 0"
+        if self.is_cursor(cursor):
+            headers = [f"{column[0]}".lower() for column in cursor.description]
+            cursor = itertools.chain([(headers, [])], ((headers, rows) for rows in self.fetch_batches(cursor)))
+        os.makedirs(directory, exist_ok=True)
+
+        n = 0  # the row number of the extract
+        for headers, rows in cursor:
+            sidecar_rows = []
+            for row in rows:
+                n += 1
+                if not any(isinstance(v, oracledb.LOB) or (isinstance(v, (str, bytes)) and len(v) > max_size) for v in row):
+                    sidecar_rows.append(row)  # nothing to do for most rows
+                    continue
+                values = list(row)
+                for i, v in enumerate(values):
+                    if isinstance(v, oracledb.LOB) and v.size() <= max_size:
+                        values[i] = v.read()
+                    elif isinstance(v, oracledb.LOB) or (isinstance(v, (str, bytes)) and len(v) > max_size):
+                        binary = isinstance(v, bytes) or (isinstance(v, oracledb.LOB) and v.type == oracledb.DB_TYPE_BLOB)
+                        filepath = os.path.join(directory, f"{headers[i]}_{n:08d}.{'bin' if binary else 'txt'}")
+                        self.write_lob(v, filepath)
+                        values[i] = filepath
+                sidecar_rows.append(tuple(values))
+            yield headers, sidecar_rows
+
+    def schema_catalog(self, refresh: bool = False):
+        """
+        Returns the persistent schema catalog of the Data Connect views and columns for lookups without a database round trip.
+        The catalog is rebuilt with a single query when it is older than its TTL or for a different database version.
+        - refresh (bool): rebuild the catalog now
+        """
+        from isedc_schema import SchemaCatalog  # lazy load
+
+        if self.schema is None:
+            self.schema = SchemaCatalog(SchemaCatalog.default_filepath(self.hostname), level=self.log.level)
+        version = self.connection.version if self.connection else None  # only check the version of an existing connection
+        if refresh or self.schema.is_stale(version=version):
+            self.log.info(f"Refreshing schema catalog {self.schema.filepath}")
+            self.schema.refresh(self)
+        return self.schema
 
     def tables(self):
         """
         Returns a list of all ISE Data Connect tables.
         """
-        sql_dc_tables = """SELECT view_name FROM user_views ORDER BY view_name ASC"""
-
         try:
-            cursor = self.query(sql_dc_tables)  # returns a cursor for iterating
-            rows = cursor.fetchall()
-            return [row[0].lower() for row in rows]  # convert [(tuple),(tuple),...] to list
+            return self.schema_catalog().tables()
         except oracledb.Error as e:
             self._handle_exception(e)
 
@@ -305,30 +1417,114 @@ class ISEDC:
         Returns a list of all ISE Data Connect tables.
         - table (str): a single character string.
         """
-        sql_dc_table_columns = f"""SELECT table_name, column_name FROM all_tab_columns WHERE table_name = '{table.strip().upper()}' ORDER BY table_name ASC, column_name ASC"""
-        self.log.debug(f"columns(table={table}): sql_dc_table_columns: {sql_dc_table_columns}")
+        self.log.debug(f"columns(table={table})")
         try:
-            cursor = self.query(sql_dc_table_columns)
-            rows = cursor.fetchall()
-            return [row[1].lower() for row in rows]  # convert [(tuple),(tuple),...] to list
+            return sorted(self.schema_catalog().columns(table))
         except Exception as e:
             self._handle_exception(e)
 
-    def column_widths(self, table: str = None, columns: list = []):
-        """ """
+    def profile(self, table: str = None, refresh: bool = False, ttl: int = None) -> dict:
+        """
+        Returns the column profile of a table with the maximum width, null count and approximate distinct count of every column:
+          { "created": epoch, "rows": n, "columns": { column : { "type", "width", "nulls", "distinct" } } }
+        All columns are profiled with a single aggregate query (one round trip) and the profile is saved in the schema catalog.
+        - table (str): the table (view) name
+        - refresh (bool): profile the table now instead of using a saved profile
+        - ttl (int): the seconds a saved profile may be used. Default: `SchemaCatalog.PROFILE_TTL_DEFAULT`
+        """
+        self.log.debug(f"table={table}, refresh={refresh}, ttl={ttl}")
+        schema = self.schema_catalog()
+        assert isinstance(table, str) and table.lower() in schema, f"Unknown table: {table}"  # only catalog names reach the SQL
+        table = table.strip().lower()
+        profile = None if refresh else schema.get_profile(table, ttl or schema.PROFILE_TTL_DEFAULT)
+        if profile is not None:
+            return profile
+
+        types = {column: type for column, type in schema.column_types(table).items() if column not in schema.columns(table, tz=True)}
+        selects = ["COUNT(*)"]
+        for column, type in types.items():
+            lob = type in self.PROFILE_LOB_TYPES
+            long = type in self.PROFILE_LONG_TYPES
+            selects.append("NULL" if long or type == "BLOB" else f"MAX(LENGTH({column}))")
+            selects.append("NULL" if long else f"COUNT(*) - COUNT({column})")
+            selects.append("NULL" if lob else f"APPROX_COUNT_DISTINCT({column})")
+        cursor = self.query(f"SELECT {', '.join(selects)} FROM {table}")
+        try:
+            row = cursor.fetchone()
+        finally:
+            self.release_cursor(cursor)
+
+        profile = {"created": int(time.time()), "rows": row[0], "columns": {}}
+        for n, (column, type) in enumerate(types.items()):
+            width, nulls, distinct = row[1 + 3 * n : 4 + 3 * n]
+            if type == "DATE":
+                width = len("YYYY-MM-DD HH:MM:SS")  # Python's datetime string, not the Oracle NLS format
+            elif type.startswith("TIMESTAMP"):
+                width = len("YYYY-MM-DD HH:MM:SS.ffffff")
+            profile["columns"][column] = {"type": type, "width": width or 0, "nulls": nulls, "distinct": distinct}
+        schema.set_profile(table, profile)
+        return profile
+
+    def column_widths(self, table: str = None, columns: list = []) -> dict:
+        """
+        Returns a dict of { column : maximum value width } for the table columns from the table's `profile()`.
+        - table (str): the table (view) name
+        - columns (list): the column names. Default: all profiled columns
+        """
         self.log.debug(f"table={table}, columns={columns}")
-        # normalie columns to a list
         if not isinstance(columns, list):
             raise ValueError(f"columns is not a list")
-        if len(columns) <= 0:
-            columns = self.columns(table)  # get columns for the table
-            self.log.debug(f"Fetched columns: {columns}")
+        profile = self.profile(table)["columns"]
+        return {column: profile[column]["width"] for column in (columns or profile) if column in profile}
+
+    def fixed_stream(self, cursor=None, widths: dict = {}, format: str = "table", filepath: str = "-") -> None:
+        """
+        Stream the query results as a fixed-width text, table or markdown table without buffering the rows.
+        Column widths come from `column_widths()` instead of the rows so each batch is printed as it is fetched.
+        Values wider than their column (newer than the profile) are printed in full.
+        - cursor (Cursor): cursor or an iterable of ([headers], [rows]) batches from `query_slices()`, `cached()`, ...
+        - widths (dict): { column : width }. Columns without a width use the cursor display size up to `COLUMN_WIDTH_MAX`
+        - format (str): one of `STREAM_FORMATS`
+        - filepath (str): Default: `sys.stdout` ('-')
+        """
+        assert cursor is not None
+        assert format in self.STREAM_FORMATS, f"format is not one of {self.STREAM_FORMATS}"
+
+        sizes = {}
+        if self.is_cursor(cursor):
+            headers = [f"{column[0]}".lower() for column in cursor.description]
+            sizes = {f"{column[0]}".lower(): column[2] for column in cursor.description}  # display_size
+            batches = itertools.chain([(headers, [])], ((headers, rows) for rows in self.fetch_batches(cursor)))
+        else:
+            batches = cursor
+
+        def cells(values: list, numeric: list) -> list:
+            return [f"{v:>{w}}" if r else f"{v:<{w}}" for v, w, r in zip(values, column_widths, numeric)]
 
-        widths = []
-        for column in columns:
-            cursor = self.query(f"SELECT MAX(LENGTH({column})) AS width FROM {table}")
-            widths += (column, cursor.fetchone()[0])
-            return widths
+        fh = sys.stdout if filepath == "-" else open(filepath, "w")
+        try:
+            for n, (headers, rows) in enumerate(batches):
+                if n == 0:
+                    defaults = {header: min(sizes.get(header) or self.COLUMN_WIDTH_MAX, self.COLUMN_WIDTH_MAX) for header in headers}
+                    column_widths = [max(len(header), widths.get(header, defaults[header])) for header in headers]
+                    if format == "markdown":
+                        print(f"| {' | '.join(cells(headers, [False] * len(headers)))} |", file=fh)
+                        print(f"|{'|'.join(['-' * (w + 2) for w in column_widths])}|", file=fh)
+                    else:
+                        print("  ".join(cells(headers, [False] * len(headers))).rstrip(), file=fh)
+                        if format == "table":
+                            print("  ".join(["-" * w for w in column_widths]), file=fh)
+                for row in rows:
+                    numeric = [isinstance(v, (int, float, decimal.Decimal)) and not isinstance(v, bool) for v in row]
+                    values = ["" if v is None else f"{v}" for v in row]
+                    if format == "markdown":
+                        values = [v.replace("|", "\\|") for v in values]  # escape cell separators
+                        print(f"| {' | '.join(cells(values, numeric))} |", file=fh)
+                    else:
+                        print("  ".join(cells(values, numeric)).rstrip(), file=fh)
+        finally:
+            if fh is not sys.stdout:
+                fh.close()
 
     def show(self, data: Union[list, oracledb.Cursor] = None, headers: list = None, format: str = "text", filepath: str = "-") -> None:
         """
@@ -351,9 +1547,9 @@ class ISEDC:
         assert data != None
 
         # normalize cursor results to a `data` table ([list] of iterables) and headers
-        if isinstance(data, oracledb.Cursor):
+        if self.is_cursor(data):
             headers = [f"{column[0]}".lower() for column in data.description]
-            table = data.fetchall()  # returns a list of tuples
+            table = [row for rows in self.fetch_batches(data) for row in rows]  # a list of tuples
         else:
             table = data
 
@@ -401,6 +1597,187 @@ class ISEDC:
         return True if (isinstance(o, int) and o > 0) or (isinstance(o, str) and s[0:1].lower() in ["t", "y", "o"]) else False
 
 
+class AsyncISEDC(ISEDC):
+    """
+    An asyncio ISEDC using the python-oracledb async API so many Data Connect queries may run at once on one event loop.
+    Use `pool_max` > 1 to run queries concurrently; a single standalone connection runs one statement at a time.
+
+        async with AsyncISEDC(hostname=..., password=..., pool_max=4) as isedc:
+            nodes, auths = await asyncio.gather(isedc.fetchall("SELECT * FROM node_list"), isedc.fetchall(SQL_AUTHS))
+            async for headers, rows in isedc.stream("SELECT * FROM radius_authentications"):
+                ...
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the database connection and session pool."""
+        await self.close()
+
+    async def connect(self) -> oracledb.AsyncConnection:
+        """
+        Connect to the database and return the async connection or a borrowed session when using a pool.
+        """
+        if self.pool_max > 0:
+            return await self.acquire()
+
+        if self.connection != None:
+            return self.connection
+
+        for attempt in range(self.DB_CONNECT_RETRIES):
+            try:
+                self.log.info(f"Attempting to connect ({attempt + 1}/{self.DB_CONNECT_RETRIES})...")
+                self.connection = await oracledb.connect_async(params=self.params, tcp_connect_timeout=self.DB_CONNECT_TIMEOUT)
+                if self.connection:
+                    self.log.info(f"Connected successfully")
+                    return self.connection
+            except oracledb.DatabaseError as e:
+                self.log.error(e)
+        raise Exception(f"Failed to connect to the database after {self.DB_CONNECT_RETRIES} attempts")
+
+    def create_pool(self) -> oracledb.AsyncConnectionPool:
+        """
+        Create and return the async session pool, if it does not already exist.
+        """
+        if self.pool is None:
+            self.log.info(f"Creating async session pool (min={self.pool_min}, max={self.pool_max})")
+            self.pool = oracledb.create_pool_async(
+                params=oracledb.PoolParams(
+                    min=self.pool_min,
+                    max=self.pool_max,
+                    increment=1,
+                    getmode=oracledb.POOL_GETMODE_TIMEDWAIT,  # wait for a free session
+                    wait_timeout=self.POOL_WAIT_TIMEOUT,
+                    ping_interval=self.POOL_PING_INTERVAL,
+                    tcp_connect_timeout=self.DB_CONNECT_TIMEOUT,
+                    **self._params_kwargs(),
+                )
+            )
+        return self.pool
+
+    async def acquire(self) -> oracledb.AsyncConnection:
+        """
+        Borrow a session from the async pool, creating the pool if necessary.
+        """
+        assert self.pool_max > 0, "acquire() requires pool_max > 0"
+        return await self.create_pool().acquire()
+
+    async def release(self, connection: oracledb.AsyncConnection = None, dead: bool = False) -> None:
+        """
+        Release a borrowed session back to the pool or drop it when the session is dead.
+        A dead standalone connection is closed so the next `connect()` replaces it.
+        """
+        try:
+            if self.pool is not None:
+                await (self.pool.drop(connection) if dead else self.pool.release(connection))
+            elif dead:
+                await self.close()
+        except oracledb.Error as e:
+            self.log.debug(f"release: {e}")
+
+    async def close(self):
+        """Close the database connection and session pool."""
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+            self.log.info(f"Connection closed")
+        if self.pool:
+            await self.pool.close(force=True)
+            self.pool = None
+            self.log.info(f"Session pool closed")
+
+    def cursor(self, connection: oracledb.AsyncConnection = None) -> oracledb.AsyncCursor:
+        """
+        Returns a new async cursor for the connection with the configured `arraysize` and `prefetchrows`.
+        """
+        cursor = connection.cursor()
+        cursor.arraysize = self.arraysize
+        cursor.prefetchrows = self.prefetchrows  # must be set before execute()
+        return cursor
+
+    async def stream(self, q: str = None, parameters: Union[list, dict] = None, adaptive: bool = False):
+        """
+        Asynchronously yield ([headers], [rows]) tuples for the query, `q`, with one batch of rows per fetch round trip.
+        A borrowed pool session is released when the iteration ends.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        - adaptive (bool): double the batch size while rows per second improve, up to `ARRAYSIZE_MAX` rows and `FETCH_BYTES_MAX`
+        """
+        assert isinstance(q, str) and q != ""
+        q, parameters = self.load_sql(q, parameters)  # load SQL query from file?
+        self.log.debug(f"SQL query:\n-----\n{q}\n-----")
+
+        connection = await self.connect()
+        try:
+            try:
+                cursor = self.cursor(connection)
+                await cursor.execute(q, parameters)
+            except oracledb.Error as e:
+                self.log.error(f"{e}")
+                if not self.is_session_error(e):
+                    raise
+                await self.release(connection, dead=True)  # replace the session and try once more
+                connection = await self.connect()
+                cursor = self.cursor(connection)
+                await cursor.execute(q, parameters)
+
+            headers = [f"{column[0]}".lower() for column in cursor.description]
+            size, best_rate = cursor.arraysize, 0
+            while True:
+                start = time.perf_counter()
+                rows = await cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield headers, rows
+                if adaptive and size < self.ARRAYSIZE_MAX:
+                    rate = len(rows) / max(time.perf_counter() - start, 1e-6)  # rows per second
+                    row_bytes = sum(sys.getsizeof(value) for value in rows[0]) + sys.getsizeof(rows[0])
+                    if len(rows) == size and rate > best_rate and (size * 2 * row_bytes) <= self.FETCH_BYTES_MAX:
+                        best_rate, size = rate, min(size * 2, self.ARRAYSIZE_MAX)
+                        cursor.arraysize = size
+        finally:
+            if self.pool is not None:
+                await self.release(connection)
+
+    async def fetchall(self, q: str = None, parameters: Union[list, dict] = None) -> tuple:
+        """
+        Returns a tuple of the column names and all rows, ([headers], [rows]), for the query, `q`.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - parameters (list|dict): bind variable values
+        """
+        headers, table = [], []
+        async for headers, rows in self.stream(q, parameters):
+            table.extend(rows)
+        return headers, table
+
+    async def tables(self) -> list:
+        """
+        Returns a list of all ISE Data Connect tables.
+        """
+        headers, rows = await self.fetchall("SELECT view_name FROM user_views ORDER BY view_name ASC")
+        return [row[0].lower() for row in rows]
+
+    async def csv_stream(self, q: str = None, filepath: str = "-", parameters: Union[list, dict] = None, adaptive: bool = False):
+        """
+        Write the query results in a stream of comma-separated values (CSV) format.
+        - q (str): a PL/SQL query string or `*.sql` filepath
+        - filepath (str): Default: `sys.stdout`
+        """
+        fh = sys.stdout if filepath == "-" else open(filepath, "w")
+        writer = csv.writer(fh, quoting=0, skipinitialspace=True)
+        try:
+            first = True
+            async for headers, rows in self.stream(q, parameters, adaptive=adaptive):
+                if first:
+                    writer.writerow(headers)
+                    first = False
+                writer.writerows(rows)
+        finally:
+            if fh is not sys.stdout:
+                fh.close()
+
+
 if __name__ == "__main__":
     """
     Run from script.
@@ -409,70 +1786,162 @@ if __name__ == "__main__":
 
     # Set up the command-line argument argp
     argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
-    argp.add_argument("query", help="an Oracle PL/SQL Query in double-quotes or *.sql filepath", default=None)
+    argp.add_argument("query", help="an Oracle PL/SQL Query in double-quotes, *.sql filepath or @name from data/SQL", default=None)
     argp.add_argument("-n", "--hostname", action="store", default=None, help="ISE MNT hostname or IP address", type=str)
+    argp.add_argument("-m", "--mnts", action="store", default=None, help="more MNT nodes to share queries and fail over to, comma-separated. Default: ISE_SMNT", type=str)
     argp.add_argument("-u", "--username", action="store", default=None, help="Data Connect username", type=str)
     argp.add_argument("-p", "--password", action="store", default=None, help="Data Connect password", type=str)
     argp.add_argument("-f", "--format", choices=ISEDC.FORMATS, default="csv")
     argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
     argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
     argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script execution time")
-    args = argp.parse_args()
+    argp.add_argument("-a", "--arraysize", action="store", default=ISEDC.ARRAYSIZE_DEFAULT, type=int, help="rows per fetch round trip")
+    argp.add_argument("--prefetchrows", action="store", default=ISEDC.PREFETCHROWS_DEFAULT, type=int, help="rows returned with the execute")
+    argp.add_argument("--adaptive", action="store_true", default=False, help="grow the CSV fetch size while rows/second improves")
+    argp.add_argument("--slice-column", action="store", default=None, help="split the query into time slices of this column", type=str)
+    argp.add_argument("--start", action="store", default=None, help="slice start time (ISO 8601)", type=datetime.datetime.fromisoformat)
+    argp.add_argument("--end", action="store", default=None, help="slice end time (ISO 8601). Default: now", type=datetime.datetime.fromisoformat)
+    argp.add_argument("--slices", action="store", default=ISEDC.SLICES_DEFAULT, help="number of concurrent time slices", type=int)
+    argp.add_argument("-o", "--output", action="store", default="-", help="output filepath. Default: stdout", type=str)
+    argp.add_argument("--compress", choices=CompressedWriter.COMPRESSIONS, default=None, help="compress the CSV output in a worker thread")
+    argp.add_argument("--lob-dir", action="store", default=None, help="write LOB values larger than --lob-max to files in this directory", type=str)
+    argp.add_argument("--lob-max", action="store", default=ISEDC.LOB_INLINE_MAX, help="maximum characters or bytes of an inline LOB value", type=int)
+    argp.add_argument("--lob-locators", action="store_true", default=False, help="fetch LOB locators and stream large LOBs in chunks (less memory)")
+    argp.add_argument("--timestamps", action="store", default=None, help="Fetch DATE/TIMESTAMP as strings in this Oracle format, or 'auto' for the output format's. Default: datetimes", type=str)
+    argp.add_argument("--explain", action="store_true", default=False, help="show the estimated rows and cost of the query without running it")
+    argp.add_argument("--max-rows", action="store", default=os.environ.get("ISE_DC_MAX_ROWS"), help="cap queries estimated to return more rows", type=int)
+    argp.add_argument("--max-cost", action="store", default=os.environ.get("ISE_DC_MAX_COST"), help="refuse queries with a higher estimated cost", type=int)
+    argp.add_argument("--force", action="store_true", default=False, help="run the query regardless of --max-rows and --max-cost")
+    argp.add_argument("--unordered", action="store_true", default=False, help="stream slices as they finish instead of in time order")
+    argp.add_argument("--keyset", action="store", default=None, help="resume after session errors ordered by these unique columns, e.g. timestamp,id", type=str)
+    argp.add_argument("--cache", action="store", nargs="?", const=ISEDC.CACHE_TTL_DEFAULT, default=None, help="use cached results up to TTL seconds old", type=int)
+    argp.add_argument("--refresh", action="store_true", default=False, help="replace any cached result")
+    argp.add_argument("--parquet", action="store", default=None, help="export the results to a Parquet file with Arrow batches", type=str)
+    argp.add_argument("--fake", action="store", default=None, help="query a fake Data Connect SQLite database (isedc_fake.py)", type=str)
+    argp.add_argument("--stream", action="store_true", default=False, help="stream markdown|table|text with profiled column widths")
+    argp.add_argument("--stats", action="store_true", default=False, help="show the query metrics (time, rows, round trips, ...)")
+    argp.add_argument("--metrics", action="store", default=None, help="append the query metrics to a JSON Lines file", type=str)
+    args, extra_args = argp.parse_known_args()  # @name query parameters
 
     if args.query is None or args.query == "":
         sys.exit(f"Required query is empty")
-    if args.timer:
-        import time  # lazy load
+    parameters = None
+    if args.query.startswith("@"):  # a query catalog name with `--param value` options
+        from isedc_catalog import QueryCatalog  # lazy load
 
+        catalog = QueryCatalog()
+        name = args.query[1:]
+        if name not in catalog:
+            sys.exit(f"✖ Unknown query '{name}'. Run `isedc_catalog.py` to list the queries.")
+        try:
+            args.query, parameters = catalog.bind(name, vars(catalog.argparser(name).parse_args(extra_args)))
+        except ValueError as e:
+            sys.exit(f"✖ {e}")
+    elif extra_args:
+        argp.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    if args.slice_column and args.start is None:
+        sys.exit(f"--slice-column requires --start")
+    if args.lob_locators and not args.lob_dir:
+        sys.exit(f"--lob-locators requires --lob-dir")
+    if args.compress and args.format != "csv":
+        sys.exit(f"--compress requires the csv format")
+    if args.timer:
         start_time = time.time()
 
+    cache = None
+    if args.cache is not None or args.refresh:
+        from isedc_cache import QueryCache  # lazy load optional pyarrow dependency
+
+        cache = QueryCache(level=args.level)
+
+    backend = None
+    if args.fake:
+        from isedc_fake import FakeDataConnect  # lazy load
+
+        backend = FakeDataConnect(args.fake)
+        args.hostname = args.hostname or os.path.splitext(os.path.basename(args.fake))[0]  # a schema catalog per database
+        args.password = args.password or FakeDataConnect.PASSWORD
+
     # Merge settings from 1) CLI args, 2) environment variables and 3) static defaults
     with ISEDC(
         hostname=(args.hostname or os.environ.get("ISE_PMNT")),
+        hostnames=[h.strip() for h in (args.mnts or os.environ.get("ISE_SMNT", "")).split(",") if h.strip()],
         username=(args.username or os.environ.get("ISE_DC_USERNAME", ISEDC.DATACONNECT_USERNAME)),
         password=(args.password or os.environ.get("ISE_DC_PASSWORD")),
         insecure=args.insecure or os.environ.get("ISE_VERIFY", "True")[0:1].lower() in ["f", "n"],
         level=args.level,
+        arraysize=args.arraysize,
+        prefetchrows=args.prefetchrows,
+        pool_max=(args.slices if args.slice_column else 0),
+        cache=cache,
+        backend=backend,
+        metrics_hook=(ISEDC.metrics_jsonl(args.metrics) if args.metrics else None),
+        fetch_lobs=args.lob_locators,
+        timestamp_format=(None if args.keyset else ISEDC.TIMESTAMP_FORMATS.get(args.format)) if args.timestamps == "auto" else args.timestamps,  # exact keyset keys
     ) as isedc:
 
         try:
 
+            if args.explain:
+                estimate = isedc.explain(args.query)
+                print("\n".join(estimate["plan"]))
+                print(f"ⓘ ~{estimate['rows']} rows, cost {estimate['cost']}, ~{estimate['bytes'] // 1024} KiB", file=sys.stderr)
+                sys.exit(0)
+            if not args.force and (args.max_rows is not None or args.max_cost is not None):
+                args.query, parameters = isedc.load_sql(args.query, parameters)
+                try:
+                    cap = not (args.slice_column or args.keyset)  # a capped query cannot be sliced or resumed
+                    args.query = isedc.guard(args.query, parameters, args.max_rows, args.max_cost, cap=cap)
+                except ValueError as e:
+                    sys.exit(f"✖ {e}. Add a time predicate or use --force.")
+
             # Use CSV by default to stream results without large memory buffering.
-            if args.format == "csv":
-                # Get header names from cursor.description, a list of sets about each column:
-                #   [ (name, type_code, display_size, internal_size, precision, scale, null_ok), ... ]
-                cursor = isedc.query(args.query)
-                headers = [f"{i[0]}".lower() for i in cursor.description]
-                writer = csv.writer(sys.stdout, quoting=0, skipinitialspace=True)
-                writer.writerow(headers)
-                while True:
-                    rows = cursor.fetchmany()  # use default Cursor.arraysize
-                    if not rows:
-                        break
-                    writer.writerows(rows)
+            if args.parquet:
+                print(f"✔ {isedc.to_parquet(args.query, args.parquet, parameters)} rows saved to {args.parquet}", file=sys.stderr)
             else:
-                isedc.show(data=isedc.query(args.query), format=args.format)
-
-        except oracledb.DatabaseError as e:
-            if "DPY-3022" in str(e):
-                import re
-
-                table_matches = re.search(r".* FROM (\w+).*", args.query)
-                if table_matches:  # None if no regex matches are found
-                    table_name = table_matches.group(1)
-                    columns = isedc.columns(table_name)
-                    print(columns)
-                print(f"{str(e)}\nPlease select columns without a timezone:\n{', '.join(list(map(str.lower, columns)))}", file=sys.stderr)
-            elif "ORA-00942" in str(e):
-                import re
-
-                table_matches = re.search(r".* FROM (\w+).*", args.query)
-                if table_matches:  # None if no regex matches are found
-                    table_name = table_matches.group(1)
-                    tables = [s for s in isedc.tables() if s.startswith(table_name[0:4])]
-                print(f"{str(e)}\nPlease verify the table name '{table_name}'.\nDid you mean {tables}", file=sys.stderr)
+                if args.keyset:
+                    batches = isedc.query_resumable(args.query, args.keyset.split(","), parameters)
+                elif args.slice_column:
+                    batches = isedc.query_slices(args.query, args.slice_column, args.start, args.end, args.slices, not args.unordered, parameters)
+                elif cache:
+                    batches = isedc.cached(args.query, parameters, ttl=args.cache or ISEDC.CACHE_TTL_DEFAULT, refresh=args.refresh)
+                else:
+                    batches = isedc.query(args.query, parameters)  # cursor
+                if args.lob_dir:
+                    batches = isedc.lob_sidecars(batches, args.lob_dir, args.lob_max)
+
+                if args.format == "csv":
+                    isedc.csv_stream(batches, args.output, adaptive=args.adaptive, compression=args.compress)
+                elif args.stream and args.format in ISEDC.STREAM_FORMATS:
+                    table_matches = re.search(r"\bFROM\s+(\w+)", isedc.load_sql(args.query)[0], flags=re.IGNORECASE)
+                    table_name = table_matches.group(1).lower() if table_matches else None
+                    widths = isedc.column_widths(table_name) if table_name and table_name in isedc.schema_catalog() else {}
+                    isedc.fixed_stream(batches, widths, format=args.format, filepath=args.output)
+                elif ISEDC.is_cursor(batches):
+                    isedc.show(data=batches, format=args.format, filepath=args.output)
+                else:
+                    headers, table = None, []
+                    for headers, rows in batches:
+                        table.extend(rows)
+                    isedc.show(data=table, headers=headers, format=args.format, filepath=args.output)
+
+        except (oracledb.DatabaseError, sqlite3.Error) as e:
+            table_matches = re.search(r"\bFROM\s+(\w+)", isedc.load_sql(args.query)[0], flags=re.IGNORECASE)
+            table_name = table_matches.group(1).lower() if table_matches else None  # None if no regex matches are found
+            if "DPY-3022" in str(e) and table_name and table_name in isedc.schema_catalog():
+                schema = isedc.schema_catalog()
+                print(
+                    f"{str(e)}\nThe {table_name} columns with a timezone are not supported: {', '.join(schema.columns(table_name, tz=True))}"
+                    f"\nPlease select columns without a timezone:\n{schema.select(table_name)}",
+                    file=sys.stderr,
+                )
+            elif ("ORA-00942" in str(e) or "no such table" in str(e)) and table_name:  # Oracle or FakeDataConnect
+                print(f"{str(e)}\nPlease verify the table name '{table_name}'.\nDid you mean {isedc.schema_catalog().suggest(table_name)}", file=sys.stderr)
             else:
                 print(f"{str(e)}")
 
+        if args.stats:
+            [print(f"⏱ {ISEDC.format_metrics(metrics)}", file=sys.stderr) for metrics in isedc.metrics]
+
     if args.timer:
         print(f"⏱ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
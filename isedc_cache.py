@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+An on-disk ISE Data Connect query result cache so repeated reports and ad-hoc queries do not re-run heavy SQL on the MNT.
+Results are keyed by the SHA-256 of the normalized SQL text, bind values and timestamp format and stored as zstd-compressed Parquet files.
+Each lookup has a time-to-live (TTL) and the least-recently-used results are evicted when the cache exceeds `max_bytes`.
+
+⚠ Requires the optional `pyarrow` package: `pip install pyarrow`
+
+Usage:
+  isedc_cache.py info                 # show the cached results
+  isedc_cache.py clear                # remove all cached results
+  isedc.py "SELECT * FROM network_devices" --cache 300   # use cached results up to 5 minutes old
+  isedc.py "SELECT * FROM network_devices" --cache 300 --refresh
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import datetime
+import decimal
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+CACHE_DIRECTORY_DEFAULT = os.path.join(os.path.expanduser("~"), ".cache", "isedc")
+
+
+class QueryCache:
+
+    # Class attributes
+    SUFFIX = ".parquet"
+    COMPRESSION = "zstd"
+    TTL_DEFAULT = 300  # seconds
+    MAX_BYTES_DEFAULT = 1024 * 1024 * 1024  # 1 GB
+    BATCH_SIZE = 10000  # rows per Parquet row group and read batch
+    RE_TOKENS = re.compile(r"""('(?:[^']|'')*'|"[^"]*")|((?:\s+|--[^\n]*)+)""")  # quoted literals | whitespace and `--` comments
+
+    def __init__(self, directory: str = CACHE_DIRECTORY_DEFAULT, max_bytes: int = MAX_BYTES_DEFAULT, level: str = "WARNING") -> None:
+        """
+        Creates a QueryCache in the directory.
+
+        - directory (str): the cache directory. Default: `~/.cache/isedc`
+        - max_bytes (int): the maximum total size of the cached results. Default: 1 GB
+        - level (str): logging threshold level
+        """
+        assert isinstance(directory, str) and directory != "", "directory is empty"
+        assert isinstance(max_bytes, int) and max_bytes > 0, "max_bytes is not an int > 0"
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.log = logging.getLogger(__name__)
+        self.log.setLevel(level)
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def normalize(cls, q: str = None) -> str:
+        """
+        Returns the SQL without `--` comments, repeated whitespace or a trailing semicolon.
+        Quoted string literals and identifiers are kept exactly.
+        """
+        q = cls.RE_TOKENS.sub(lambda m: m.group(1) or " ", q)
+        return q.strip().rstrip(";").strip()
+
+    @classmethod
+    def key(cls, q: str = None, parameters=None, timestamp_format: str = None, source: str = None) -> str:
+        """
+        Returns the cache key (SHA-256 hex digest) of the normalized query, its bind values and the timestamp format, if any.
+        - source (str): the database the results come from (`hostname:port` or a fake database) so MNTs do not share results
+        """
+        text = cls.normalize(q) + "\n" + json.dumps(parameters, sort_keys=True, default=str)
+        if source:
+            text = source + "\n" + text
+        if timestamp_format:  # DATE/TIMESTAMP columns fetched as strings
+            text += "\n" + timestamp_format
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def filepath(self, key: str = None) -> str:
+        return os.path.join(self.directory, f"{key}{self.SUFFIX}")
+
+    def get(self, key: str = None, ttl: int = TTL_DEFAULT) -> str:
+        """
+        Returns the filepath of the cached result if it is younger than `ttl` seconds or None.
+        """
+        filepath = self.filepath(key)
+        if not os.path.exists(filepath):
+            return None
+        age = time.time() - os.path.getmtime(filepath)
+        if age > ttl:
+            self.log.info(f"Expired {key} ({int(age)}s > {ttl}s)")
+            return None
+        os.utime(filepath, times=(time.time(), os.path.getmtime(filepath)))  # access time orders LRU eviction
+        return filepath
+
+    def read(self, filepath: str = None):
+        """
+        Yield ([headers], [rows]) batches of tuples from the cached result file.
+        """
+        import pyarrow.parquet as pq  # lazy load optional dependency
+
+        parquet = pq.ParquetFile(filepath)
+        headers = parquet.schema_arrow.names
+        integral = [(field.metadata or {}).get(b"number") == b"1" for field in parquet.schema_arrow]
+        if parquet.metadata.num_rows == 0:
+            yield headers, []  # the headers of an empty result
+        for batch in parquet.iter_batches(batch_size=self.BATCH_SIZE):
+            columns = [column.to_pylist() for column in batch.columns]
+            for idx in [idx for idx, flag in enumerate(integral) if flag]:  # oracledb returns integral NUMBERs as int
+                columns[idx] = [int(v) if isinstance(v, float) and v.is_integer() else v for v in columns[idx]]
+            yield headers, list(zip(*columns))
+
+    @classmethod
+    def schema(cls, description: list = None, timestamp_format: str = None):
+        """
+        Returns a pyarrow schema for the oracledb cursor description so every batch has the same column types.
+        DATE and TIMESTAMP columns are strings when they are fetched with a `timestamp_format` (see `ISEDC.timestamp_format`).
+        """
+        import oracledb
+        import pyarrow as pa  # lazy load optional dependency
+
+        fields = []
+        for name, type_code, display_size, internal_size, precision, scale, null_ok in description:
+            metadata = None
+            if type_code is oracledb.DB_TYPE_NUMBER:
+                if scale == 0 and 0 < precision <= 18:
+                    arrow_type = pa.int64()
+                else:  # unconstrained NUMBER values may be int or float
+                    arrow_type, metadata = pa.float64(), {"number": "1"}
+            elif type_code in (oracledb.DB_TYPE_BINARY_DOUBLE, oracledb.DB_TYPE_BINARY_FLOAT):
+                arrow_type = pa.float64()
+            elif type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+                arrow_type = pa.string() if timestamp_format else pa.timestamp("us")
+            elif type_code in (oracledb.DB_TYPE_RAW, oracledb.DB_TYPE_LONG_RAW, oracledb.DB_TYPE_BLOB):
+                arrow_type = pa.binary()
+            elif type_code is oracledb.DB_TYPE_BOOLEAN:
+                arrow_type = pa.bool_()
+            else:  # VARCHAR, CHAR, CLOB, ...
+                arrow_type = pa.string()
+            fields.append(pa.field(f"{name}".lower(), arrow_type, metadata=metadata))
+        return pa.schema(fields)
+
+    def write(self, key: str = None, description: list = None, batches=None, timestamp_format: str = None):
+        """
+        Yield the ([headers], [rows]) batches while writing them to the cache.
+        The result is only added to the cache when all batches have been consumed.
+
+        - key (str): the cache key
+        - description (list): the oracledb cursor description
+        - batches (iterable): the batches of row tuples from the database
+        - timestamp_format (str): the Oracle format of DATE and TIMESTAMP strings, if they are not datetimes
+        """
+        import pyarrow as pa  # lazy load optional dependency
+        import pyarrow.parquet as pq
+
+        schema = self.schema(description, timestamp_format)
+        headers = schema.names
+        filepath = self.filepath(key)
+        tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+        writer = pq.ParquetWriter(tmp_filepath, schema, compression=self.COMPRESSION)
+        try:
+            count = 0
+            for rows in batches:
+                count += len(rows)
+                columns = list(zip(*rows))
+                arrays = [pa.array(self._values(column, field.type), type=field.type) for column, field in zip(columns, schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=self.BATCH_SIZE)
+                yield headers, rows
+            if count == 0:
+                yield headers, []  # the headers of an empty result
+            writer.close()
+            os.replace(tmp_filepath, filepath)  # never leave a partial result in the cache
+            self.log.info(f"Cached {key} ({os.path.getsize(filepath)} bytes)")
+            self.evict()
+        finally:
+            if os.path.exists(tmp_filepath):  # the consumer stopped early or an error occurred
+                writer.close()
+                os.remove(tmp_filepath)
+
+    @classmethod
+    def _values(cls, column: tuple = None, arrow_type=None) -> list:
+        """
+        Returns the column values converted for the arrow type.
+        """
+        import pyarrow as pa  # lazy load optional dependency
+
+        if pa.types.is_string(arrow_type):
+            return [v if v is None or isinstance(v, str) else str(v) for v in column]
+        if pa.types.is_floating(arrow_type):
+            return [float(v) if isinstance(v, (int, decimal.Decimal)) else v for v in column]
+        return column
+
+    def entries(self) -> list:
+        """
+        Returns a list of (filepath, size, last access time) tuples for the cached results, least-recently used first.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((os.path.join(self.directory, name), stat.st_size, stat.st_atime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self) -> int:
+        """
+        Remove the least-recently used results until the cache is no larger than `max_bytes` and return the number removed.
+        """
+        entries = self.entries()
+        total = sum([size for filepath, size, atime in entries])
+        removed = 0
+        for filepath, size, atime in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(filepath)
+            total -= size
+            removed += 1
+            self.log.info(f"Evicted {os.path.basename(filepath)} ({size} bytes)")
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove all cached results and return the number removed.
+        """
+        entries = self.entries()
+        [os.remove(filepath) for filepath, size, atime in entries]
+        return len(entries)
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("command", choices=["info", "clear"], help="cache command")
+    argp.add_argument("-d", "--directory", action="store", default=CACHE_DIRECTORY_DEFAULT, help="cache directory", type=str)
+    args = argp.parse_args()
+
+    cache = QueryCache(args.directory)
+    if args.command == "info":
+        entries = cache.entries()
+        for filepath, size, atime in entries:
+            modified = datetime.datetime.fromtimestamp(os.path.getmtime(filepath)).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{os.path.basename(filepath)} {size:>12} bytes  {modified}")
+        print(f"{len(entries)} results, {sum([entry[1] for entry in entries])} bytes in {args.directory}")
+    elif args.command == "clear":
+        print(f"✔ {cache.clear()} results removed from {args.directory}", file=sys.stderr)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+A catalog of the ISE Data Connect SQL queries in `data/SQL` with bind variable parameters declared in each file's header comment.
+Bind variables (`:days`) let Oracle reuse the parsed statement from the oracledb statement cache instead of a hard parse for
+every new literal value and they are never vulnerable to SQL injection.
+
+Declare parameters in the header comment block with `-- @param <name> <type> [default] [: description]`:
+  --
+  -- RADIUS Authentications by Policy
+  -- @param days int 30 : last N days
+  --
+  SELECT ... FROM radius_authentications WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY')
+
+Parameter types: str, int, float, date (YYYY-MM-DD), datetime (YYYY-MM-DD HH:MM:SS). Parameters without a default are required.
+⚠ Define the bind variables before pasting these queries into an ad-hoc SQL client (SQL*Plus: `VARIABLE days NUMBER`).
+
+Usage:
+  isedc_catalog.py                                  # list the queries and their parameters
+  isedc_catalog.py radius_auths_by_policy           # show the query
+  isedc.py @radius_auths_by_policy --days 7 -f table
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import datetime
+import os
+import re
+
+CATALOG_DIRECTORY_DEFAULT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "SQL")
+
+
+class QueryCatalog:
+
+    # Class attributes
+    SUFFIX = ".sql"
+    RE_PARAM = re.compile(r"^--\s*@param\s+(\w+)\s+(\w+)(?:\s+([^:\s]\S*))?\s*(?::\s*(.*))?$")
+    TYPES = {
+        "str": str,
+        "int": int,
+        "float": float,
+        "date": lambda s: datetime.datetime.strptime(s, "%Y-%m-%d"),
+        "datetime": lambda s: datetime.datetime.strptime(s, "%Y-%m-%d %H:%M:%S"),
+    }
+
+    def __init__(self, directory: str = CATALOG_DIRECTORY_DEFAULT) -> None:
+        """
+        Creates a QueryCatalog and indexes the `*.sql` files in the directory.
+
+        - directory (str): the SQL directory. Default: `data/SQL` next to this script
+        """
+        assert isinstance(directory, str) and os.path.isdir(directory), f"directory does not exist: {directory}"
+        self.directory = directory
+        self.queries = {}  # { name : { filepath, description, params } }
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(self.SUFFIX):
+                name = filename[: -len(self.SUFFIX)]
+                self.queries[name] = self.parse_header(os.path.join(directory, filename))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.queries
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    @classmethod
+    def parse_header(cls, filepath: str = None) -> dict:
+        """
+        Returns a dict with the `filepath`, `description` and `params` declared in the leading comment block of the SQL file.
+        """
+        description = None
+        params = {}  # { name : { type, default, help } }
+        with open(filepath, mode="r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line.startswith("--"):
+                    break  # end of the header comment block
+                match = cls.RE_PARAM.match(line)
+                if match:
+                    name, type, default, help = match.groups()
+                    if type not in cls.TYPES:
+                        raise ValueError(f"{filepath}: unknown @param type '{type}' for '{name}'")
+                    params[name] = {"type": type, "default": default, "help": help or ""}
+                elif description is None and line.strip("- ") != "" and not line.strip("- ").startswith(("Author:", "License:", "💡")):
+                    description = line.strip("- ")
+        return {"filepath": filepath, "description": description or "", "params": params}
+
+    def sql(self, name: str = None) -> str:
+        """
+        Returns the SQL text of the named query.
+        """
+        if name not in self.queries:
+            raise KeyError(f"Unknown query '{name}'")
+        with open(self.queries[name]["filepath"], mode="r", encoding="utf-8") as fh:
+            return fh.read()
+
+    def bind(self, name: str = None, values: dict = {}) -> tuple:
+        """
+        Returns the (SQL, { bind variable : value }) of the named query with the values converted to their declared types.
+        Values that are not given use their declared defaults.
+
+        - name (str): the query name
+        - values (dict): the parameter values as strings or typed values
+        """
+        parameters = {}
+        for param, spec in self.queries[name]["params"].items():
+            value = values.get(param)
+            if value is None:
+                value = spec["default"]
+            if value is None:
+                raise ValueError(f"Query '{name}' requires --{param}")
+            try:
+                parameters[param] = self.TYPES[spec["type"]](value) if isinstance(value, str) else value
+            except ValueError:
+                raise ValueError(f"Query '{name}' --{param} is not a valid {spec['type']}: {value}")
+        return self.sql(name), parameters
+
+    def argparser(self, name: str = None) -> argparse.ArgumentParser:
+        """
+        Returns an argument parser for the named query's parameters (`--days 7`).
+        """
+        argp = argparse.ArgumentParser(prog=f"@{name}", description=self.queries[name]["description"])
+        for param, spec in self.queries[name]["params"].items():
+            default = f"Default: {spec['default']}" if spec["default"] is not None else "required"
+            argp.add_argument(f"--{param}", action="store", default=None, help=f"{spec['help']} ({spec['type']}, {default})")
+        return argp
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("name", nargs="?", default=None, help="query name to show")
+    argp.add_argument("-d", "--directory", action="store", default=CATALOG_DIRECTORY_DEFAULT, help="SQL directory", type=str)
+    args = argp.parse_args()
+
+    catalog = QueryCatalog(args.directory)
+    if args.name:
+        print(catalog.sql(args.name))
+    else:
+        for name, query in catalog.queries.items():
+            params = " ".join([f"--{param} {spec['default'] or '?'}" for param, spec in query["params"].items()])
+            print(f"@{name} {params}".strip(), f"  {query['description']}" if query["description"] != name else "", sep="")
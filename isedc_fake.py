@@ -0,0 +1,1208 @@
+#!/usr/bin/env python3
+"""
+A fake ISE Data Connect backend in SQLite for testing and benchmarking ISEDC without an ISE MNT node.
+The database has the Data Connect view names and columns used by `data/SQL` and `isedc_reports.py` plus `all_tab_columns` and
+`user_views` for the schema catalog. A synthetic data generator fills the views with any number of rows.
+
+Oracle SQL is rewritten for SQLite when it is executed so the `data/SQL` queries run unchanged, except `PIVOT`:
+  `FETCH FIRST n ROWS ONLY`, `sysdate - NUMTODSINTERVAL(n, 'DAY'|'HOUR')`, `sysdate - n`, `TO_CHAR(ts, 'YYYY-MM-DD HH24:MI:SS')`,
+  `CAST(x AS DATE) - CAST(y AS DATE)`, `CAST(x AS TIMESTAMP)`, `TRUNC(ts[, 'MI'|'HH24'|'DD'])`, `NVL()`, `APPROX_COUNT_DISTINCT()`,
+  `sysdate` and `systimestamp`. `TO_CHAR(n, 'FM999D00')`, `REGEXP_LIKE()` and `MEDIAN()` are SQLite functions.
+`EXPLAIN PLAN SET STATEMENT_ID = 'id' FOR <query>` saves the query's actual row count as the estimate in `plan_table`, or the
+table's row count when the query has bind variables, and like Oracle it rejects bind values.
+
+Usage:
+  isedc_fake.py fake_dc.db                      # create a fake database with 10,000 RADIUS authentications
+  isedc_fake.py fake_dc.db --rows 1000000 -t    # millions of rows for benchmarks
+  isedc.py --fake fake_dc.db @radius_auths --hours 24 -t > auths.csv
+  isedc.py --fake fake_dc.db "SELECT * FROM network_devices" -f table
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import datetime
+import itertools
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+
+# Data Connect views : [ (column, Oracle data type) ]
+VIEWS = {
+    "radius_authentications": [
+        ("id", "NUMBER"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("passed", "VARCHAR2"),
+        ("failed", "NUMBER"),
+        ("calling_station_id", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("user_type", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_type", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("nas_port_id", "VARCHAR2"),
+        ("nas_port_type", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("policy_set_name", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("access_service", "VARCHAR2"),
+        ("audit_session_id", "VARCHAR2"),
+        ("authentication_method", "VARCHAR2"),
+        ("authentication_protocol", "VARCHAR2"),
+        ("authorization_rule", "VARCHAR2"),
+        ("authorization_profiles", "VARCHAR2"),
+        ("endpoint_profile", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("framed_ip_address", "VARCHAR2"),
+        ("security_group", "VARCHAR2"),
+        ("service_type", "VARCHAR2"),
+        ("syslog_message_code", "NUMBER"),
+        ("response_time", "NUMBER"),
+        ("posture_status", "VARCHAR2"),
+    ],
+    "radius_accounting": [
+        ("id", "NUMBER"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("acct_session_id", "VARCHAR2"),
+        ("acct_status_type", "VARCHAR2"),
+        ("syslog_message_code", "NUMBER"),
+        ("acct_session_time", "NUMBER"),
+        ("acct_input_octets", "NUMBER"),
+        ("acct_output_octets", "NUMBER"),
+        ("acct_input_packets", "NUMBER"),
+        ("acct_output_packets", "NUMBER"),
+        ("acct_terminate_cause", "VARCHAR2"),
+        ("calling_station_id", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("framed_ip_address", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("audit_session_id", "VARCHAR2"),
+        ("session_id", "VARCHAR2"),
+        ("service_type", "VARCHAR2"),
+        ("access_service", "VARCHAR2"),
+        ("nas_port", "NUMBER"),
+        ("response_time", "NUMBER"),
+    ],
+    "endpoints_data": [
+        ("id", "VARCHAR2"),
+        ("mac_address", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("update_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("endpoint_ip", "VARCHAR2"),
+        ("endpoint_policy", "VARCHAR2"),
+        ("matched_value", "NUMBER"),
+        ("static_assignment", "VARCHAR2"),
+        ("static_group_assignment", "VARCHAR2"),
+        ("custom_attributes", "VARCHAR2"),
+        ("hostname", "VARCHAR2"),
+        ("auth_store_id", "VARCHAR2"),
+        ("byod_reg", "VARCHAR2"),
+        ("device_registrations_status", "VARCHAR2"),
+        ("endpoint_id", "VARCHAR2"),
+        ("endpoint_policy_id", "VARCHAR2"),
+        ("endpoint_policy_version", "NUMBER"),
+        ("endpoint_unique_id", "VARCHAR2"),
+        ("identity_group_id", "VARCHAR2"),
+        ("matched_policy_id", "VARCHAR2"),
+        ("native_udid", "VARCHAR2"),
+        ("nmap_subnet_scanid", "NUMBER"),
+        ("phone_id_type", "VARCHAR2"),
+        ("phone_id", "VARCHAR2"),
+        ("portal_user", "VARCHAR2"),
+        ("posture_applicable", "VARCHAR2"),
+        ("posture_expiry", "VARCHAR2"),
+        ("profile_server", "VARCHAR2"),
+        ("reg_timestamp", "NUMBER"),
+        ("unique_subject_id", "VARCHAR2"),
+        ("version", "NUMBER"),
+    ],
+    "change_configuration_audit": [
+        ("id", "NUMBER"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("admin_name", "VARCHAR2"),
+        ("details", "VARCHAR2"),
+        ("event", "VARCHAR2"),
+        ("failure_flag", "VARCHAR2"),
+        ("host_id", "VARCHAR2"),
+        ("interface", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("applied_to_acs_instance", "VARCHAR2"),
+        ("local_mode", "VARCHAR2"),
+        ("message_class", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("modified_properties", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("nas_ipv6_address", "VARCHAR2"),
+        ("operation_message_text", "VARCHAR2"),
+        ("request_response_type", "VARCHAR2"),
+        ("requested_operation", "VARCHAR2"),
+        ("object_id", "VARCHAR2"),
+        ("object_name", "VARCHAR2"),
+        ("object_type", "VARCHAR2"),
+    ],
+    "network_device_groups": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("update_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("created_by", "VARCHAR2"),
+        ("active_status", "VARCHAR2"),
+    ],
+    "network_devices": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("ip_mask", "VARCHAR2"),
+        ("profile_name", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("type", "VARCHAR2"),
+    ],
+    "endpoint_identity_groups": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("created_by", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("update_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("status", "VARCHAR2"),
+    ],
+    "node_list": [
+        ("hostname", "VARCHAR2"),
+        ("node_type", "VARCHAR2"),
+        ("node_role", "VARCHAR2"),
+        ("active_status", "VARCHAR2"),
+        ("pdp_services", "VARCHAR2"),
+        ("udi_pid", "VARCHAR2"),
+        ("udi_vid", "VARCHAR2"),
+        ("udi_sn", "VARCHAR2"),
+        ("patch_version", "NUMBER"),
+        ("vm_info", "VARCHAR2"),
+    ],
+    "policy_sets": [
+        ("id", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("update_time", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("policyset_status", "VARCHAR2"),
+        ("policyset_name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+    ],
+    "authorization_profiles": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+    ],
+    "security_groups": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("sgt_dec", "NUMBER"),
+        ("sgt_hex", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("learned_from", "VARCHAR2"),
+    ],
+    "security_group_acls": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("ip_version", "VARCHAR2"),
+        ("modelled_content", "VARCHAR2"),
+    ],
+    "aaa_diagnostics_view": [
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("session_id", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("message_severity", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("message_text", "VARCHAR2"),
+        ("category", "VARCHAR2"),
+        ("info", "VARCHAR2"),
+    ],
+    "adapter_status": [
+        ("logged_at", "TIMESTAMP(6)"),
+        ("status", "VARCHAR2"),
+        ("id", "VARCHAR2"),
+        ("adapter_name", "VARCHAR2"),
+        ("connectivity", "VARCHAR2"),
+    ],
+    "admin_users": [
+        ("id", "NUMBER"),
+        ("status", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("first_name", "VARCHAR2"),
+        ("last_name", "VARCHAR2"),
+        ("email_address", "VARCHAR2"),
+        ("admin_group", "VARCHAR2"),
+        ("external_user", "VARCHAR2"),
+        ("read_only", "VARCHAR2"),
+        ("password_never_expires", "VARCHAR2"),
+        ("inactive_account_never_disabled", "VARCHAR2"),
+        ("allow_password_change_after_login", "VARCHAR2"),
+    ],
+    "administrator_logins": [
+        ("timestamp", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("admin_name", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("ipv6_address", "VARCHAR2"),
+        ("interface", "VARCHAR2"),
+        ("admin_session", "VARCHAR2"),
+        ("event_details", "VARCHAR2"),
+        ("event", "VARCHAR2"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+    ],
+    "endpoint_purge_view": [
+        ("id", "VARCHAR2"),
+        ("endpoint_purge_id", "VARCHAR2"),
+        ("run_time", "TIMESTAMP(6)"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("profiler_server", "VARCHAR2"),
+        ("endpoint_purge_rule", "VARCHAR2"),
+        ("endpoint_count", "NUMBER"),
+    ],
+    "failure_code_cause": [
+        ("failure_code", "NUMBER"),
+        ("failure_cause", "VARCHAR2"),
+    ],
+    "guest_accounting": [
+        ("logged_at", "TIMESTAMP(6)"),
+        ("identity", "VARCHAR2"),
+        ("time_spent", "NUMBER"),
+        ("logged_in", "TIMESTAMP(6)"),
+        ("logged_out", "TIMESTAMP(6)"),
+        ("endpoint_id", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+    ],
+    "guest_devicelogin_audit": [
+        ("id", "NUMBER"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("username", "VARCHAR2"),
+        ("mac_address", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("operation", "VARCHAR2"),
+        ("result", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("portal_name", "VARCHAR2"),
+        ("psn_hostname", "VARCHAR2"),
+    ],
+    "key_performance_metrics": [
+        ("avg_latency_per_req", "NUMBER"),
+        ("avg_load", "NUMBER"),
+        ("avg_tps", "NUMBER"),
+        ("ise_node", "VARCHAR2"),
+        ("logged_time", "TIMESTAMP(6)"),
+        ("logged_to_mnt_hr", "NUMBER"),
+        ("max_load", "NUMBER"),
+        ("noise_hr", "NUMBER"),
+        ("radius_requests_hr", "NUMBER"),
+        ("suppression_hr", "NUMBER"),
+    ],
+    "logical_profiles": [
+        ("logical_profile", "VARCHAR2"),
+        ("assigned_policies", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("system_type", "VARCHAR2"),
+    ],
+    "misconfigured_nas_view": [
+        ("timestamp", "TIMESTAMP(6)"),
+        ("calling_station_id", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("nas_ipv6_address", "VARCHAR2"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("detail_info", "VARCHAR2"),
+        ("failed_attempts", "NUMBER"),
+        ("failed_times_hours", "VARCHAR2"),
+        ("failed_times", "VARCHAR2"),
+        ("id", "NUMBER"),
+        ("ise_node", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("message_text", "VARCHAR2"),
+        ("other_attributes", "VARCHAR2"),
+    ],
+    "misconfigured_supplicants_view": [
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("access_service", "VARCHAR2"),
+        ("audit_session_id", "VARCHAR2"),
+        ("authentication_method", "VARCHAR2"),
+        ("authentication_protocol", "VARCHAR2"),
+        ("calling_station_id", "VARCHAR2"),
+        ("credential_check", "VARCHAR2"),
+        ("device_type", "VARCHAR2"),
+        ("endpoint_profile", "VARCHAR2"),
+        ("execution_steps", "VARCHAR2"),
+        ("failed", "NUMBER"),
+        ("failure_reason", "VARCHAR2"),
+        ("framed_ip_address", "VARCHAR2"),
+        ("framed_ipv6_address", "VARCHAR2"),
+        ("id", "NUMBER"),
+        ("identity_group", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("mdm_server_name", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("message_text", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("nas_ipv6_address", "VARCHAR2"),
+        ("nas_port_id", "VARCHAR2"),
+        ("nas_port_type", "VARCHAR2"),
+        ("network_device_name", "VARCHAR2"),
+        ("other_attributes", "VARCHAR2"),
+        ("passed", "VARCHAR2"),
+        ("posture_status", "VARCHAR2"),
+        ("response_time", "NUMBER"),
+        ("response", "VARCHAR2"),
+        ("security_group", "VARCHAR2"),
+        ("selected_authorization_profiles", "VARCHAR2"),
+        ("service_type", "VARCHAR2"),
+        ("user_type", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+    ],
+    "network_access_users": [
+        ("username", "VARCHAR2"),
+        ("status", "VARCHAR2"),
+        ("account_name_alias", "VARCHAR2"),
+        ("alarm_emailable", "VARCHAR2"),
+        ("allow_password_change_after_login", "VARCHAR2"),
+        ("current_successful_login_time", "TIMESTAMP(6)"),
+        ("description", "VARCHAR2"),
+        ("email_address", "VARCHAR2"),
+        ("expiry_date_enabled", "VARCHAR2"),
+        ("expiry_date", "TIMESTAMP(6)"),
+        ("failed_login_ipaddress", "VARCHAR2"),
+        ("first_name", "VARCHAR2"),
+        ("id", "NUMBER"),
+        ("identity_group", "VARCHAR2"),
+        ("is_admin", "VARCHAR2"),
+        ("last_name", "VARCHAR2"),
+        ("last_successful_login_time", "TIMESTAMP(6)"),
+        ("last_unsuccessful_login_time", "TIMESTAMP(6)"),
+        ("password_last_updated_on", "TIMESTAMP(6)"),
+        ("password_never_expires", "VARCHAR2"),
+        ("success_login_ipaddress", "VARCHAR2"),
+    ],
+    "openapi_operations": [
+        ("logged_at", "TIMESTAMP(6)"),
+        ("request_time", "VARCHAR2"),
+        ("administrator", "VARCHAR2"),
+        ("client_ip", "VARCHAR2"),
+        ("server", "VARCHAR2"),
+        ("http_method", "VARCHAR2"),
+        ("http_code", "NUMBER"),
+        ("http_status", "VARCHAR2"),
+        ("request_body", "VARCHAR2"),
+        ("request_id", "VARCHAR2"),
+        ("request_name", "VARCHAR2"),
+        ("response_duration", "NUMBER"),
+        ("error_message", "VARCHAR2"),
+        ("message_text", "VARCHAR2"),
+        ("response", "VARCHAR2"),
+    ],
+    "posture_assessment_by_condition": [
+        ("condition_status", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("logged_at", "TIMESTAMP(6)"),
+        ("policy", "VARCHAR2"),
+        ("policy_status", "VARCHAR2"),
+        ("enforcement_name", "VARCHAR2"),
+        ("enforcement_type", "VARCHAR2"),
+        ("enforcement_status", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("request_time", "VARCHAR2"),
+        ("response_time", "NUMBER"),
+        ("endpoint_id", "VARCHAR2"),
+        ("endpoint_os", "VARCHAR2"),
+        ("posture_agent_version", "VARCHAR2"),
+        ("posture_status", "VARCHAR2"),
+        ("posture_policy_matched", "VARCHAR2"),
+        ("posture_report", "VARCHAR2"),
+        ("anti_virus_installed", "VARCHAR2"),
+        ("anti_spyware_installed", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("pra_enforcement", "VARCHAR2"),
+        ("pra_interval", "NUMBER"),
+        ("pra_action", "VARCHAR2"),
+        ("pra_grace_time", "NUMBER"),
+        ("identity", "VARCHAR2"),
+        ("session_id", "VARCHAR2"),
+        ("feed_url", "VARCHAR2"),
+        ("num_of_updates", "NUMBER"),
+        ("user_agreement_status", "VARCHAR2"),
+        ("system_name", "VARCHAR2"),
+        ("system_domain", "VARCHAR2"),
+        ("system_user", "VARCHAR2"),
+        ("system_user_domain", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("am_installed", "VARCHAR2"),
+        ("condition_name", "VARCHAR2"),
+    ],
+    "posture_assessment_by_endpoint": [
+        ("posture_status", "VARCHAR2"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("am_installed", "VARCHAR2"),
+        ("anti_spyware_installed", "VARCHAR2"),
+        ("anti_virus_installed", "VARCHAR2"),
+        ("endpoint_mac_address", "VARCHAR2"),
+        ("endpoint_operating_system", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("feed_url", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("message_text", "VARCHAR2"),
+        ("nad_location", "VARCHAR2"),
+        ("posture_agent_version", "VARCHAR2"),
+        ("posture_policy_matched", "VARCHAR2"),
+        ("pra_action", "VARCHAR2"),
+        ("pra_grace_time", "NUMBER"),
+        ("request_time", "VARCHAR2"),
+        ("response_time", "NUMBER"),
+        ("session_id", "VARCHAR2"),
+        ("system_domain", "VARCHAR2"),
+        ("system_name", "VARCHAR2"),
+        ("system_user_domain", "VARCHAR2"),
+        ("system_user", "VARCHAR2"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("user_agreement_status", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("id", "NUMBER"),
+        ("posture_report", "VARCHAR2"),
+        ("pra_enforcement_flag", "VARCHAR2"),
+        ("pra_interval", "NUMBER"),
+        ("num_of_updates", "NUMBER"),
+    ],
+    "posture_grace_period": [
+        ("mac_list", "VARCHAR2"),
+        ("last_grace_expiry", "TIMESTAMP(6)"),
+    ],
+    "primary_guest": [
+        ("details", "VARCHAR2"),
+        ("portal_name", "VARCHAR2"),
+        ("result", "VARCHAR2"),
+        ("sponsor_first_name", "VARCHAR2"),
+        ("sponsor_last_name", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("sponsor_email_address", "VARCHAR2"),
+        ("sponsor_phone_number", "VARCHAR2"),
+        ("sponsor_company", "VARCHAR2"),
+        ("guest_last_name", "VARCHAR2"),
+        ("guest_first_name", "VARCHAR2"),
+        ("guest_email_address", "VARCHAR2"),
+        ("guest_phone_number", "VARCHAR2"),
+        ("guest_company", "VARCHAR2"),
+        ("guest_status", "VARCHAR2"),
+        ("guest_type", "VARCHAR2"),
+        ("valid_days", "NUMBER"),
+        ("from_date", "TIMESTAMP(6)"),
+        ("to_date", "TIMESTAMP(6)"),
+        ("location", "VARCHAR2"),
+        ("ssid", "VARCHAR2"),
+        ("group_tag", "VARCHAR2"),
+        ("guest_person_visited", "VARCHAR2"),
+        ("guest_reason_for_visit", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("time_spent", "NUMBER"),
+        ("optional_data", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("nad_address", "VARCHAR2"),
+        ("server", "VARCHAR2"),
+        ("sponsor_user_details", "VARCHAR2"),
+        ("guest_user_details", "VARCHAR2"),
+        ("mac_address", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("sponsor_username", "VARCHAR2"),
+        ("guest_username", "VARCHAR2"),
+        ("operation", "VARCHAR2"),
+        ("aup_acceptance", "VARCHAR2"),
+        ("message", "VARCHAR2"),
+    ],
+    "profiled_endpoints_summary": [
+        ("id", "VARCHAR2"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("endpoint_id", "VARCHAR2"),
+        ("endpoint_profile", "VARCHAR2"),
+        ("source", "VARCHAR2"),
+        ("host", "VARCHAR2"),
+        ("endpoint_action_name", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("identity_group", "VARCHAR2"),
+    ],
+    "profiling_policies": [
+        ("profiling_policy_name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+    ],
+    "pxgrid_direct_data": [
+        ("edda_id", "VARCHAR2"),
+        ("connector_type", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6)"),
+        ("bulk_id", "VARCHAR2"),
+        ("version", "NUMBER"),
+        ("version_type", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("data", "VARCHAR2"),
+    ],
+    "radius_authentication_summary": [
+        ("timestamp", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("calling_station_id", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_type", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("access_service", "VARCHAR2"),
+        ("nas_port_id", "VARCHAR2"),
+        ("authorization_profiles", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("security_group", "VARCHAR2"),
+        ("total_response_time", "NUMBER"),
+        ("max_response_time", "NUMBER"),
+        ("passed_count", "NUMBER"),
+        ("failed_count", "NUMBER"),
+    ],
+    "radius_errors_view": [
+        ("timestamp", "TIMESTAMP(6)"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("id", "NUMBER"),
+        ("audit_session_id", "VARCHAR2"),
+        ("calling_station_id", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("user_type", "VARCHAR2"),
+        ("network_device_name", "VARCHAR2"),
+        ("nas_ip_address", "VARCHAR2"),
+        ("device_type", "VARCHAR2"),
+        ("location", "VARCHAR2"),
+        ("nas_ipv6_address", "VARCHAR2"),
+        ("nas_port_id", "VARCHAR2"),
+        ("nas_port_type", "VARCHAR2"),
+        ("authentication_method", "VARCHAR2"),
+        ("authentication_protocol", "VARCHAR2"),
+        ("authorization_policy", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("response", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("mdm_server_name", "VARCHAR2"),
+        ("access_service", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("service_type", "VARCHAR2"),
+        ("selected_authorization_profiles", "VARCHAR2"),
+        ("posture_status", "VARCHAR2"),
+        ("message_text", "VARCHAR2"),
+        ("execution_steps", "VARCHAR2"),
+        ("other_attributes", "VARCHAR2"),
+        ("other_attributes_string", "VARCHAR2"),
+        ("passed", "VARCHAR2"),
+        ("failed", "NUMBER"),
+        ("authentication_policy", "VARCHAR2"),
+        ("credential_check", "VARCHAR2"),
+        ("endpoint_profile", "VARCHAR2"),
+        ("framed_ip_address", "VARCHAR2"),
+        ("framed_ipv6_address", "VARCHAR2"),
+        ("security_group", "VARCHAR2"),
+        ("response_time", "NUMBER"),
+        ("failure_reason", "VARCHAR2"),
+    ],
+    "registered_endpoints": [
+        ("mac_address", "VARCHAR2"),
+        ("endpoint_policy", "VARCHAR2"),
+        ("endpoint_ip", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("portal_user", "VARCHAR2"),
+        ("registration_time", "TIMESTAMP(6)"),
+        ("device_registration_status", "VARCHAR2"),
+        ("static_assignment", "VARCHAR2"),
+    ],
+    "sponsor_login_and_audit": [
+        ("id", "NUMBER"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("sponser_user_name", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("mac_address", "VARCHAR2"),
+        ("portal_name", "VARCHAR2"),
+        ("result", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("operation", "VARCHAR2"),
+        ("guest_username", "VARCHAR2"),
+        ("guest_status", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+        ("optional_data", "VARCHAR2"),
+        ("psn_hostname", "VARCHAR2"),
+        ("user_details", "VARCHAR2"),
+        ("guest_details", "VARCHAR2"),
+        ("guest_users", "VARCHAR2"),
+    ],
+    "system_diagnostics_view": [
+        ("id", "NUMBER"),
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("message_severity", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("message_text", "VARCHAR2"),
+        ("category", "VARCHAR2"),
+        ("diagnostic_info", "VARCHAR2"),
+    ],
+    "system_summary": [
+        ("timestamp", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("cpu_utilization", "NUMBER"),
+        ("cpu_count", "NUMBER"),
+        ("memory_utilization", "NUMBER"),
+        ("diskspace_root", "NUMBER"),
+        ("diskspace_boot", "NUMBER"),
+        ("diskspace_opt", "NUMBER"),
+        ("diskspace_storedconfig", "NUMBER"),
+        ("diskspace_tmp", "NUMBER"),
+        ("diskspace_runtime", "NUMBER"),
+    ],
+    "tacacs_accounting": [
+        ("id", "NUMBER"),
+        ("generated_time", "TIMESTAMP(6)"),
+        ("logged_time", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("session_key", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_ip", "VARCHAR2"),
+        ("device_group", "VARCHAR2"),
+        ("remote_address", "VARCHAR2"),
+        ("port", "NUMBER"),
+        ("authentication_type", "VARCHAR2"),
+        ("authentication_method", "VARCHAR2"),
+        ("authentication_service", "VARCHAR2"),
+        ("privilege_level", "NUMBER"),
+        ("service", "VARCHAR2"),
+        ("status", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+    ],
+    "tacacs_authentication_summary": [
+        ("logged_time", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_group", "VARCHAR2"),
+        ("identity_group", "VARCHAR2"),
+        ("identity_store", "VARCHAR2"),
+        ("authentication_policy", "VARCHAR2"),
+        ("passed_count", "NUMBER"),
+        ("failed_count", "NUMBER"),
+        ("total_response_time", "NUMBER"),
+        ("max_response_time", "NUMBER"),
+    ],
+    "tacacs_authorizations": [
+        ("id", "NUMBER"),
+        ("generated_time", "TIMESTAMP(6)"),
+        ("logged_time", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("session_key", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_ip", "VARCHAR2"),
+        ("remote_address", "VARCHAR2"),
+        ("port", "NUMBER"),
+        ("authorization_policy", "VARCHAR2"),
+        ("shell_profile", "VARCHAR2"),
+        ("matched_command_set", "VARCHAR2"),
+        ("command_from_device", "VARCHAR2"),
+        ("status", "VARCHAR2"),
+        ("failure_reason", "VARCHAR2"),
+    ],
+    "tacacs_command_accounting": [
+        ("id", "NUMBER"),
+        ("generated_time", "TIMESTAMP(6)"),
+        ("logged_time", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("session_key", "VARCHAR2"),
+        ("username", "VARCHAR2"),
+        ("device_name", "VARCHAR2"),
+        ("device_ip", "VARCHAR2"),
+        ("remote_address", "VARCHAR2"),
+        ("port", "NUMBER"),
+        ("command", "VARCHAR2"),
+        ("command_args", "VARCHAR2"),
+        ("privilege_level", "NUMBER"),
+        ("status", "VARCHAR2"),
+    ],
+    "user_identity_groups": [
+        ("id", "VARCHAR2"),
+        ("name", "VARCHAR2"),
+        ("description", "VARCHAR2"),
+        ("created_by", "VARCHAR2"),
+        ("create_time", "TIMESTAMP(6)"),
+        ("update_time", "TIMESTAMP(6)"),
+        ("status", "VARCHAR2"),
+    ],
+    "user_password_changes": [
+        ("timestamp_timezone", "TIMESTAMP(6) WITH TIME ZONE"),
+        ("timestamp", "TIMESTAMP(6)"),
+        ("ise_node", "VARCHAR2"),
+        ("message_code", "NUMBER"),
+        ("admin_name", "VARCHAR2"),
+        ("admin_ip_address", "VARCHAR2"),
+        ("admin_ipv6_address", "VARCHAR2"),
+        ("admin_interface", "VARCHAR2"),
+        ("message_class", "VARCHAR2"),
+        ("message_text", "VARCHAR2"),
+        ("operator_name", "VARCHAR2"),
+        ("user_admin_flag", "VARCHAR2"),
+        ("account_name", "VARCHAR2"),
+        ("device_ip", "VARCHAR2"),
+        ("identity_store_name", "VARCHAR2"),
+        ("change_password_method", "VARCHAR2"),
+        ("audit_password_type", "VARCHAR2"),
+    ],
+    "vulnerability_assessment_failures": [
+        ("logged_at", "TIMESTAMP(6)"),
+        ("id", "VARCHAR2"),
+        ("adapter_instance_name", "VARCHAR2"),
+        ("adapter_instance_id", "VARCHAR2"),
+        ("vendor_name", "VARCHAR2"),
+        ("ise_node", "VARCHAR2"),
+        ("mac_address", "VARCHAR2"),
+        ("ip_address", "VARCHAR2"),
+        ("operation_messsage_text", "VARCHAR2"),
+        ("message_type", "VARCHAR2"),
+    ],
+}
+
+# Views of the recent rows of a Data Connect view : (view, timestamp column, days)
+RECENT_VIEWS = {
+    "radius_accounting_week": ("radius_accounting", "timestamp", 7),
+    "radius_authentications_week": ("radius_authentications", "timestamp", 7),
+    "tacacs_accounting_last_two_days": ("tacacs_accounting", "logged_time", 2),
+}
+
+# Oracle data type : all_tab_columns data_length
+DATA_LENGTHS = {"DATE": 7, "NUMBER": 22, "TIMESTAMP(6)": 11, "TIMESTAMP(6) WITH TIME ZONE": 13, "VARCHAR2": 4000}
+
+# Oracle datetime format elements : strftime directives
+DATE_FORMATS = {"YYYY": "%Y", "MON": "%b", "MM": "%m", "DD": "%d", "HH24": "%H", "HH": "%I", "MI": "%M", "SS": "%S"}
+RE_DATE_FORMAT = re.compile(f"(?:{'|'.join(DATE_FORMATS)}|[-/:. ])+")
+
+# Store timestamps as ISO 8601 text, like Python's deprecated default adapters, and convert TIMESTAMP columns to datetimes
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+# Small configuration views : number of rows
+CONFIG_ROWS = {
+    "adapter_status": 3,
+    "admin_users": 5,
+    "authorization_profiles": 20,
+    "endpoint_identity_groups": 20,
+    "failure_code_cause": 50,
+    "logical_profiles": 10,
+    "network_device_groups": 15,
+    "network_devices": 200,
+    "node_list": 4,
+    "policy_sets": 6,
+    "profiling_policies": 50,
+    "security_group_acls": 10,
+    "security_groups": 20,
+    "user_identity_groups": 10,
+}
+
+
+def _sqlite_type(oracle_type: str = None) -> str:
+    """Returns the SQLite column type for an Oracle data type. TIMESTAMP columns are converted to datetimes when fetched."""
+    if oracle_type.startswith("TIMESTAMP") or oracle_type == "DATE":
+        return "TIMESTAMP"
+    return "NUMERIC" if oracle_type == "NUMBER" else "TEXT"
+
+
+def _strftime(format: str = None) -> str:
+    """Returns the strftime format for an Oracle datetime format like `YYYY-MM-DD HH24:MI:SS`."""
+    return re.sub("|".join(DATE_FORMATS), lambda m: DATE_FORMATS[m.group(0)], format)
+
+
+def _to_char(value=None, format: str = None) -> str:
+    """
+    The Oracle `TO_CHAR(value[, format])` function for SQLite with datetime and number (`FM`, `9`, `0`, `D`, `G`) formats.
+    """
+    if value is None or format is None:
+        return None if value is None else str(value)
+    if isinstance(value, str):  # timestamps are ISO 8601 text
+        return datetime.datetime.fromisoformat(value).strftime(_strftime(format.upper()))
+    number = format.upper()
+    fill = not number.startswith("FM")
+    number = number.removeprefix("FM")
+    decimals = len(re.split(r"[D.]", number)[1]) if re.search(r"[D.]", number) else 0
+    text = f"{value:{',' if re.search('[G,]', number) else ''}.{decimals}f}"
+    return text.rjust(len(number) + 1) if fill else text  # Oracle reserves a leading space for the sign
+
+
+def _regexp_like(value: str = None, pattern: str = None, match: str = "") -> bool:
+    """The Oracle `REGEXP_LIKE(value, pattern[, 'i'])` condition for SQLite."""
+    return value is not None and re.search(pattern, value, flags=re.IGNORECASE if "i" in match else 0) is not None
+
+
+class _Median:
+    """The Oracle `MEDIAN(column)` aggregate function for SQLite."""
+
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+class FakeCursor(sqlite3.Cursor):
+    """A SQLite cursor that rewrites Oracle SQL and accepts the oracledb cursor tuning attributes."""
+
+    prefetchrows = 2  # ignored
+    EXPLAIN_PLAN = re.compile(r"^\s*EXPLAIN\s+PLAN\s+SET\s+STATEMENT_ID\s*=\s*'([^']*)'\s+FOR\s+(.*)$", re.IGNORECASE | re.DOTALL)
+
+    def execute(self, q: str = None, parameters=(), **kwargs):
+        explain = self.EXPLAIN_PLAN.match(q)
+        if explain:  # a plan of the actual rows with a cost of 1 per 100 rows
+            if parameters:
+                raise sqlite3.ProgrammingError("ORA-01006: bind variable does not exist")  # like Oracle, EXPLAIN PLAN has no bind values
+            q = FakeDataConnect.rewrite(explain.group(2))
+            table = re.search(r"\bFROM\s+(\w+)", explain.group(2), flags=re.IGNORECASE)
+            if table and re.search(r"(?<!:):\w+", re.sub(r"'[^']*'", "''", q)):  # bind variables without values: a full scan estimate
+                q = f"SELECT * FROM {table.group(1)}"
+            rows = super().execute(f"SELECT COUNT(*) FROM (\n{q}\n)").fetchone()[0]
+            plan = [
+                (explain.group(1), 0, 0, "SELECT STATEMENT", None, None, rows, rows // 100 + 1, rows * 100),
+                (explain.group(1), 1, 1, "TABLE ACCESS", "FULL", table.group(1).upper() if table else None, rows, rows // 100 + 1, rows * 100),
+            ]
+            return super().executemany("INSERT INTO plan_table VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", plan)
+        return super().execute(FakeDataConnect.rewrite(q), parameters or ())  # oracledb keyword arguments (fetch_lobs, ...) are ignored
+
+
+class FakeConnection(sqlite3.Connection):
+    """A SQLite connection with the oracledb `version` attribute and FakeCursor cursors."""
+
+    version = "19.0.0.0.0 (fake)"
+
+    def cursor(self, factory=FakeCursor):
+        return super().cursor(factory)
+
+
+class FakeDataConnect:
+
+    # Class attributes
+    PASSWORD = "FakeDataC0nnect"  # placeholder ISEDC password; the fake database has no authentication
+    ROWS_DEFAULT = 10000  # RADIUS authentications
+    DAYS_DEFAULT = 7  # spread the generated events over the last N days
+    BATCH_SIZE = 10000  # rows per INSERT batch
+    COLUMN = r"\w+(?:\(\s*\w+\s*\))?"  # a column or a function of a column like `MAX(timestamp)`
+    REWRITES = [  # (Oracle regex, SQLite replacement)
+        (re.compile(r"FETCH\s+FIRST\s+(\d+)\s+ROWS?\s+ONLY", re.IGNORECASE), r"LIMIT \1"),
+        (
+            re.compile(r"SYSDATE\s*-\s*NUMTODSINTERVAL\(\s*([^,]+?)\s*,\s*'(DAY|HOUR|MINUTE|SECOND)'\s*\)", re.IGNORECASE),
+            lambda m: f"datetime('now', 'localtime', '-' || ({m.group(1)}) || ' {m.group(2).lower()}s')",
+        ),
+        (re.compile(r"SYSDATE\s*-\s*(\d+)\b", re.IGNORECASE), r"datetime('now', 'localtime', '-\1 days')"),
+        (  # datetime formats use strftime and other formats use the TO_CHAR() function
+            re.compile(rf"TO_CHAR\(\s*({COLUMN})\s*,\s*'({RE_DATE_FORMAT.pattern})'\s*\)"),
+            lambda m: f"strftime('{_strftime(m.group(2))}', {m.group(1)})",
+        ),
+        (  # days between dates
+            re.compile(rf"CAST\(\s*({COLUMN})\s+AS\s+DATE\s*\)\s*-\s*CAST\(\s*({COLUMN})\s+AS\s+DATE\s*\)", re.IGNORECASE),
+            r"(julianday(\1) - julianday(\2))",
+        ),
+        (re.compile(rf"CAST\(\s*({COLUMN})\s+AS\s+(TIMESTAMP|DATE)\s*\)", re.IGNORECASE), r"\1"),
+        (re.compile(r"TRUNC\(\s*(\w+)\s*,\s*'MI'\s*\)", re.IGNORECASE), r"strftime('%Y-%m-%d %H:%M:00', \1)"),
+        (re.compile(r"TRUNC\(\s*(\w+)\s*,\s*'HH24'\s*\)", re.IGNORECASE), r"strftime('%Y-%m-%d %H:00:00', \1)"),
+        (re.compile(r"TRUNC\(\s*(\w+)\s*(?:,\s*'DD'\s*)?\)", re.IGNORECASE), r"strftime('%Y-%m-%d 00:00:00', \1)"),
+        (re.compile(r"\bNVL\(", re.IGNORECASE), "IFNULL("),
+        (re.compile(r"\bAPPROX_COUNT_DISTINCT\(", re.IGNORECASE), "COUNT(DISTINCT "),
+        (re.compile(r"\bSYS(?:DATE|TIMESTAMP)\b", re.IGNORECASE), "datetime('now', 'localtime')"),
+    ]
+
+    def __init__(self, filepath: str = None) -> None:
+        """
+        Creates a FakeDataConnect backend with a SQLite database file, creating the views if necessary.
+
+        - filepath (str): the SQLite database filepath
+        """
+        assert isinstance(filepath, str) and filepath != "", "filepath is empty"
+        assert filepath != ":memory:", "a database file is required to share it between connections"
+        self.filepath = filepath
+        connection = self.connect()
+        try:
+            self.create(connection)
+        finally:
+            connection.close()
+
+    def connect(self) -> FakeConnection:
+        """
+        Returns a new connection to the fake database. Connections may be used from other threads like pooled sessions.
+        """
+        connection = sqlite3.connect(self.filepath, factory=FakeConnection, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        connection.create_function("TO_CHAR", -1, _to_char, deterministic=True)
+        connection.create_function("REGEXP_LIKE", -1, _regexp_like, deterministic=True)
+        connection.create_aggregate("MEDIAN", 1, _Median)
+        return connection
+
+    @classmethod
+    def rewrite(cls, q: str = None) -> str:
+        """
+        Returns the Oracle SQL query rewritten for SQLite.
+        """
+        for regex, replacement in cls.REWRITES:
+            q = regex.sub(replacement, q)
+        return q
+
+    @classmethod
+    def create(cls, connection: sqlite3.Connection = None) -> None:
+        """
+        Create the views, the `all_tab_columns` and `user_views` dictionary tables and `plan_table`, if they do not exist.
+        """
+        for view, columns in VIEWS.items():
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {view} ({', '.join(f'{c} {_sqlite_type(t)}' for c, t in columns)})")
+        for view, (table, column, days) in RECENT_VIEWS.items():
+            connection.execute(f"CREATE VIEW IF NOT EXISTS {view} AS SELECT * FROM {table} WHERE {column} > datetime('now', 'localtime', '-{days} days')")
+        views = {**VIEWS, **{view: VIEWS[table] for view, (table, column, days) in RECENT_VIEWS.items()}}
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS all_tab_columns (table_name TEXT, column_name TEXT, data_type TEXT, data_length NUMERIC, char_length NUMERIC, "
+            "nullable TEXT, column_id NUMERIC)"
+        )
+        connection.execute("CREATE TABLE IF NOT EXISTS user_views (view_name TEXT)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS plan_table (statement_id TEXT, id NUMERIC, depth NUMERIC, operation TEXT, options TEXT, "
+            "object_name TEXT, cardinality NUMERIC, cost NUMERIC, bytes NUMERIC)"
+        )
+        if connection.execute("SELECT COUNT(*) FROM user_views").fetchone()[0] == 0:
+            connection.executemany("INSERT INTO user_views VALUES (?)", [(view.upper(),) for view in views])
+            connection.executemany(
+                "INSERT INTO all_tab_columns VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (view.upper(), c.upper(), t, DATA_LENGTHS[t], DATA_LENGTHS[t] if t == "VARCHAR2" else 0, "Y", n)
+                    for view, columns in views.items()
+                    for n, (c, t) in enumerate(columns, start=1)
+                ],
+            )
+        connection.commit()
+
+    def generate(self, rows: int = ROWS_DEFAULT, days: int = DAYS_DEFAULT, seed: int = 0) -> dict:
+        """
+        Replace the view contents with synthetic data and return a dict of { view : rows }.
+        RADIUS accounting has the same number of rows as the authentications, there is one endpoint for every 10 authentications
+        and one row in each of the other event views for every 100 authentications.
+
+        - rows (int): the number of RADIUS authentications
+        - days (int): spread the events over the last N days
+        - seed (int): the random seed for repeatable data
+        """
+        assert isinstance(rows, int) and rows >= 0, "rows is not an int >= 0"
+        counts = {view: max(1, rows // 100) for view in VIEWS}
+        counts.update({**CONFIG_ROWS, "radius_authentications": rows, "radius_accounting": rows, "endpoints_data": max(1, rows // 10)})
+        rng = random.Random(seed)
+        end = datetime.datetime.now().replace(microsecond=0)
+        start = end - datetime.timedelta(days=days)
+
+        connection = self.connect()
+        try:
+            connection.execute("PRAGMA journal_mode = OFF")  # bulk load speed
+            connection.execute("PRAGMA synchronous = OFF")
+            for view, count in counts.items():
+                columns = [column for column, type in VIEWS[view]]
+                connection.execute(f"DELETE FROM {view}")
+                values = (self.row(view, n, rng, start, end) for n in range(1, count + 1))
+                sql = f"INSERT INTO {view} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+                while True:
+                    batch = [[row.get(column) for column in columns] for row in itertools.islice(values, self.BATCH_SIZE)]
+                    if not batch:
+                        break
+                    connection.executemany(sql, batch)
+            connection.commit()
+        finally:
+            connection.close()
+        return counts
+
+    @classmethod
+    def row(cls, view: str = None, n: int = 0, rng: random.Random = None, start: datetime.datetime = None, end: datetime.datetime = None) -> dict:
+        """
+        Returns a dict of synthetic { column : value } for row number `n` of the view.
+        """
+        timestamp = start + datetime.timedelta(seconds=rng.random() * (end - start).total_seconds())
+        mac = ":".join(f"{rng.randint(0, 255):02X}" for _ in range(6))
+        username = f"user{rng.randint(1, 500):03d}"
+        device = f"switch{rng.randint(1, CONFIG_ROWS['network_devices']):03d}"
+        node = f"ise-psn-{rng.randint(1, 2)}"
+        ip = f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        if view == "radius_authentications":
+            passed = rng.random() < 0.9
+            return {
+                "id": n,
+                "timestamp": timestamp,
+                "timestamp_timezone": timestamp,
+                "passed": "Pass" if passed else "Fail",
+                "failed": 0 if passed else 1,  # a numeric flag
+                "calling_station_id": mac,
+                "username": username if rng.random() < 0.7 else mac,  # users and MAB endpoints
+                "user_type": "User",
+                "device_name": device,
+                "device_type": "All Device Types#Switch",
+                "location": f"All Locations#Building{rng.randint(1, 5)}",
+                "nas_ip_address": f"192.168.1.{rng.randint(1, 254)}",
+                "nas_port_id": f"GigabitEthernet1/0/{rng.randint(1, 48)}",
+                "nas_port_type": rng.choice(["Ethernet", "Wireless - IEEE 802.11"]),
+                "ise_node": node,
+                "policy_set_name": rng.choice(["Default", "Wired", "Wireless"]),
+                "identity_store": rng.choice(["Internal Users", "Internal Endpoints", "AD"]),
+                "identity_group": "Endpoint Identity Groups:Unknown",
+                "access_service": "Default Network Access",
+                "audit_session_id": f"{rng.getrandbits(96):024X}",
+                "authentication_method": rng.choice(["dot1x", "mab"]),
+                "authentication_protocol": rng.choice(["PEAP (EAP-MSCHAPv2)", "EAP-TLS", "Lookup"]),
+                "authorization_rule": rng.choice(["Employees", "Guests", "IoT"]) if passed else None,
+                "authorization_profiles": rng.choice(["PermitAccess", "Guest_Access"]) if passed else None,
+                "endpoint_profile": rng.choice(["Windows10-Workstation", "Apple-Device", "Cisco-IP-Phone", "Unknown"]),
+                "failure_reason": None if passed else rng.choice(["22056 Subject not found", "24408 User authentication against AD failed"]),
+                "framed_ip_address": ip,
+                "security_group": rng.choice(["Employees", "Guests", None]),
+                "service_type": "Framed",
+                "syslog_message_code": 5200 if passed else 5400,
+                "response_time": rng.randint(1, 500),
+                "posture_status": "NotApplicable",
+            }
+        if view == "radius_accounting":
+            status = rng.choice(["Start", "Interim-Update", "Stop"])
+            return {
+                "id": n,
+                "timestamp": timestamp,
+                "timestamp_timezone": timestamp,
+                "acct_session_id": f"{rng.getrandbits(32):08X}",
+                "acct_status_type": status,
+                "syslog_message_code": {"Start": 3000, "Stop": 3001, "Interim-Update": 3002}[status],
+                "acct_session_time": 0 if status == "Start" else rng.randint(1, 86400),
+                "acct_input_octets": rng.randint(0, 10**9),
+                "acct_output_octets": rng.randint(0, 10**9),
+                "acct_input_packets": rng.randint(0, 10**6),
+                "acct_output_packets": rng.randint(0, 10**6),
+                "acct_terminate_cause": "User Request" if status == "Stop" else None,
+                "calling_station_id": mac,
+                "username": username,
+                "device_name": device,
+                "framed_ip_address": ip,
+                "ise_node": node,
+                "nas_ip_address": f"192.168.1.{rng.randint(1, 254)}",
+                "audit_session_id": f"{rng.getrandbits(96):024X}",
+                "session_id": f"{rng.getrandbits(96):024x}:{node}/{rng.getrandbits(30)}/{n}",
+                "service_type": "Framed",
+                "access_service": "Default Network Access",
+                "nas_port": rng.randint(1, 48),
+                "response_time": rng.randint(1, 100),
+            }
+        if view == "endpoints_data":
+            return {
+                "id": f"{rng.getrandbits(128):032x}",
+                "mac_address": mac,
+                "create_time": start,
+                "update_time": timestamp,
+                "endpoint_ip": ip,
+                "endpoint_policy": rng.choice(["Windows10-Workstation", "Apple-Device", "Cisco-IP-Phone", "Unknown"]),
+                "matched_value": rng.choice([0, 10, 20, 30, 40, 50]),
+                "static_assignment": "false",
+                "static_group_assignment": "false",
+                "hostname": f"host{n}",
+                "endpoint_id": f"epid:{rng.getrandbits(60)}",
+                "endpoint_policy_version": 0,
+                "profile_server": node,
+                "reg_timestamp": 0,
+                "version": rng.randint(1, 10),
+            }
+        if view == "change_configuration_audit":
+            return {
+                "id": n,
+                "timestamp": timestamp,
+                "timestamp_timezone": timestamp,
+                "admin_name": rng.choice(["admin", "operator", "ers-admin"]),
+                "event": "Added configuration",
+                "interface": rng.choice(["GUI", "CLI", "ERS"]),
+                "ise_node": "ise-pan-1",
+                "message_class": "Configuration-Changes",
+                "message_code": 52001,
+                "requested_operation": rng.choice(["Added", "Changed", "Deleted"]),
+                "object_name": f"object{n}",
+                "object_type": rng.choice(["NetworkDevice", "InternalUser", "AuthorizationProfile", "Endpoint"]),
+            }
+        name = {
+            "network_devices": f"switch{n:03d}",
+            "node_list": f"ise-{['pan', 'mnt', 'psn', 'psn'][(n - 1) % 4]}-{n}",
+            "policy_sets": ["Default", "Wired", "Wireless", "Guest", "IoT", "VPN"][(n - 1) % 6],
+        }.get(view, f"{view[:-1]}{n}")
+        values = {
+            "id": n if ("id", "NUMBER") in VIEWS[view] else f"{rng.getrandbits(128):032x}",
+            "timestamp": timestamp,
+            "timestamp_timezone": timestamp,
+            "logged_at": timestamp,
+            "logged_time": timestamp,
+            "generated_time": timestamp,
+            "username": username,
+            "calling_station_id": mac,
+            "mac_address": mac,
+            "endpoint_mac_address": mac,
+            "ise_node": node,
+            "ip_address": ip,
+            "device_name": device,
+            "network_device_name": device,
+            "posture_status": rng.choice(["Compliant", "NonCompliant", "Pending"]),
+            "passed": "Fail",  # the other views with `passed` are RADIUS errors and misconfigured supplicants
+            "failed": 1,
+            "name": name,
+            "hostname": name,
+            "policyset_name": name,
+            "policyset_status": "ENABLED",
+            "description": f"Fake {view} {n}",
+            "ip_mask": f"192.168.1.{n % 254 + 1}/32",
+            "profile_name": "Cisco",
+            "location": "All Locations",
+            "type": "All Device Types",
+            "node_type": "ISE",
+            "node_role": "STANDALONE",
+            "active_status": "ACTIVE",
+            "sgt_dec": n,
+            "sgt_hex": f"{n:04X}",
+            "patch_version": 0,
+            "create_time": start,
+            "update_time": start,
+        }
+        for column, type in VIEWS[view]:  # any other columns by data type
+            if column not in values:
+                values[column] = timestamp if _sqlite_type(type) == "TIMESTAMP" else rng.randint(0, 100) if type == "NUMBER" else f"{column}{rng.randint(1, 10)}"
+        return values
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("filepath", help="SQLite database filepath")
+    argp.add_argument("-r", "--rows", action="store", default=FakeDataConnect.ROWS_DEFAULT, help="RADIUS authentications to generate", type=int)
+    argp.add_argument("-d", "--days", action="store", default=FakeDataConnect.DAYS_DEFAULT, help="spread events over the last N days", type=int)
+    argp.add_argument("-s", "--seed", action="store", default=0, help="random seed", type=int)
+    argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script execution time")
+    args = argp.parse_args()
+    start_time = time.time()
+
+    counts = FakeDataConnect(args.filepath).generate(args.rows, args.days, args.seed)
+    print(f"✔ {sum(counts.values())} rows in {len(counts)} views saved to {args.filepath}", file=sys.stderr)
+    if args.timer:
+        print(f"⏱ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
@@ -7,6 +7,7 @@ Supported environment variables:
   export ISE_DC_PASSWORD='DataC0nnect'  # Data Connect password
   export ISE_DC_PORT=2484               # Data Connect port
   export ISE_VERIFY=False               # Optional: Disable TLS certificate verification (allow self-signed certs)
+  export ISE_SMNT='1.2.3.5'             # Optional: Secondary MNT to share the report sections with
 
 """
 __author__ = "Thomas Howard"
@@ -14,7 +15,9 @@ __email__ = "thomas@cisco.com"
 __license__ = "MIT - https://mit-license.org/"
 
 from isedc import ISEDC
+from isedc_rollup import RollupStore, ROLLUPS_FILEPATH_DEFAULT
 import argparse  # https://docs.python.org/3/library/argparse.html
+import concurrent.futures
 import oracledb  # https://python-oracledb.readthedocs.io/en/latest/
 import logging
 import os
@@ -28,11 +31,6 @@ import yaml
 import traceback
 import tracemalloc
 import pandas as pd
-from string import Template
-import warnings
-
-# Ignore 'UserWarning: pandas only supports SQLAlchemy connectable (engine/connection) or database string URI or sqlite3 DBAPI2 connection.'
-warnings.simplefilter(action="ignore", category=UserWarning)
 
 
 def read_file(filepath: str = None) -> str:
@@ -81,8 +79,8 @@ SELECT
     -- message_text AS text -- ?
     -- response, -- ⚠ contains the JSON response and may be very large!
 FROM openapi_operations
-WHERE administrator = '$username'
-    AND logged_at > sysdate - INTERVAL '$days' DAY -- last N days
+WHERE administrator = :username
+    AND logged_at > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 -- GROUP BY administrator, logged_at, client_ip, http_method, request_name
 ORDER BY administrator ASC -- first/oldest records
 """
@@ -112,14 +110,143 @@ SELECT
     object_name            , -- Name of object for which config is changed
     object_type            -- Type of object for which config is changed
 FROM change_configuration_audit
-WHERE admin_name = '$username'
-    AND timestamp > sysdate - INTERVAL '$days' DAY -- last N days
+WHERE admin_name = :username
+    AND timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY') -- last N days
 -- WHERE timestamp > sysdate - INTERVAL '10' SECOND -- last N seconds
 -- WHERE timestamp > sysdate - INTERVAL '1' MINUTE  -- last N minutes
 -- WHERE timestamp > sysdate - INTERVAL '1' HOUR -- last N hours
 ORDER BY timestamp ASC -- first/oldest records
 """
 
+# The daily report sections in their output order. Each section is one query:
+#   title (str): the section heading
+#   sql (str): a `data/SQL` filepath or SQL query
+#   parameters (dict): optional bind variable values
+#   drop (list): optional columns to remove from the table
+#   rollup (bool): query the local hourly rollups (SQLite, see `isedc_rollup.py`) instead of the MNT
+REPORT = [
+    {"title": "Configuration Audit Object Types", "sql": "SELECT DISTINCT object_type FROM change_configuration_audit ORDER BY object_type ASC"},
+    {"title": "Configuration Audit", "sql": "data/SQL/change_configuration_audit.sql"},
+    {"title": "RADIUS Authentications", "sql": "data/SQL/radius_auths.sql"},
+    {"title": "RADIUS Accounting", "sql": "data/SQL/radius_acct.sql"},
+    {"title": "Network Device Groups (NDGs)", "sql": "SELECT * FROM network_device_groups ORDER BY name ASC"},
+    {"title": "Network Devices", "sql": "SELECT * FROM network_devices ORDER BY name ASC"},
+    {"title": "Endpoint Identity Groups", "sql": "SELECT * FROM endpoint_identity_groups ORDER BY name ASC"},
+    {"title": "Endpoints", "sql": "data/SQL/endpoints_data.sql"},
+    {
+        "title": "ISE Nodes",
+        "sql": "SELECT * FROM node_list ORDER BY hostname ASC",
+        "drop": ["API_NODE", "CREATE_TIME", "UPDATE_TIME", "INSTALLATION_TYPE", "PDP_SERVICES", "PIC_NODE", "UDI_VID", "XGRID_PEER", "XGRID_ENABLED"],
+    },
+    {"title": "Policy Sets", "sql": "SELECT id, policyset_status, policyset_name, description FROM policy_sets ORDER BY policyset_name ASC"},
+    {"title": "Authorization Profiles", "sql": "data/SQL/authorization_profiles.sql"},
+    {"title": "SGTs", "sql": "data/SQL/security_groups.sql"},
+    {"title": "SGACLs", "sql": "data/SQL/security_group_acls.sql"},
+    {
+        "title": "RADIUS Authentications per Day",
+        "rollup": True,
+        "sql": """SELECT substr(hour, 1, 10) AS day, SUM(passed) AS passed, SUM(failed) AS failed, SUM(total) AS total,
+                  ROUND(SUM(response_time_sum) * 1.0 / SUM(total)) AS response_time_avg
+                  FROM radius_auths_hourly WHERE hour >= datetime('now', 'localtime', '-' || :days || ' days') GROUP BY day ORDER BY day ASC""",
+        "parameters": {"days": 30},
+    },
+    {
+        "title": "RADIUS Authentications by Policy Set",
+        "rollup": True,
+        "sql": """SELECT policy_set_name, SUM(passed) AS passed, SUM(failed) AS failed, SUM(total) AS total
+                  FROM radius_auths_hourly WHERE hour >= datetime('now', 'localtime', '-' || :days || ' days')
+                  GROUP BY policy_set_name ORDER BY total DESC""",
+        "parameters": {"days": 30},
+    },
+    {
+        "title": "RADIUS Authentications by Network Device",
+        "rollup": True,
+        "sql": """SELECT device_name, SUM(passed) AS passed, SUM(failed) AS failed, SUM(total) AS total
+                  FROM radius_auths_hourly WHERE hour >= datetime('now', 'localtime', '-' || :days || ' days')
+                  GROUP BY device_name ORDER BY total DESC LIMIT 20""",
+        "parameters": {"days": 30},
+    },
+    {
+        "title": "RADIUS Failure Reasons",
+        "rollup": True,
+        "sql": """SELECT failure_reason, SUM(failed) AS failed
+                  FROM radius_auths_hourly WHERE failed > 0 AND hour >= datetime('now', 'localtime', '-' || :days || ' days')
+                  GROUP BY failure_reason ORDER BY failed DESC""",
+        "parameters": {"days": 30},
+    },
+    {
+        "title": "RADIUS Accounting per Day",
+        "rollup": True,
+        "sql": """SELECT substr(hour, 1, 10) AS day, SUM(records) AS records, SUM(input_octets) AS input_octets, SUM(output_octets) AS output_octets
+                  FROM radius_acct_hourly WHERE hour >= datetime('now', 'localtime', '-' || :days || ' days') GROUP BY day ORDER BY day ASC""",
+        "parameters": {"days": 30},
+    },
+]
+WORKERS_DEFAULT = 6  # concurrent sections and pooled sessions
+
+
+def read_sql_query(isedc: ISEDC = None, q: str = None, parameters: dict = None, ttl: int = None, refresh: bool = False) -> pd.DataFrame:
+    """
+    Returns a DataFrame of the query results with bind variable `parameters`, from the result cache when `isedc` has one.
+    """
+    if isedc.cache is None:
+        return isedc.to_dataframe(q, parameters)  # columnar Arrow fetch without per-row Python objects
+    headers, table = [], []
+    for headers, rows in isedc.cached(q, parameters, ttl=ttl or ISEDC.CACHE_TTL_DEFAULT, refresh=refresh):
+        table.extend(rows)
+    return pd.DataFrame(table, columns=[header.upper() for header in headers])  # pandas uses the Oracle column names
+
+
+def report_section(isedc: ISEDC = None, section: dict = None, ttl: int = None, refresh: bool = False, store: RollupStore = None) -> str:
+    """
+    Returns the markdown of a report section. A failed query is reported in its section instead of stopping the report.
+    """
+    try:
+        if section.get("rollup"):
+            connection = store.connect()
+            try:
+                df = pd.read_sql_query(section["sql"], connection, params=section.get("parameters"))
+            finally:
+                connection.close()
+        else:
+            df = read_sql_query(isedc, section["sql"], section.get("parameters"), ttl, refresh)
+        df = df.drop(columns=section.get("drop", []), errors="ignore")
+        return f"## {section['title']}\n\n{df.to_markdown(index=False, tablefmt='github')}\n\n"
+    except Exception as e:
+        isedc.log.error(f"{section['title']}: {e}")
+        return f"## {section['title']}\n\n✖ {e}\n\n"
+
+
+def run_report(
+    isedc: ISEDC = None,
+    sections: list = REPORT,
+    fh=sys.stdout,
+    workers: int = WORKERS_DEFAULT,
+    ttl: int = None,
+    refresh: bool = False,
+    store: RollupStore = None,
+) -> None:
+    """
+    Run the report sections concurrently over the ISEDC session pool and write each section's markdown to the file as soon
+    as it and all of the sections before it are complete, so the output is in the declared order.
+    The report takes about as long as its slowest section instead of the sum of all sections.
+
+    - isedc (ISEDC): an ISEDC with `pool_max` >= `workers`
+    - sections (list): the report sections. Default: REPORT
+    - fh (file): the output file. Default: sys.stdout
+    - workers (int): the number of sections to run at once
+    - ttl (int): the maximum age of cached results, with an ISEDC cache
+    - refresh (bool): replace any cached results
+    - store (RollupStore): the local rollups for `rollup` sections. Without it, `rollup` sections are skipped.
+    """
+    sections = [section for section in sections if store or not section.get("rollup")]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(report_section, isedc, section, ttl, refresh, store) for section in sections]
+        for future in futures:  # declared order
+            fh.write(future.result())
+            fh.flush()
+
+
 if __name__ == "__main__":
 
     # Set up the command-line argument argp
@@ -127,132 +254,74 @@ if __name__ == "__main__":
     argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
     argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
     argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script time")
+    argp.add_argument("-o", "--output", action="store", default="-", help="markdown output filepath. Default: stdout", type=str)
+    argp.add_argument("-w", "--workers", action="store", default=WORKERS_DEFAULT, help=f"concurrent sections; Default: {WORKERS_DEFAULT}", type=int)
+    argp.add_argument("--cache", action="store", nargs="?", const=ISEDC.CACHE_TTL_DEFAULT, default=None, help="use cached results up to TTL seconds old", type=int)
+    argp.add_argument("--refresh", action="store_true", default=False, help="replace any cached results")
+    argp.add_argument("--fake", action="store", default=None, help="query a fake Data Connect SQLite database (isedc_fake.py)", type=str)
+    argp.add_argument("--rollups", action="store", default=ROLLUPS_FILEPATH_DEFAULT, help="local rollups database for trend sections", type=str)
+    argp.add_argument("--no-rollups", action="store_true", default=False, help="skip refreshing the rollups and the trend sections")
     args = argp.parse_args()
+    if args.timer:
+        start_time = time.time()
 
     logging.basicConfig(stream=sys.stderr, format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
     log = logging.getLogger("ISEDC")
     log.setLevel(args.level)
 
+    cache = None
+    if args.cache is not None or args.refresh:
+        from isedc_cache import QueryCache  # lazy load optional pyarrow dependency
+
+        cache = QueryCache(level=args.level)
+
+    backend = None
+    if args.fake:
+        from isedc_fake import FakeDataConnect  # lazy load
+
+        backend = FakeDataConnect(args.fake)
+
     with ISEDC(
-        hostname=os.environ.get("ISE_PMNT"),
-        password=os.environ.get("ISE_DC_PASSWORD"),
+        hostname=os.environ.get("ISE_PMNT", "fake_dc" if backend else None),
+        hostnames=[h.strip() for h in os.environ.get("ISE_SMNT", "").split(",") if h.strip()],  # share the sections between MNTs
+        password=os.environ.get("ISE_DC_PASSWORD", FakeDataConnect.PASSWORD if backend else None),
         insecure=True,
         level=args.level,
+        pool_max=args.workers,
+        cache=cache,
+        backend=backend,
     ) as isedc:
 
-        isedc_con = isedc.connect()
+        store = None
+        if not args.no_rollups:
+            store = RollupStore(args.rollups, level=args.level)
+            store.refresh(isedc)  # only the new hours since the last report
+
+        fh = sys.stdout if args.output == "-" else open(args.output, mode="w", encoding="utf-8")
+        try:
+            run_report(isedc, REPORT, fh, args.workers, args.cache, args.refresh, store)
+        finally:
+            if fh is not sys.stdout:
+                fh.close()
 
         # print(f"## Administrators", end="\n\n")
-        # df_admins = pd.read_sql_query("SELECT DISTINCT admin_name FROM administrator_logins", isedc_con)
+        # df_admins = read_sql_query(isedc, "SELECT DISTINCT admin_name FROM administrator_logins")
         # print(f"Admins: {df_admins['ADMIN_NAME'].to_list()}\n\n")
-        # # print(f"{df_admins.to_markdown(index=False, tablefmt='github')}\n")
-        # # print(f"{df_admins['ADMIN_NAME'].to_list()}\n\n{df_admins.to_markdown(index=False, tablefmt='github')}\n")
 
         # print(f"### API Operations by Username", end="\n\n")
         # for username in df_admins["ADMIN_NAME"].to_list():
-        #     query = Template(SQL_OPENAPI_OPS_BY_USERNAME).substitute(username=username, days=7)
-        #     # print(f"query:\n{query}")
-        #     df = pd.read_sql_query(query, isedc_con)
-        #     # print(f"## {username}\n\n{df.to_markdown(index=False, tablefmt='github')}\n")
+        #     df = read_sql_query(isedc, SQL_OPENAPI_OPS_BY_USERNAME, {"username": username, "days": 7})
         #     print(f"<details><summary><b>{username}</b> [{len(df)}]</summary>\n\n")
         #     print(df.to_markdown(index=False, tablefmt="github"))
         #     print(f"</details>\n")
 
         # print(f"### Configuration Audit by Username", end="\n\n")
         # for username in df_admins["ADMIN_NAME"].to_list():
-        #     query = Template(sql_change_configuration_audit).substitute(username=username, days=7)
-        #     # log.debug(f"query:\n{query}")
-        #     df = pd.read_sql_query(query, isedc_con)
+        #     df = read_sql_query(isedc, sql_change_configuration_audit, {"username": username, "days": 7})
         #     print(f"<details><summary>{username} [{len(df)}]</summary>\n\n")
         #     print(df.to_markdown(index=False, tablefmt="github"))
         #     print(f"</details>\n")
 
-        print(f"### Configuration Audit by Object_Type", end="\n\n")
-        df_object_types = pd.read_sql_query("SELECT DISTINCT object_type FROM change_configuration_audit", isedc_con)
-        print(df_object_types)
-        print(f"object_types:\n{'\n'.join(df_object_types.dropna()['OBJECT_TYPE'].to_list())}")
-
-        df_cfg_audit = pd.read_sql_query(read_file("data/SQL/change_configuration_audit.sql"), isedc_con)
-        print(f"## Configuration Audit\n\n{df_cfg_audit.to_markdown(index=False, tablefmt='github')}\n")
-
-        # print(f"tables: {tables()}", file=sys.stderr)
-        # print(f"columns: {table_columns('network_devices')}", file=sys.stderr)
-        # print(f"{column_widths('network_devices')}", file=sys.stderr)
-
-        print(f"## RADIUS Authentications", end="\n\n")
-        df = pd.read_sql_query(read_file("data/SQL/radius_auths.sql"), isedc_con)
-        print(df.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## RADIUS Accounting", end="\n\n")
-        df = pd.read_sql_query(read_file("data/SQL/radius_acct.sql"), isedc_con)
-        print(df.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Network Device Groups (NDGs)", end="\n\n")
-        df_ndgs = pd.read_sql_query("SELECT * FROM network_device_groups ORDER BY name ASC", isedc_con)
-        print(df_ndgs.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Network Devices", end="\n\n")
-        df_devices = pd.read_sql_query("SELECT * FROM network_devices ORDER BY name ASC", isedc_con)
-        print(df_devices.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Endpoint Identity Groups", end="\n\n")
-        df_eigs = pd.read_sql_query("SELECT * FROM endpoint_identity_groups ORDER BY name ASC", isedc_con)
-        print(df_eigs.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Endpoints", end="\n\n")
-        df_endpoints = pd.read_sql_query(read_file("data/SQL/endpoints_data.sql"), isedc_con)
-        print(df_endpoints.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## ISE Nodes", end="\n\n")
-        df_nodes = pd.read_sql_query("SELECT * FROM node_list ORDER BY hostname ASC", isedc_con)
-        df_nodes.drop(
-            [
-                "API_NODE",
-                "CREATE_TIME",
-                "UPDATE_TIME",
-                "INSTALLATION_TYPE",
-                "PDP_SERVICES",
-                "PIC_NODE",
-                "UDI_VID",
-                "XGRID_PEER",
-                "XGRID_ENABLED",
-            ],
-            axis="columns",
-            inplace=True,
-        )
-        print(df_nodes.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Policy Sets", end="\n\n")
-        # df_policy_sets = pd.read_sql_query(read_file("data/SQL/policy_sets.sql"), isedc_con)
-        df_policy_sets = pd.read_sql_query(
-            "SELECT id, policyset_status, policyset_name, description FROM policy_sets ORDER BY policyset_name ASC", isedc_con
-        )
-        print(df_policy_sets.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## Authorization Profiles", end="\n\n")
-        df_authz_profiles = pd.read_sql_query(read_file("data/SQL/authorization_profiles.sql"), isedc_con)
-        # df_policy_sets = pd.read_sql_query(
-        #     "SELECT id, policyset_status, policyset_name, description FROM policy_sets ORDER BY authorization_profiles ASC", isedc_con
-        # )
-        print(df_authz_profiles.to_markdown(index=False, tablefmt="github"))
-
-        # print(f"## Network Access Users", end="\n\n")
-        # #  account_name_alias, last_successful_login_time, password_never_expires,identity_group
-        # df_na_users = pd.read_sql_query(read_file("data/SQL/network_access_users.sql"), isedc_con)
-        # df_na_users = pd.read_sql_query(
-        #     "SELECT username, status, description, email_address, is_admin, expiry_date FROM network_access_users ORDER BY is_admin DESC, username ASC",
-        #     isedc_con,
-        # )
-        # print(df_na_users.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## SGTs", end="\n\n")
-        df_sgts = pd.read_sql_query(read_file("data/SQL/security_groups.sql"), isedc_con)
-        print(df_sgts.to_markdown(index=False, tablefmt="github"))
-
-        print(f"## SGACLs", end="\n\n")
-        df_sgacls = pd.read_sql_query(read_file("data/SQL/security_group_acls.sql"), isedc_con)
-        print(df_sgacls.to_markdown(index=False, tablefmt="github"))
-
         # Filter NDGs by 'Networks#Networks#'
         # networks = list(map(lambda name: print(name) if name.startswith("Networks#Networks#"), df["NAME"].to_list()))
 
@@ -274,7 +343,7 @@ if __name__ == "__main__":
         #     TO_CHAR(ROUND( (COUNT(CASE WHEN passed = 'Fail' THEN 1 END) / (COUNT(CASE WHEN passed = 'Pass' THEN 1 END) + COUNT(CASE WHEN passed = 'Fail' THEN 1 END)) * 100), 0), 'FM999') || '%' AS fail_pct
         # FROM radius_authentications
         # WHERE timestamp > sysdate - INTERVAL '7' DAY -- last N days
-        #   AND location LIKE '%$ndg_name'
+        #   AND location LIKE '%' || :ndg_name
         # GROUP BY policy_set_name, access_service, authentication_method, authentication_protocol, authorization_rule, authorization_profiles
         # ORDER BY policy_set_name ASC, total DESC
         # """
@@ -291,9 +360,7 @@ if __name__ == "__main__":
         # print(f"results:\n\n{results}")
 
         # for ndg_name in df_ndgs["NAME"].to_list():
-        #     query = Template(query_template).substitute(ndg_name=ndg_name.split("#")[2])
-        #     # print(f"query:\n\n{query}")
-        #     df = pd.read_sql_query(query, isedc_con)
+        #     df = read_sql_query(isedc, query_template, {"ndg_name": ndg_name.split("#")[2]})
         #     print(f"## {ndg_name}\n\n{df.to_markdown(index=False, tablefmt='github')}\n")
     if args.timer:
         print(f"⏱ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Local hourly rollups of the ISE Data Connect RADIUS tables for cheap trend reports over weeks or months.
+Each rollup is a SQLite table of counts per hour and dimension (policy set, network device, failure reason, ...) that is refreshed
+incrementally: only the complete hours after the rollup's watermark are queried from the MNT, one window at a time, so a long
+backfill never runs into the MNT's maximum connect time (ORA-02399). Windows are replaced whole, so an interrupted refresh
+simply resumes from the last saved window.
+
+Usage:
+  isedc_rollup.py refresh                       # refresh all rollups from Data Connect (ISE_PMNT, ISE_DC_PASSWORD)
+  isedc_rollup.py refresh --days 90             # backfill up to 90 days for new rollups
+  isedc_rollup.py info
+  isedc_rollup.py --fake fake_dc.db refresh     # from a fake Data Connect database (isedc_fake.py)
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import datetime
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+ROLLUPS_FILEPATH_DEFAULT = "isedc_rollups.db"
+
+# rollup name : { source view, timestamp column, dimensions, { measure : Oracle aggregate } }
+ROLLUPS = {
+    "radius_auths_hourly": {
+        "source": "radius_authentications",
+        "column": "timestamp",
+        "dimensions": ["policy_set_name", "device_name", "failure_reason"],
+        "measures": {
+            "passed": "COUNT(CASE WHEN passed = 'Pass' THEN 1 END)",
+            "failed": "COUNT(CASE WHEN passed = 'Fail' THEN 1 END)",  # like data/SQL; `failed` is a numeric flag
+            "total": "COUNT(*)",
+            "response_time_sum": "SUM(response_time)",
+        },
+    },
+    "radius_acct_hourly": {
+        "source": "radius_accounting",
+        "column": "timestamp",
+        "dimensions": ["device_name", "acct_status_type"],
+        "measures": {
+            "records": "COUNT(*)",
+            "input_octets": "SUM(acct_input_octets)",
+            "output_octets": "SUM(acct_output_octets)",
+        },
+    },
+}
+
+
+class RollupStore:
+
+    # Class attributes
+    DAYS_DEFAULT = 30  # the initial backfill of a new rollup
+    KEEP_DAYS_DEFAULT = 400  # hours older than this are pruned
+    WINDOW_HOURS = 24  # hours of source rows aggregated by each MNT query
+
+    def __init__(self, filepath: str = ROLLUPS_FILEPATH_DEFAULT, rollups: dict = ROLLUPS, level: str = "WARNING") -> None:
+        """
+        Creates a RollupStore in a SQLite database file, creating the rollup tables if necessary.
+
+        - filepath (str): the SQLite database filepath. Default: `isedc_rollups.db`
+        - rollups (dict): the rollup definitions. Default: ROLLUPS
+        - level (str): logging threshold level
+        """
+        assert isinstance(filepath, str) and filepath != "", "filepath is empty"
+        self.filepath = filepath
+        self.rollups = rollups
+        self.log = logging.getLogger(__name__)
+        self.log.setLevel(level)
+        connection = self.connect()
+        try:
+            connection.execute("CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, hour TEXT)")
+            for name, rollup in rollups.items():
+                columns = ["hour TEXT"] + [f"{d} TEXT" for d in rollup["dimensions"]] + [f"{m} NUMERIC" for m in rollup["measures"]]
+                connection.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(columns)})")
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {name}_hour ON {name} (hour)")
+            connection.commit()
+        finally:
+            connection.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Returns a new connection to the rollup database for local queries, e.g. `pd.read_sql_query(q, store.connect())`.
+        """
+        return sqlite3.connect(self.filepath)
+
+    @classmethod
+    def hour(cls, timestamp=None) -> str:
+        """
+        Returns the `YYYY-MM-DD HH:00:00` text of a datetime or timestamp string.
+        """
+        if isinstance(timestamp, datetime.datetime):
+            return timestamp.strftime("%Y-%m-%d %H:00:00")
+        return f"{timestamp}"[0:13] + ":00:00"
+
+    @classmethod
+    def sql(cls, rollup: dict = None) -> str:
+        """
+        Returns the Oracle query aggregating the source rows of a rollup per hour and dimension between `:since` and `:until`.
+        """
+        dimensions = [f"NVL({d}, '-')" for d in rollup["dimensions"]]  # NULL dimensions are never equal
+        column = rollup["column"]
+        return (
+            f"SELECT TRUNC({column}, 'HH24') AS hour, {', '.join(f'{d} AS {n}' for d, n in zip(dimensions, rollup['dimensions']))}, "
+            f"{', '.join(f'{m} AS {n}' for n, m in rollup['measures'].items())}\n"
+            f"FROM {rollup['source']}\n"
+            f"WHERE {column} >= :since AND {column} < :until\n"
+            f"GROUP BY TRUNC({column}, 'HH24'), {', '.join(dimensions)}"
+        )
+
+    def get_watermark(self, name: str = None) -> datetime.datetime:
+        """
+        Returns the end of the last complete hour in the named rollup or None.
+        """
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT hour FROM watermarks WHERE name = ?", (name,)).fetchone()
+        finally:
+            connection.close()
+        return datetime.datetime.fromisoformat(row[0]) if row else None
+
+    def refresh(self, isedc=None, names: list = None, days: int = DAYS_DEFAULT, now: datetime.datetime = None) -> dict:
+        """
+        Query the complete hours after each rollup's watermark from Data Connect and return a dict of { name : rows added }.
+        Each window of `WINDOW_HOURS` is saved with its watermark in one transaction.
+
+        - isedc (ISEDC): a configured ISEDC instance
+        - names (list): the rollup names to refresh. Default: all
+        - days (int): the initial backfill of a rollup without a watermark
+        - now (datetime): the current time. Default: `datetime.now()`
+        """
+        until = (now or datetime.datetime.now()).replace(minute=0, second=0, microsecond=0)  # complete hours only
+        counts = {}
+        for name in names or self.rollups:
+            rollup = self.rollups[name]
+            since = self.get_watermark(name) or until - datetime.timedelta(days=days)
+            counts[name] = 0
+            while since < until:
+                window_end = min(since + datetime.timedelta(hours=self.WINDOW_HOURS), until)
+                cursor = isedc.query(self.sql(rollup), {"since": since, "until": window_end})
+                try:
+                    rows = [(self.hour(row[0]), *row[1:]) for row in cursor.fetchall()]
+                finally:
+                    isedc.release_cursor(cursor)  # return a pooled session
+                connection = self.connect()
+                try:
+                    with connection:  # one transaction
+                        connection.execute(f"DELETE FROM {name} WHERE hour >= ? AND hour < ?", (self.hour(since), self.hour(window_end)))
+                        connection.executemany(f"INSERT INTO {name} VALUES ({', '.join(['?'] * (1 + len(rollup['dimensions']) + len(rollup['measures'])))})", rows)
+                        connection.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?)", (name, window_end.isoformat(" ")))
+                finally:
+                    connection.close()
+                self.log.info(f"{name}: {since} - {window_end}: {len(rows)} rows")
+                counts[name] += len(rows)
+                since = window_end
+        return counts
+
+    def prune(self, keep_days: int = KEEP_DAYS_DEFAULT, now: datetime.datetime = None) -> int:
+        """
+        Delete the rollup hours older than `keep_days` and return the number of rows deleted.
+        """
+        oldest = self.hour((now or datetime.datetime.now()) - datetime.timedelta(days=keep_days))
+        connection = self.connect()
+        try:
+            with connection:
+                return sum([connection.execute(f"DELETE FROM {name} WHERE hour < ?", (oldest,)).rowcount for name in self.rollups])
+        finally:
+            connection.close()
+
+    def info(self) -> list:
+        """
+        Returns a list of (name, rows, first hour, watermark) tuples for the rollups.
+        """
+        connection = self.connect()
+        try:
+            return [
+                (name, *connection.execute(f"SELECT COUNT(*), MIN(hour) FROM {name}").fetchone(), self.get_watermark(name))
+                for name in self.rollups
+            ]
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("command", choices=["refresh", "info", "prune"], help="rollup command")
+    argp.add_argument("-r", "--rollups", action="store", default=ROLLUPS_FILEPATH_DEFAULT, help="rollup database filepath", type=str)
+    argp.add_argument("-d", "--days", action="store", default=RollupStore.DAYS_DEFAULT, help="initial backfill days of new rollups", type=int)
+    argp.add_argument("-k", "--keep", action="store", default=RollupStore.KEEP_DAYS_DEFAULT, help="days of rollups to keep", type=int)
+    argp.add_argument("--fake", action="store", default=None, help="query a fake Data Connect SQLite database (isedc_fake.py)", type=str)
+    argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
+    argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
+    argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script execution time")
+    args = argp.parse_args()
+    start_time = time.time()
+
+    logging.basicConfig(stream=sys.stderr, format="%(asctime)s.%(msecs)03d | %(levelname)s | %(module)s | %(funcName)s | %(message)s")
+    store = RollupStore(args.rollups, level=args.level)
+
+    if args.command == "refresh":
+        from isedc import ISEDC  # lazy load
+
+        backend = None
+        if args.fake:
+            from isedc_fake import FakeDataConnect
+
+            backend = FakeDataConnect(args.fake)
+        with ISEDC(
+            hostname=os.environ.get("ISE_PMNT", "fake_dc" if backend else None),
+            username=os.environ.get("ISE_DC_USERNAME", ISEDC.DATACONNECT_USERNAME),
+            password=os.environ.get("ISE_DC_PASSWORD", FakeDataConnect.PASSWORD if backend else None),
+            insecure=args.insecure or os.environ.get("ISE_VERIFY", "True")[0:1].lower() in ["f", "n"],
+            level=args.level,
+            backend=backend,
+        ) as isedc:
+            counts = store.refresh(isedc, days=args.days)
+        store.prune(args.keep)
+        [print(f"✔ {name}: {count} rows added", file=sys.stderr) for name, count in counts.items()]
+    elif args.command == "prune":
+        print(f"✔ {store.prune(args.keep)} rows pruned", file=sys.stderr)
+    elif args.command == "info":
+        for name, rows, first, watermark in store.info():
+            print(f"{name} {rows:>10} rows  {first} - {watermark}")
+
+    if args.timer:
+        print(f"⏱ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+A persistent ISE Data Connect schema catalog of the views, their columns and types for instant lookups without a database round trip.
+The catalog is built with a single query of `all_tab_columns` and saved to a JSON file which is refreshed after a time-to-live (TTL)
+or when the ISE database version changes.
+
+Columns with TimeZone information (`TIMESTAMP WITH TIME ZONE`) are flagged because they are not supported by the oracledb thin client
+(DPY-3022) so tools may automatically select only the non-TZ columns of a view.
+
+Usage:
+  isedc_schema.py refresh                       # rebuild the catalog from Data Connect (ISE_PMNT, ISE_DC_PASSWORD)
+  isedc_schema.py tables
+  isedc_schema.py columns radius_authentications
+  isedc_schema.py select radius_authentications  # SELECT statement with only the non-TZ columns
+  isedc_schema.py suggest radius_auths          # "did you mean" view names
+  isedc_schema.py tables --hostname ise-mnt     # the catalog of another MNT; Default: ISE_PMNT
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import difflib
+import json
+import logging
+import os
+import sys
+import time
+
+SCHEMA_DIRECTORY_DEFAULT = os.path.join(os.path.expanduser("~"), ".cache", "isedc")
+
+
+class SchemaCatalog:
+
+    # Class attributes
+    TTL_DEFAULT = 7 * 24 * 60 * 60  # seconds; the Data Connect schema only changes with ISE upgrades and patches
+    PROFILE_TTL_DEFAULT = 24 * 60 * 60  # seconds; column widths and counts change with the data
+    SQL_SCHEMA = """
+SELECT c.table_name, c.column_name, c.data_type, c.nullable
+FROM all_tab_columns c
+JOIN user_views v ON v.view_name = c.table_name
+ORDER BY c.table_name ASC, c.column_id ASC
+"""
+
+    @classmethod
+    def default_filepath(cls, hostname: str = None) -> str:
+        """
+        Returns the catalog file path for the ISE MNT hostname, `~/.cache/isedc/schema-{hostname}.json`, or `schema.json` without one.
+        """
+        return os.path.join(SCHEMA_DIRECTORY_DEFAULT, f"schema-{hostname}.json" if hostname else "schema.json")
+
+    def __init__(self, filepath: str = None, level: str = "WARNING") -> None:
+        """
+        Creates a SchemaCatalog and loads the existing catalog file, if any.
+
+        - filepath (str): the catalog file path. Default: `~/.cache/isedc/schema.json`
+        - level (str): logging threshold level
+        """
+        self.filepath = filepath or self.default_filepath()
+        self.log = logging.getLogger(__name__)
+        self.log.setLevel(level)
+        self.version = None  # the ISE database version of the catalog
+        self.created = None  # epoch seconds of the last refresh
+        self.views = {}  # { view : [ { name, type, nullable, tz } ] }
+        self.profiles = {}  # { view : { created, rows, columns : { name : { type, width, nulls, distinct } } } }
+        if os.path.exists(self.filepath):
+            self.load()
+
+    def __contains__(self, view: str) -> bool:
+        return view.lower() in self.views
+
+    def __len__(self) -> int:
+        return len(self.views)
+
+    def load(self) -> None:
+        """
+        Load the catalog from `filepath`.
+        """
+        with open(self.filepath, mode="r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        self.version = data.get("version")
+        self.created = data.get("created")
+        self.views = data.get("views", {})
+        self.profiles = data.get("profiles", {})
+        self.log.info(f"Loaded {len(self.views)} views from {self.filepath}")
+
+    def save(self) -> None:
+        """
+        Atomically write the catalog to `filepath`.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+        tmp_filepath = f"{self.filepath}.tmp"
+        with open(tmp_filepath, mode="w", encoding="utf-8") as fh:
+            json.dump({"version": self.version, "created": self.created, "views": self.views, "profiles": self.profiles}, fh, indent=1)
+        os.replace(tmp_filepath, self.filepath)  # never leave a partial catalog file
+        self.log.info(f"Saved {len(self.views)} views to {self.filepath}")
+
+    def is_stale(self, ttl: int = TTL_DEFAULT, version: str = None) -> bool:
+        """
+        Returns True if the catalog is empty, older than `ttl` seconds or for a different database `version`.
+        """
+        if not self.views or self.created is None:
+            return True
+        if time.time() - self.created > ttl:
+            return True
+        return version is not None and version != self.version
+
+    def rebuild(self, rows=None, version: str = None) -> int:
+        """
+        Replace the catalog with the (table_name, column_name, data_type, nullable) rows and return the number of views.
+        """
+        views = {}
+        for table_name, column_name, data_type, nullable in rows:
+            views.setdefault(table_name.lower(), []).append(
+                {
+                    "name": column_name.lower(),
+                    "type": data_type,
+                    "nullable": nullable == "Y",
+                    "tz": "TIME ZONE" in (data_type or ""),  # TIMESTAMP(6) WITH [LOCAL] TIME ZONE
+                }
+            )
+        self.views = views
+        self.profiles = {}  # profiles of the previous schema are invalid
+        self.version = version
+        self.created = int(time.time())
+        return len(self.views)
+
+    def refresh(self, isedc=None) -> int:
+        """
+        Rebuild the catalog from ISE Data Connect with a single query, save it and return the number of views.
+
+        - isedc (ISEDC): a configured ISEDC instance
+        """
+        cursor = isedc.query(self.SQL_SCHEMA)
+        cursor.arraysize = 5000  # thousands of columns
+        try:
+            rows = cursor.fetchall()
+        finally:
+            isedc.release_cursor(cursor)  # return a pooled session
+        count = self.rebuild(rows, isedc.version())
+        self.save()
+        return count
+
+    def tables(self) -> list:
+        """
+        Returns the sorted list of view names.
+        """
+        return sorted(self.views)
+
+    def columns(self, view: str = None, tz: bool = None) -> list:
+        """
+        Returns the column names of the view in their defined order.
+        - view (str): the view name
+        - tz (bool): only the TimeZone (True) or non-TimeZone (False) columns. Default: all columns
+        """
+        return [column["name"] for column in self.views.get(view.strip().lower(), []) if tz is None or column["tz"] == tz]
+
+    def column_types(self, view: str = None) -> dict:
+        """
+        Returns a dict of { column name : Oracle data type } for the view.
+        """
+        return {column["name"]: column["type"] for column in self.views.get(view.strip().lower(), [])}
+
+    def select(self, view: str = None) -> str:
+        """
+        Returns a `SELECT` statement with only the non-TimeZone columns of the view for the oracledb thin client.
+        """
+        return f"SELECT {', '.join(self.columns(view, tz=False))} FROM {view.strip().lower()}"
+
+    def get_profile(self, view: str = None, ttl: int = PROFILE_TTL_DEFAULT) -> dict:
+        """
+        Returns the saved column profile of the view if it is younger than `ttl` seconds or None.
+        """
+        profile = self.profiles.get(view.strip().lower())
+        if profile is None or time.time() - profile["created"] > ttl:
+            return None
+        return profile
+
+    def set_profile(self, view: str = None, profile: dict = None) -> None:
+        """
+        Save the column profile of the view.
+        """
+        self.profiles[view.strip().lower()] = profile
+        self.save()
+
+    def suggest(self, name: str = None, view: str = None, n: int = 5) -> list:
+        """
+        Returns up to `n` "did you mean" view names or, with `view`, column names that are similar to `name`.
+        """
+        names = self.columns(view) if view else self.tables()
+        name = name.strip().lower()
+        suggestions = difflib.get_close_matches(name, names, n=n, cutoff=0.6)
+        prefixed = [s for s in names if s.startswith(name[0:4]) and s not in suggestions]  # the same table family
+        return (suggestions + prefixed)[0:n]
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("command", choices=["refresh", "tables", "columns", "select", "suggest"], help="catalog command")
+    argp.add_argument("name", nargs="?", default=None, help="view name")
+    argp.add_argument("-s", "--schema", action="store", default=None, help="catalog filepath. Default: the --hostname catalog", type=str)
+    argp.add_argument("-n", "--hostname", action="store", default=os.environ.get("ISE_PMNT"), help="ISE MNT hostname. Default: ISE_PMNT", type=str)
+    argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
+    argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
+    args = argp.parse_args()
+
+    logging.basicConfig(stream=sys.stderr, format="%(asctime)s.%(msecs)03d | %(levelname)s | %(module)s | %(funcName)s | %(message)s")
+    catalog = SchemaCatalog(args.schema or SchemaCatalog.default_filepath(args.hostname), level=args.level)  # the same file as ISEDC
+
+    if args.command == "refresh":
+        from isedc import ISEDC  # lazy load
+
+        with ISEDC(
+            hostname=args.hostname,
+            username=os.environ.get("ISE_DC_USERNAME", ISEDC.DATACONNECT_USERNAME),
+            password=os.environ.get("ISE_DC_PASSWORD"),
+            insecure=args.insecure or os.environ.get("ISE_VERIFY", "True")[0:1].lower() in ["f", "n"],
+            level=args.level,
+        ) as isedc:
+            catalog.refresh(isedc)
+        print(f"✔ {len(catalog)} views ({catalog.version}) saved to {catalog.filepath}", file=sys.stderr)
+    elif args.command == "tables":
+        print("\n".join(catalog.tables()))
+    elif args.name is None:
+        sys.exit(f"✖ {args.command} requires a view name")
+    elif args.command == "columns":
+        tz_columns = catalog.columns(args.name, tz=True)
+        [print(f"{name} {type}{' ⚠ TZ' if name in tz_columns else ''}") for name, type in catalog.column_types(args.name).items()]
+    elif args.command == "select":
+        print(catalog.select(args.name))
+    elif args.command == "suggest":
+        print("\n".join(catalog.suggest(args.name)))
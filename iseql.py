@@ -14,6 +14,10 @@ Usage with environment variables:
   iseql.py -it "SELECT * FROM radius_accounting ORDER BY timestamp ASC FETCH FIRST 10 ROWS ONLY"
   iseql.py data/SQL/node_list.sql
   iseql.py "$(cat data/SQL/radius_auths_by_policy.sql)" -f table
+  iseql.py data/SQL/radius_auths_by_policy.sql --bind days=7  # override a `-- @param` bind variable default
+  iseql.py data/SQL/radius_auths.sql -a 1000 --stats --metrics metrics.jsonl  # query time, rows and round trips
+  iseql.py "SELECT * FROM radius_accounting" --explain       # estimated rows and cost without running the query
+  iseql.py "SELECT * FROM radius_accounting" --max-rows 100000 --max-cost 50000  # cap or refuse expensive queries
 
 Without environment variables:
   iseql.py -it -n ise.example.org -p "ISEisC00L" "SELECT * FROM node_list" -f table
@@ -34,10 +38,12 @@ __license__ = "MIT - https://mit-license.org/"
 
 import argparse
 import csv
+import datetime
 import json
 import logging
 import oracledb
 import os
+import re
 import signal
 import ssl
 import sys
@@ -49,6 +55,7 @@ ISE_DC_PORT = 2484  # Data Connect port
 ISE_DC_SID = "cpm10"  # Data Connect service name identifier
 ISE_DC_USERNAME = "dataconnect"  # Data Connect username
 FORMATS = ["csv", "grid", "json", "line", "markdown", "pretty", "yaml", "table", "text"]
+metrics = {"round_trips": 0}  # query metrics; round trips are counted by the connection's round_trip_callback
 
 
 def read_sql_file(filepath: str = None) -> str:
@@ -67,6 +74,62 @@ def read_sql_file(filepath: str = None) -> str:
         return fh.read()
 
 
+def sql_binds(query: str = None, binds: list = []) -> dict:
+    """
+    Returns the bind variables declared in the SQL header with `-- @param <name> <type> [default]` and `name=value` overrides.
+    query (str) : the SQL query text
+    binds (list) : `name=value` strings
+    returns (dict) : the { name : value } bind variables or None
+    """
+    types = {"int": int, "float": float}  # str, date and datetime values are converted by Oracle
+    params = {}
+    for line in query.splitlines():
+        if not line.strip().startswith("--"):
+            break  # end of the header comment block
+        match = re.match(r"^\s*--\s*@param\s+(\w+)\s+(\w+)(?:\s+([^:\s]\S*))?", line)
+        if match:
+            name, type, default = match.groups()
+            params[name] = (types.get(type, str), default)
+    values = dict([bind.split("=", 1) for bind in binds])
+    binds = {name: convert(values.get(name, default)) for name, (convert, default) in params.items() if values.get(name, default) is not None}
+    return binds or None
+
+
+def fetch_batches(cursor=None):
+    """
+    Yield the cursor rows in batches, one batch per fetch round trip, and add the fetch time, rows and bytes to the query metrics.
+    cursor (Cursor) : an executed cursor
+    """
+    while True:
+        start = time.perf_counter()
+        rows = cursor.fetchmany()  # use Cursor.arraysize
+        metrics["fetch"] += time.perf_counter() - start
+        if not rows:
+            break
+        if metrics["first_row"] is None:
+            metrics["first_row"] = time.perf_counter() - metrics["start"]
+        metrics["rows"] += len(rows)
+        metrics["batches"] += 1
+        metrics["bytes"] += (sum(sys.getsizeof(value) for value in rows[0]) + sys.getsizeof(rows[0])) * len(rows)  # sample one row per batch
+        yield rows
+
+
+def explain(cursor=None, query: str = None) -> dict:
+    """
+    Returns the optimizer's estimates for the query with `EXPLAIN PLAN` without running it.
+    `EXPLAIN PLAN` does not accept bind values (ORA-01006) so bind variables are estimated without their values.
+    cursor (Cursor) : a cursor
+    query (str) : the SQL query text
+    returns (dict) : { rows : estimated rows, cost : estimated cost, plan : [ plan lines ] }
+    """
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = 'ISEQL' FOR\n{query}")
+    cursor.execute("SELECT depth, operation, options, object_name, cardinality, cost FROM plan_table WHERE statement_id = 'ISEQL' ORDER BY id")
+    steps = cursor.fetchall()
+    cursor.connection.rollback()  # discard the plan rows
+    plan = [f"{'  ' * int(depth or 0)}{' '.join(filter(None, [op, options, name]))}  rows={rows} cost={cost}" for depth, op, options, name, rows, cost in steps]
+    return {"rows": int(steps[0][4] or 0), "cost": int(steps[0][5] or 0), "plan": plan}
+
+
 def show(table: list = None, headers: list = None, format: str = "text", filepath: str = "-") -> None:
     """
     Print the table in the specified format to the file. Default: `sys.stdout` ('-').
@@ -129,6 +192,15 @@ argp.add_argument("-f", "--format", choices=FORMATS, default="csv", help="output
 argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
 argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
 argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script time")
+argp.add_argument("-a", "--arraysize", action="store", default=100, help="rows per fetch round trip", type=int)
+argp.add_argument("--prefetchrows", action="store", default=2, help="rows returned with the execute", type=int)
+argp.add_argument("-b", "--bind", action="append", default=[], help="bind variable `name=value` for a `-- @param` in the SQL header", type=str)
+argp.add_argument("--explain", action="store_true", default=False, help="show the estimated rows and cost of the query without running it")
+argp.add_argument("--max-rows", action="store", default=os.environ.get("ISE_DC_MAX_ROWS"), help="cap queries estimated to return more rows", type=int)
+argp.add_argument("--max-cost", action="store", default=os.environ.get("ISE_DC_MAX_COST"), help="refuse queries with a higher estimated cost", type=int)
+argp.add_argument("--force", action="store_true", default=False, help="run the query regardless of --max-rows and --max-cost")
+argp.add_argument("--stats", action="store_true", default=False, help="show the query metrics (time, rows, round trips, ...)")
+argp.add_argument("--metrics", action="store", default=None, help="append the query metrics to a JSON Lines file", type=str)
 args = argp.parse_args()
 
 if args.query is None or args.query == "":
@@ -175,6 +247,7 @@ params = oracledb.ConnectParams(
     ssl_server_dn_match=False,  # boolean indicating if the server certificate distinguished name (DN) should be matched. Default: True
     # ssl_server_cert_dn=False # the distinguished name (DN), which should be matched with the server
     # wallet_location=DIR_EWALLET, # the directory containing the PEM-encoded wallet file, ewallet.pem
+    round_trip_callback=lambda *args: metrics.update(round_trips=metrics["round_trips"] + 1),  # count round trips (thin mode)
 )
 log.debug(f"OracleDB Connection String: {params.get_connect_string()}")
 
@@ -186,7 +259,39 @@ try:
             query = read_sql_file(args.query) if args.query.strip().lower().endswith(".sql") else args.query
 
             log.debug(f"SQL query:\n-----\n{query}\n-----")
-            cursor.execute(query)
+            cursor.arraysize = args.arraysize  # fewer round trips for large results
+            cursor.prefetchrows = args.prefetchrows  # must be set before execute()
+            binds = sql_binds(query, args.bind)
+
+            if args.explain or (not args.force and (args.max_rows is not None or args.max_cost is not None)):
+                estimate = explain(cursor, query)
+                if args.explain:
+                    print("\n".join(estimate["plan"]))
+                    print(f"ⓘ ~{estimate['rows']} rows, cost {estimate['cost']}", file=sys.stderr)
+                    sys.exit(0)
+                if args.max_cost is not None and estimate["cost"] > args.max_cost:
+                    sys.exit(f"✖ estimated cost {estimate['cost']} exceeds the maximum cost {args.max_cost}. Add a time predicate or use --force.")
+                if args.max_rows is not None and estimate["rows"] > args.max_rows:
+                    log.warning(f"estimated {estimate['rows']} rows; capped at {args.max_rows} rows")
+                    query = f"SELECT * FROM (\n{query}\n) FETCH FIRST {args.max_rows} ROWS ONLY"  # newlines end any `--` comments
+            metrics.update(
+                timestamp=datetime.datetime.now().isoformat(timespec="milliseconds"),
+                sql=" ".join(query.split())[0:200],
+                start=time.perf_counter(),
+                round_trips=0,  # exclude the connect round trips
+            )
+            cursor.execute(query, binds)
+            metrics.update(
+                execute=time.perf_counter() - metrics["start"],  # parse, execute and prefetch round trip
+                first_row=None,
+                fetch=0.0,
+                rows=0,
+                batches=0,
+                bytes=0,
+                reconnects=0,
+                arraysize=args.arraysize,
+                prefetchrows=args.prefetchrows,
+            )
 
             # Use CSV by default to stream results without large memory buffering
             if args.format == "csv":
@@ -195,17 +300,32 @@ try:
                 headers = [f"{i[0]}".lower() for i in cursor.description]
                 writer = csv.writer(sys.stdout, quoting=0, skipinitialspace=True)
                 writer.writerow(headers)
-                while True:
-                    rows = cursor.fetchmany()  # use default Cursor.arraysize
-                    if not rows:
-                        break
+                for rows in fetch_batches(cursor):
                     writer.writerows(rows)
             else:
                 # All other formats require buffering all results in memory for column width sizing (grid|table) or map attribute names (JSON|YAML)
                 headers = [f"{i[0]}".lower() for i in cursor.description]
-                rows = cursor.fetchall()  # returns a list of tuples
+                rows = [row for batch in fetch_batches(cursor) for row in batch]  # a list of tuples
                 show(table=rows, headers=headers, format=args.format)
 
+            elapsed = time.perf_counter() - metrics.pop("start")
+            metrics.update(
+                elapsed=elapsed,
+                client=max(elapsed - metrics["execute"] - metrics["fetch"], 0.0),  # formatting and writing the rows
+                rows_per_second=int(metrics["rows"] / elapsed) if elapsed > 0 else 0,
+            )
+            if args.stats:
+                print(
+                    f"⏱ {metrics['rows']} rows in {metrics['elapsed']:.3f}s ({metrics['rows_per_second']} rows/s) | "
+                    f"execute {metrics['execute']:.3f}s, first row {metrics['first_row'] or 0:.3f}s, fetch {metrics['fetch']:.3f}s, "
+                    f"client {metrics['client']:.3f}s | {metrics['round_trips']} round trips, {metrics['batches']} batches, "
+                    f"arraysize {metrics['arraysize']}, ~{metrics['bytes'] // 1024} KiB",
+                    file=sys.stderr,
+                )
+            if args.metrics:
+                with open(args.metrics, mode="a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(metrics, default=str) + "\n")
+
 except oracledb.Error as e:
     log.error(f"Oracle Error: {e}")
 except Exception as e:
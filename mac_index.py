@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+A persistent, on-disk index of existing ISE endpoint MAC addresses for fast duplicate checks.
+MACs are stored as a sorted array of 48-bit integers (in 64-bit words) so a million endpoints is ~8MB on disk,
+loads in milliseconds and each membership check is a binary search in microseconds.
+
+The index may be built from:
+- ISE Data Connect with a single, streamed `SELECT mac_address FROM endpoints_data` (fastest)
+- an ISE ERS walk of /ers/config/endpoint (no Data Connect required)
+- a file of MACs, one per line or the `MACAddress` column of a CSV
+
+Usage:
+  mac_index.py build --dc                       # rebuild the index from Data Connect (ISE_PMNT, ISE_DC_PASSWORD)
+  mac_index.py build --ers                      # rebuild the index from ERS (ISE_PPAN, ISE_REST_USERNAME, ISE_REST_PASSWORD)
+  mac_index.py add endpoints.csv                # add MACs to the existing index
+  mac_index.py check 11:22:33:44:55:66          # exit status 0 if present, 1 otherwise
+  mac_index.py info
+  mac_index.py -x /tmp/lab.macidx build --dc -it
+
+"""
+
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import array
+import bisect
+import csv
+import logging
+import os
+import string
+import sys
+import time
+
+INDEX_FILEPATH_DEFAULT = "ise_endpoints.macidx"
+
+
+class MACIndex:
+
+    # Class attributes
+    MAGIC = b"MACIDX01"  # file signature and format version
+    SQL_ENDPOINT_MACS = "SELECT mac_address FROM endpoints_data"
+    FETCH_ARRAYSIZE = 10000  # rows per Data Connect round trip
+    TR_NO_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+    def __init__(self, filepath: str = INDEX_FILEPATH_DEFAULT, level: str = "WARNING") -> None:
+        """
+        Creates a MACIndex and loads the existing index file, if any.
+
+        - filepath (str): the index file path. Default: `ise_endpoints.macidx`
+        - level (str): logging threshold level
+        """
+        assert isinstance(filepath, str), "filepath is not a string"
+        assert filepath != "", "filepath is empty"
+        self.filepath = filepath
+        self.log = logging.getLogger(__name__)
+        self.log.setLevel(level)
+        self.macs = array.array("Q")  # sorted 48-bit MAC integers
+        self.pending = set()  # added MACs not yet merged into `macs`
+        self.created = None  # epoch seconds of the last full build
+        if os.path.exists(filepath):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.macs) + len(self.pending)
+
+    def __contains__(self, mac) -> bool:
+        """
+        Returns True if the MAC address (str in any format or int) is in the index.
+        Invalid MAC addresses are never in the index.
+        """
+        try:
+            n = mac if isinstance(mac, int) else self.to_int(mac)
+        except ValueError:
+            return False
+        if n in self.pending:
+            return True
+        idx = bisect.bisect_left(self.macs, n)
+        return idx < len(self.macs) and self.macs[idx] == n
+
+    @classmethod
+    def to_int(cls, mac: str = None) -> int:
+        """
+        Returns the 48-bit integer value of the MAC address in any separator format.
+
+        - mac (str): a MAC address like `11:22:33:44:55:66`, `11-22-33-44-55-66`, `1122.3344.5566`
+        """
+        if not isinstance(mac, str):
+            raise ValueError(f"mac is not a string: {mac}")
+        digits = mac.strip().translate(cls.TR_NO_PUNCTUATION)
+        if len(digits) != 12:
+            raise ValueError(f"mac is not 12 hex digits: {mac}")
+        return int(digits, 16)
+
+    @classmethod
+    def to_mac(cls, n: int = 0, sep: str = ":") -> str:
+        """
+        Returns the MAC address string for the 48-bit integer in the `XX:XX:XX:XX:XX:XX` format.
+        """
+        digits = f"{n:012X}"
+        return sep.join([digits[idx : idx + 2] for idx in range(0, 12, 2)])
+
+    def add(self, mac) -> bool:
+        """
+        Add a MAC address (str or int) to the index. Returns False if it was already present.
+        """
+        n = mac if isinstance(mac, int) else self.to_int(mac)
+        if n in self:
+            return False
+        self.pending.add(n)
+        return True
+
+    def update(self, macs) -> int:
+        """
+        Add an iterable of MAC addresses to the index and return the number of new MACs.
+        """
+        count = 0
+        for mac in macs:
+            try:
+                count += 1 if self.add(mac) else 0
+            except ValueError as e:  # skip invalid MACs
+                self.log.warning(e)
+        return count
+
+    def merge(self) -> None:
+        """
+        Merge pending MACs into the sorted array.
+        """
+        if self.pending:
+            self.macs = array.array("Q", sorted(set(self.macs).union(self.pending)))
+            self.pending = set()
+
+    def rebuild(self, macs) -> int:
+        """
+        Replace the index contents with the iterable of MAC addresses and return the index size.
+        """
+        values = set()
+        for mac in macs:
+            try:
+                values.add(mac if isinstance(mac, int) else self.to_int(mac))
+            except ValueError as e:
+                self.log.warning(e)
+        self.macs = array.array("Q", sorted(values))
+        self.pending = set()
+        self.created = int(time.time())
+        return len(self.macs)
+
+    def load(self) -> None:
+        """
+        Load the index from `filepath`.
+        """
+        with open(self.filepath, mode="rb") as fh:
+            if fh.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"{self.filepath} is not a MAC index file")
+            header = array.array("Q")
+            header.fromfile(fh, 2)  # [created, count]
+            self.created, count = header
+            self.macs = array.array("Q")
+            self.macs.fromfile(fh, count)
+        self.pending = set()
+        self.log.info(f"Loaded {len(self.macs)} MACs from {self.filepath}")
+
+    def save(self) -> None:
+        """
+        Merge any pending MACs and atomically write the index to `filepath`.
+        """
+        self.merge()
+        tmp_filepath = f"{self.filepath}.tmp"
+        with open(tmp_filepath, mode="wb") as fh:
+            fh.write(self.MAGIC)
+            array.array("Q", [self.created or int(time.time()), len(self.macs)]).tofile(fh)
+            self.macs.tofile(fh)
+        os.replace(tmp_filepath, self.filepath)  # never leave a partial index file
+        self.log.info(f"Saved {len(self.macs)} MACs to {self.filepath}")
+
+    def build_from_isedc(self, isedc=None) -> int:
+        """
+        Rebuild the index from the ISE Data Connect `endpoints_data` table with one streamed query.
+
+        - isedc (ISEDC): a configured ISEDC instance
+        """
+        cursor = isedc.query(self.SQL_ENDPOINT_MACS)
+        cursor.arraysize = self.FETCH_ARRAYSIZE
+
+        def macs():
+            try:
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row[0]
+            finally:
+                isedc.release_cursor(cursor)  # return a pooled session
+
+        return self.rebuild(macs())
+
+    async def build_from_ers(self, session=None, page_size: int = 100, concurrency: int = 5) -> int:
+        """
+        Rebuild the index by walking the ISE ERS endpoint resource.
+
+        - session (aiohttp.ClientSession): an authenticated session with the ISE PAN base URL
+        - page_size (int): ERS page size (max 100)
+        - concurrency (int): the number of concurrent page requests
+        """
+        import asyncio  # lazy load
+
+        path = "/ers/config/endpoint"
+        async with session.get(f"{path}?size={page_size}&page=1") as response:
+            data = await response.json()
+        total = data["SearchResult"]["total"]
+        macs = [resource["name"] for resource in data["SearchResult"]["resources"]]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_page(page: int):
+            async with semaphore:
+                async with session.get(f"{path}?size={page_size}&page={page}") as response:
+                    return [resource["name"] for resource in (await response.json())["SearchResult"]["resources"]]
+
+        pages = total // page_size + (1 if total % page_size else 0)
+        for names in await asyncio.gather(*[get_page(page) for page in range(2, pages + 1)]):
+            macs.extend(names)
+        return self.rebuild(macs)
+
+
+def read_macs(filepath: str = "-"):
+    """
+    Yield the MAC addresses from a file with one MAC per line or a CSV with a `MACAddress` or `mac_address` column.
+    """
+    fh = sys.stdin if filepath == "-" else open(filepath, mode="r", encoding="utf-8", newline="")
+    first = fh.readline()
+    if "," in first:  # CSV with headers
+        headers = next(csv.reader([first]))
+        column = next((h for h in headers if h.lower() in ["macaddress", "mac_address", "mac"]), headers[0])
+        for row in csv.DictReader(fh, fieldnames=headers):
+            yield row[column]
+    else:
+        for line in [first] + list(fh):
+            if line.strip():
+                yield line.strip()
+
+
+if __name__ == "__main__":
+    """
+    Run from script.
+    """
+    argp = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argp.add_argument("command", choices=["build", "add", "check", "info"], help="index command")
+    argp.add_argument("items", nargs="*", help="MAC addresses for `check` or a filepath for `add`")
+    argp.add_argument("-x", "--index", action="store", default=INDEX_FILEPATH_DEFAULT, help="index filepath", type=str)
+    argp.add_argument("--dc", action="store_true", default=False, help="build from ISE Data Connect")
+    argp.add_argument("--ers", action="store_true", default=False, help="build from ISE ERS endpoints")
+    argp.add_argument("-i", "--insecure", action="store_true", default=False, help="do not verify certificates (allow self-signed certs)")
+    argp.add_argument("-l", "--level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="log threshold")
+    argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total script execution time")
+    args = argp.parse_args()
+
+    logging.basicConfig(stream=sys.stderr, format="%(asctime)s.%(msecs)03d | %(levelname)s | %(module)s | %(funcName)s | %(message)s")
+    start_time = time.time()
+    index = MACIndex(args.index, level=args.level)
+
+    if args.command == "build":
+        if args.dc:
+            from isedc import ISEDC  # lazy load
+
+            with ISEDC(
+                hostname=os.environ.get("ISE_PMNT"),
+                username=os.environ.get("ISE_DC_USERNAME", ISEDC.DATACONNECT_USERNAME),
+                password=os.environ.get("ISE_DC_PASSWORD"),
+                insecure=args.insecure or os.environ.get("ISE_VERIFY", "True")[0:1].lower() in ["f", "n"],
+                level=args.level,
+            ) as isedc:
+                index.build_from_isedc(isedc)
+        elif args.ers:
+            import aiohttp  # lazy load
+            import asyncio
+
+            async def build_ers():
+                verify = not (args.insecure or os.environ.get("ISE_CERT_VERIFY", "True")[0:1].lower() in ["f", "n"])
+                async with aiohttp.ClientSession(
+                    f"https://{os.environ.get('ISE_PPAN')}",
+                    auth=aiohttp.BasicAuth(login=os.environ.get("ISE_REST_USERNAME"), password=os.environ.get("ISE_REST_PASSWORD")),
+                    connector=aiohttp.TCPConnector(limit=5, ssl=verify),
+                    headers={"Accept": "application/json"},
+                ) as session:
+                    return await index.build_from_ers(session)
+
+            asyncio.run(build_ers())
+        else:
+            sys.exit("build requires --dc or --ers")
+        index.save()
+        print(f"✔ {len(index)} MACs indexed in {args.index}", file=sys.stderr)
+    elif args.command == "add":
+        added = sum([index.update(read_macs(filepath)) for filepath in (args.items or ["-"])])
+        index.save()
+        print(f"✔ {added} MACs added; {len(index)} MACs indexed in {args.index}", file=sys.stderr)
+    elif args.command == "check":
+        missing = [mac for mac in args.items if mac not in index]
+        [print(f"{'✖' if mac in missing else '✔'} {mac}") for mac in args.items]
+        sys.exit(1 if missing else 0)
+    elif args.command == "info":
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(index.created)) if index.created else "-"
+        print(f"{args.index}: {len(index)} MACs, built {created}")
+
+    if args.timer:
+        print(f"⏱ {'{0:.3f}'.format(time.time() - start_time)} seconds", file=sys.stderr)
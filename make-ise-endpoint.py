@@ -9,6 +9,7 @@ Examples:
   make-ise-endpoint.py --format yaml --group random --number 6
   make-ise-endpoint.py -vtn 1000 --group IOT
   make-ise-endpoint.py -tvf csv -g random -n 1000000 > endpoints_1M.csv  # ⏱ 10.287 seconds
+  make-ise-endpoint.py -n 1000 --index ise_endpoints.macidx  # avoid MACs already in ISE (see mac_index.py)
 
 You may add these export lines to a text file and load with `source`:
   source ise-env.sh
@@ -34,6 +35,7 @@ import requests
 import sys
 import time
 import yaml
+from mac_index import MACIndex
 
 FORMATS = ["csv", "json", "pretty", "line", "yaml"]
 FORMAT_DEFAULT = "json"
@@ -80,6 +82,7 @@ ISE_CV_DEFAULT_ENDPOINT_EXPORT_COLUMNS = [
 
 endpoint_groups_registry = {}  # id : name
 mac_registry = {}
+mac_index = None  # optional persistent index of existing ISE endpoint MACs
 
 
 def load_ieee_oui_dict(expiration: datetime.timedelta = datetime.timedelta(days=7)):
@@ -218,8 +221,9 @@ def get_random_mac(oui: str = None):
     oui = "{:06X}".format(random.randint(1, 16777216)) if oui is None else oui  # 16777216 == 2^24
     nic = random.randint(1, 16777216)  # starting number for MAC's NIC address
     mac = SEP.join([(oui + "{:06X}".format(nic))[idx : idx + 2] for idx in range(0, 12, 2)])  # Format MAC XX:XX:XX:XX:XX:XX
-    while mac in mac_registry:
-        mac = SEP.join([(oui + "{:06X}".format(nic + 1))[idx : idx + 2] for idx in range(0, 12, 2)])
+    while mac in mac_registry or (mac_index is not None and mac in mac_index):
+        nic = (nic + 1) % 16777216
+        mac = SEP.join([(oui + "{:06X}".format(nic))[idx : idx + 2] for idx in range(0, 12, 2)])
     mac_registry[mac] = True
     return mac
 
@@ -377,8 +381,12 @@ if __name__ == "__main__":
     argp.add_argument("-g", "--group", action="store", type=str, default="Unknown", help="endpoint group name; `random` chooses randomly")
     argp.add_argument("-l", "--level", default="WARNING", choices=[("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")], help="logging level")
     argp.add_argument("-t", "--timer", action="store_true", default=False, help="show total runtime, in seconds")
+    argp.add_argument("-x", "--index", action="store", type=str, default=None, help="MAC index file of existing ISE endpoints to avoid")
     args = argp.parse_args()
 
+    if args.index:
+        mac_index = MACIndex(args.index)
+
     if args.timer:
         start_time = time.time()
 
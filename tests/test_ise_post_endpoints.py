@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the ise-post-endpoints.py MAC de-duplication and bulk responses.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_ise_post_endpoints.py
+    pytest tests/test_ise_post_endpoints.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import pytest
+from mac_index import MACIndex
+
+
+@pytest.fixture
+def endpoints():
+    """
+    Loads the hyphenated ise-post-endpoints.py script as a module with an empty mac_cache.
+    """
+    spec = importlib.util.spec_from_file_location("ise_post_endpoints", "ise-post-endpoints.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_normalize_mac(endpoints):
+    assert endpoints.normalize_mac("11-22-33-44-55-66") == "11:22:33:44:55:66"
+    assert endpoints.normalize_mac("1122.3344.5566") == "11:22:33:44:55:66"
+    assert endpoints.normalize_mac("aabbccddeeff") == "AA:BB:CC:DD:EE:FF"
+    assert endpoints.normalize_mac(" bad ") == "BAD"
+
+
+def test_is_new(endpoints, tmp_path):
+    assert endpoints.is_new("11:22:33:44:55:66")
+    assert not endpoints.is_new("11-22-33-44-55-66"), "same MAC in another format"
+    assert not endpoints.is_new("1122.3344.5566")
+    assert endpoints.is_new("bad")
+    assert not endpoints.is_new("BAD")
+    endpoints.mac_index = MACIndex(str(tmp_path / "test.macidx"))
+    endpoints.mac_index.add("22:33:44:55:66:77")
+    assert not endpoints.is_new("22-33-44-55-66-77")
+    assert endpoints.is_new("not-a-mac"), "invalid MACs do not raise in the index"
+
+
+def test_load_ers_endpoints(endpoints, tmp_path):
+    filepath = tmp_path / "endpoints.json"
+    filepath.write_text(json.dumps({ "endpoint": [
+        { "ERSEndPoint": { "mac": "11:22:33:44:55:66", "description": "ERS" } },
+        { "mac": "11-22-33-44-55-66", "description": "duplicate" },
+        { "mac": "11:22:33:44:55:77" },
+    ]}))
+    new = [ e for e in endpoints.load_endpoints(str(filepath)) if endpoints.is_new(endpoints.unwrap_endpoint(e)['mac']) ]
+    assert len(new) == 2
+    assert endpoints.to_openapi_endpoint(new[0], "groupid") == { "name": "11:22:33:44:55:66", "mac": "11:22:33:44:55:66", "description": "ERS", "groupId": "groupid" }
+
+
+BATCH = [ { "name": mac, "mac": mac } for mac in ["11:22:33:44:55:01", "11:22:33:44:55:02", "11:22:33:44:55:03"] ]
+BULK_STATUS_PARTIAL = {  # a bulk status with one failed item
+    "BulkStatus": {
+        "bulkId": "4db69ae0-1bab-11ef-8b3b-c6ad1e0c1e52",
+        "mediaType": "endpoint",
+        "executionStatus": "COMPLETED",
+        "operationType": "create",
+        "resourcesCount": 3,
+        "successCount": 2,
+        "failCount": 1,
+        "resourcesStatus": [
+            { "id": "4e0b7a10-1bab-11ef-8b3b-c6ad1e0c1e52", "name": "11:22:33:44:55:01", "resourceExecutionStatus": "SUCCESS", "status": "" },
+            { "name": "11:22:33:44:55:02", "resourceExecutionStatus": "FAIL", "status": "Unable to create the endpoint. Endpoint already exists" },
+            { "id": "4e0c3d60-1bab-11ef-8b3b-c6ad1e0c1e52", "name": "11:22:33:44:55:03", "resourceExecutionStatus": "SUCCESS", "status": "" },
+        ],
+    }
+}
+BULK_RESULTS_PARTIAL = [  # per-item results
+    { "mac": "11:22:33:44:55:01", "status": "success" },
+    { "mac": "11:22:33:44:55:02", "status": "success" },
+    { "mac": "11:22:33:44:55:03", "status": "failure", "error": "Invalid groupId" },
+]
+BULK_ERROR = { "message": "Invalid JSON: Unexpected character", "code": 400 }
+
+
+def test_bulk_failures(endpoints):
+    assert endpoints.bulk_failures(BATCH, 200, BULK_STATUS_PARTIAL) == [ ("11:22:33:44:55:02", "Unable to create the endpoint. Endpoint already exists") ]
+    assert endpoints.bulk_failures(BATCH, 200, BULK_RESULTS_PARTIAL) == [ ("11:22:33:44:55:03", "Invalid groupId") ]
+    assert endpoints.bulk_failures(BATCH, 200, "4db69ae0-1bab-11ef-8b3b-c6ad1e0c1e52") == [], "a bulk request id has no item failures"
+    assert endpoints.bulk_failures(BATCH, 400, BULK_ERROR) == [ (e["mac"], "400 Invalid JSON: Unexpected character") for e in BATCH ]
+    assert endpoints.bulk_failures(BATCH, 500, "Internal Server Error") == [ (e["mac"], "500 Internal Server Error") for e in BATCH ]
+
+
+class FakeResponse:
+    def __init__(self, status:int=200, data=None):
+        self.status, self.data = status, data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self, content_type=None):
+        return self.data
+
+
+class FakeSession:
+    """
+    Returns the queued responses for each POST and records the batch sizes.
+    """
+    def __init__(self, responses:list=None):
+        self.responses, self.posts = responses, []
+
+    def post(self, url:str=None, data:str=None):
+        self.posts.append(len(json.loads(data)))
+        return self.responses.pop(0)
+
+
+def test_create_bulk_endpoints(endpoints, capsys):
+    endpoints.args = argparse.Namespace(verbose=False)
+    endpoints.TCP_LIMIT = 1  # batches in order
+    session = FakeSession([ FakeResponse(200, BULK_STATUS_PARTIAL), FakeResponse(400, BULK_ERROR), FakeResponse(200, "bulk-id") ])
+    results = asyncio.run(endpoints.create_bulk_endpoints(session, BATCH * 3, bulk_size=3))
+    assert session.posts == [3, 3, 3]
+    assert results == { "sent": 9, "failed": 4, "unauthorized": False }
+    output = capsys.readouterr().out
+    assert "✖ batch 1 200 1/3 failed" in output and "✖ batch 2 400 3/3 failed" in output
+
+
+def test_create_bulk_endpoints_unauthorized(endpoints, capsys):
+    endpoints.args = argparse.Namespace(verbose=False)
+    endpoints.TCP_LIMIT = 1
+    session = FakeSession([ FakeResponse(401, { "message": "Unauthorized" }) ] + [ FakeResponse(200, "bulk-id") for n in range(9) ])
+    results = asyncio.run(endpoints.create_bulk_endpoints(session, BATCH * 10, bulk_size=3))
+    assert results["unauthorized"]
+    assert session.posts == [3], "no more batches are sent after a 401"
+    assert "verify your credentials" in capsys.readouterr().err
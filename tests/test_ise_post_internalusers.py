@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the ise-post-internalusers.py CSV import and workers.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_ise_post_internalusers.py
+    pytest tests/test_ise_post_internalusers.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import asyncio
+import importlib.util
+import pytest
+
+
+@pytest.fixture
+def internalusers():
+    """
+    Loads the hyphenated ise-post-internalusers.py script as a module.
+    """
+    spec = importlib.util.spec_from_file_location("ise_post_internalusers", "ise-post-internalusers.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.args = argparse.Namespace(retries=2, file=None)
+    module.policy = module.PASSWORD_POLICY_DEFAULT
+    return module
+
+
+def test_read_internalusers_csv(internalusers, tmp_path):
+    filepath = tmp_path / "internalusers.csv"
+    with open("data/CSV/internalusers-pseudoco.csv", encoding="utf-8-sig") as fh:
+        header, row = fh.readline(), fh.readline()
+    encrypted = row.replace("C1sco12345,FALSE,Yes", "c2VjcmV0,TRUE,Yes", 1).replace(row.split(",")[0], "encrypted", 1)
+    filepath.write_text(header + row + encrypted)
+    users = list(internalusers.read_internalusers_csv(str(filepath), {"Employee": "id-1"}))
+    assert len(users) == 1, "encrypted passwords are rejected"
+    assert users[0]["InternalUser"]["identityGroups"] == "id-1"
+    assert users[0]["InternalUser"]["password"] == "C1sco12345"
+
+
+class FakeResponse:
+    status = 401
+
+    async def text(self):
+        return "Unauthorized"
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = 0
+
+    async def post(self, path: str = None, data: str = None):
+        self.posts += 1
+        return FakeResponse()
+
+
+def test_internaluser_creator_401(internalusers):
+    session = FakeSession()
+
+    async def create():
+        queue, unauthorized = asyncio.Queue(), asyncio.Event()
+        for n in range(10):
+            await queue.put(internalusers.generate_random_internaluser_data(groupid="id-1"))
+        tasks = [asyncio.create_task(internalusers.ise_internaluser_creator(queue, session, unauthorized)) for ii in range(2)]
+        await queue.join()
+        [task.cancel() for task in tasks]
+        return unauthorized.is_set()
+
+    assert asyncio.run(create())
+    assert session.posts <= 2, "workers stop posting after a 401"
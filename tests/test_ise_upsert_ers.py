@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test the ise-upsert-ers.py record readers and upserts.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_ise_upsert_ers.py
+    pytest tests/test_ise_upsert_ers.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import pytest
+
+
+@pytest.fixture
+def upsert():
+    """
+    Loads the hyphenated ise-upsert-ers.py script as a module.
+    """
+    spec = importlib.util.spec_from_file_location("ise_upsert_ers", "ise-upsert-ers.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.args = argparse.Namespace(retries=2, verbosity=0)
+    module.name_index, module.name_locks, module.references = {}, {}, {}
+    module.results = {"created": 0, "updated": 0, "failed": 0}
+    return module
+
+
+class FakeResponse:
+    def __init__(self, status: int = 200, data: dict = None, location: str = ""):
+        self.status, self.data, self.headers = status, data or {}, {"Location": location}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def text(self):
+        return json.dumps(self.data)
+
+    async def json(self):
+        return self.data
+
+
+class FakeSession:
+    """
+    Returns the queued responses for each (method, path) and records the requests.
+    """
+
+    def __init__(self, responses: dict = None):
+        self.responses, self.requests = responses, []
+
+    def request(self, method: str = None, url: str = None, **kwargs):
+        self.requests.append((method, url))
+        return self.responses[(method, url)].pop(0)
+
+    def get(self, url: str = None, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+def test_csv_row_to_record(upsert):
+    row = {
+        "name": "sw1",
+        "description": "a|b",  # not a list attribute
+        "authenticationSettings.radiusSharedSecret": "secret",
+        "NetworkDeviceGroupList": "Location#All Locations|Device Type#All Device Types",
+        "profileName": "",
+        None: ["extra"],
+    }
+    assert upsert.csv_row_to_record(row) == {
+        "name": "sw1",
+        "description": "a|b",
+        "authenticationSettings": {"radiusSharedSecret": "secret"},
+        "NetworkDeviceGroupList": ["Location#All Locations", "Device Type#All Device Types"],
+    }
+
+
+def test_read_records(upsert, tmp_path):
+    records = [{"name": "sgt1", "value": 1}, {"name": "sgt2", "value": 2}]
+    (tmp_path / "sgt.jsonl").write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+    (tmp_path / "sgt.csv").write_text("name,value\nsgt1,1\nsgt2,2\n")
+    (tmp_path / "sgt.yml").write_text("sgt:\n- name: sgt1\n  value: 1\n- name: sgt2\n  value: 2\n")
+    (tmp_path / "sgt.json").write_text(json.dumps({"Sgt": records}))
+    assert list(upsert.read_records(str(tmp_path / "sgt.jsonl"))) == records
+    assert list(upsert.read_records(str(tmp_path / "sgt.csv"))) == [{"name": "sgt1", "value": "1"}, {"name": "sgt2", "value": "2"}]
+    assert list(upsert.read_records(str(tmp_path / "sgt.yml"), resource="sgt")) == records
+    assert list(upsert.read_records(str(tmp_path / "sgt.json"), resource="sgt")) == records
+    assert list(upsert.read_records(str(tmp_path / "sgt.yml"), resource="sgacl")) == []
+    with pytest.raises(ValueError):
+        list(upsert.read_records(str(tmp_path / "sgt.txt")))
+
+
+def test_resolve_references(upsert):
+    references = {"identityGroups": {"Employee": "id-1", "Probes": "id-2"}}
+    user = {"name": "thomas", "identityGroups": "Employee, Probes"}
+    assert upsert.resolve_references(user, references)["identityGroups"] == "id-1,id-2"
+    assert upsert.resolve_references({"identityGroups": ["id-2"]}, references)["identityGroups"] == "id-2"
+    assert upsert.resolve_references({"name": "nogroups"}, references) == {"name": "nogroups"}
+    with pytest.raises(ValueError):
+        upsert.resolve_references({"identityGroups": "Unknown"}, references)
+
+
+def test_upsert_post_retry_rechecks(upsert):
+    path = "/ers/config/sgt"
+    session = FakeSession({
+        ("POST", path): [FakeResponse(502)],
+        ("GET", path): [FakeResponse(200, {"SearchResult": {"resources": [{"name": "sgt1", "id": "id-1"}]}})],
+    })
+    asyncio.run(upsert.upsert(session, path, "Sgt", 1, "sgt1", {"name": "sgt1"}))
+    assert session.requests == [("POST", path), ("GET", path)], "no duplicate POST"
+    assert upsert.results["created"] == 1
+    assert upsert.name_index == {"sgt1": "id-1"}
+
+
+def test_upsert_same_name_serialized(upsert):
+    path = "/ers/config/sgt"
+    session = FakeSession({
+        ("POST", path): [FakeResponse(201, location=f"{path}/id-1")],
+        ("PUT", f"{path}/id-1"): [FakeResponse(200)],
+    })
+
+    async def upsert_all():
+        record_q = asyncio.Queue()
+        workers = [asyncio.create_task(upsert.upsert_worker(session, path, "Sgt", record_q)) for idx in range(2)]
+        for n, record in enumerate([{"name": "sgt1", "value": 1}, {"Sgt": {"name": "sgt1", "value": 2}}], start=1):
+            await record_q.put((n, record))
+        await record_q.join()
+        [worker.cancel() for worker in workers]
+
+    asyncio.run(upsert_all())
+    assert session.requests == [("POST", path), ("PUT", f"{path}/id-1")]
+    assert upsert.results == {"created": 1, "updated": 1, "failed": 0}
@@ -20,9 +20,11 @@ Anatomy of a test is broken down into four steps:
 
 __license__ = "MIT - https://mit-license.org/"
 
-from isedc import ISEDC
+from isedc import ISEDC, AsyncISEDC
+from isedc_fake import FakeDataConnect
 
 import argparse
+import asyncio
 import datetime
 import logging
 import io
@@ -44,6 +46,7 @@ USERNAME = "dataconnect"
 PASSWORD = os.environ.get("ISE_DC_PASSWORD")
 INSECURE = True
 LEVEL = logging.DEBUG
+LIVE_MNT = pytest.mark.skipif(not (HOSTNAME and PASSWORD), reason="requires a live ISE MNT: export ISE_PMNT and ISE_DC_PASSWORD")
 
 
 def test_isedc_constants():
@@ -217,6 +220,294 @@ def test_isedc_init():
         assert isedc is not None
 
 
+def test_isedc_pool():
+    """Assert the session pool options without connecting."""
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC(hostname="localhost", password="password", pool_min=-1)
+    assert excinfo.type is AssertionError, "pool_min < 0"
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC(hostname="localhost", password="password", pool_min=2, pool_max=1)
+    assert excinfo.type is AssertionError, "pool_max < pool_min"
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC(hostname="localhost", password="password").acquire()
+    assert excinfo.type is AssertionError, "acquire() requires a pool"
+
+    isedc = ISEDC(hostname="localhost", password="password", pool_max=4)
+    pool = isedc.create_pool()  # pool_min=0 does not connect
+    assert pool.max == 4
+    assert pool.ping_interval == ISEDC.POOL_PING_INTERVAL
+    assert isedc.create_pool() is pool, "pool is a singleton"
+    isedc.close()
+    assert isedc.pool is None
+
+    assert ISEDC.is_session_error(Exception("ORA-02399: exceeded maximum connect time"))
+    assert ISEDC.is_session_error(Exception("ORA-03113: end-of-file on communication channel"))
+    assert not ISEDC.is_session_error(Exception("ORA-00942: table or view does not exist"))
+
+
+def test_isedc_nodes():
+    """Assert pooled sessions are spread over the MNT nodes with failover using stand-in session pools."""
+    import oracledb
+
+    class Pool:
+        def __init__(self, hostname, down=False):
+            self.hostname, self.down, self.busy, self.acquired = hostname, down, 0, 0
+
+        def acquire(self):
+            self.acquired += 1
+            if self.down:
+                raise oracledb.OperationalError(f"DPY-6005: cannot connect to database {self.hostname}")
+            self.busy += 1
+            return Connection()
+
+        def release(self, connection):
+            self.busy -= 1
+
+        drop = release
+
+        def close(self, force=False):
+            pass
+
+    class Connection:  # weakly referenceable like an oracledb connection
+        pass
+
+    class NodesISEDC(ISEDC):
+        def create_pool(self, hostname=None):
+            return self.pools.setdefault(hostname or self.hostname, Pool(hostname, down=(hostname in down)))
+
+    down = []
+    isedc = NodesISEDC(hostname="pmnt", hostnames=["smnt", "pmnt"], password="password", pool_max=4)
+    assert isedc.hostnames == ["pmnt", "smnt"]
+    connections = [isedc.acquire() for n in range(4)]
+    assert [isedc.node(c) for c in connections] == ["pmnt", "smnt", "pmnt", "smnt"], "the node with the fewest busy sessions"
+    [isedc.release(c) for c in connections]
+    assert isedc.pools["pmnt"].busy == isedc.pools["smnt"].busy == 0
+
+    down = ["pmnt"]
+    isedc = NodesISEDC(hostname="pmnt", hostnames=["smnt"], password="password", pool_max=4)
+    assert isedc.node(isedc.acquire()) == "smnt", "failover"
+    assert isedc.nodes() == ["smnt"], "pmnt is down"
+    isedc.acquire()
+    assert isedc.pools["pmnt"].acquired == 1, "a down node is skipped"
+    isedc.nodes_down["pmnt"] -= ISEDC.NODE_RETRY_INTERVAL
+    assert isedc.nodes() == ["pmnt", "smnt"], "tried again after NODE_RETRY_INTERVAL"
+    isedc.close()
+    assert isedc.pools == {} and isedc.pool is None
+
+
+def test_isedc_fetch_batches():
+    """Assert the fetch tuning options and adaptive batching without connecting."""
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC(hostname="localhost", password="password", arraysize=0)
+    assert excinfo.type is AssertionError, "arraysize < 1"
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC(hostname="localhost", password="password", arraysize=ISEDC.ARRAYSIZE_MAX + 1)
+    assert excinfo.type is AssertionError, "arraysize > ARRAYSIZE_MAX"
+
+    class Cursor:  # fetchmany() stand-in for a cursor over 10,000 rows
+        arraysize = 100
+        rows = [(n, f"row{n}") for n in range(10000)]
+
+        def fetchmany(self, size):
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return batch
+
+    isedc = ISEDC(hostname="localhost", password="password", arraysize=100)
+    batches = list(isedc.fetch_batches(Cursor()))
+    assert len(batches) == 100, "fixed arraysize"
+    assert sum(len(rows) for rows in batches) == 10000
+
+    cursor = Cursor()
+    batches = list(isedc.fetch_batches(cursor, adaptive=True))
+    assert sum(len(rows) for rows in batches) == 10000, "adaptive returns all rows"
+    assert len(batches) < 100, "adaptive batches grow"
+    assert cursor.arraysize <= ISEDC.ARRAYSIZE_MAX
+
+    cursor = Cursor()
+    batches = list(isedc.fetch_batches(cursor, adaptive=True, max_bytes=1))
+    assert len(batches) == 100, "memory cap prevents growth"
+
+
+def test_isedc_to_arrow(tmp_path):
+    """Assert the Arrow, DataFrame and Parquet fetch paths with a stand-in for the oracledb DataFrame fetch API."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    table = pa.table({"ID": list(range(250)), "NAME": [f"device{n}" for n in range(250)]})
+
+    class Connection:  # fetch_df_all() and fetch_df_batches() return Arrow-compatible DataFrames
+        def fetch_df_all(self, statement, parameters=None, arraysize=None):
+            return table
+
+        def fetch_df_batches(self, statement, parameters=None, size=None):
+            return table.to_batches(max_chunksize=size)
+
+    isedc = ISEDC(hostname="localhost", password="password", arraysize=100)
+    isedc.connection = Connection()
+    assert isedc.to_arrow("SELECT id, name FROM network_devices").equals(table)
+    assert [t.num_rows for t in isedc.to_arrow_batches("SELECT id, name FROM network_devices")] == [100, 100, 50]
+    assert list(isedc.to_dataframe("SELECT id, name FROM network_devices")["NAME"])[0:2] == ["device0", "device1"]
+
+    filepath = str(tmp_path / "devices.parquet")
+    assert isedc.to_parquet("SELECT id, name FROM network_devices", filepath) == 250
+    assert pq.read_table(filepath).equals(table)
+
+
+def test_isedc_timestamp_format():
+    """Assert DATE/TIMESTAMP columns are fetched as strings in the session format with stand-ins for the oracledb cursor."""
+    import oracledb
+
+    class Metadata:
+        def __init__(self, type_code):
+            self.type_code = type_code
+
+    class Cursor:  # records the var() and execute() calls
+        arraysize = 500
+        outputtypehandler = None
+
+        def __init__(self):
+            self.statements = []
+
+        def var(self, typ, arraysize=1):
+            return (typ, arraysize)
+
+        def execute(self, statement, parameters=None, **kwargs):
+            self.statements.append(statement)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+    class Connection:
+        def __init__(self):
+            self.cursors = []
+
+        def cursor(self):
+            self.cursors.append(Cursor())
+            return self.cursors[-1]
+
+    isedc = ISEDC(hostname="localhost", password="password", timestamp_format=ISEDC.TIMESTAMP_FORMATS["csv"])
+    cursor = Cursor()
+    assert isedc.output_type_handler(cursor, Metadata(oracledb.DB_TYPE_TIMESTAMP)) == (oracledb.DB_TYPE_VARCHAR, 500)
+    assert isedc.output_type_handler(cursor, Metadata(oracledb.DB_TYPE_DATE)) == (oracledb.DB_TYPE_VARCHAR, 500)
+    assert isedc.output_type_handler(cursor, Metadata(oracledb.DB_TYPE_NUMBER)) is None, "NUMBER is already int or float"
+
+    connection = Connection()
+    isedc.init_session(connection)
+    assert connection.cursors[0].statements == [
+        "ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY-MM-DD HH24:MI:SS' NLS_TIMESTAMP_FORMAT = 'YYYY-MM-DD HH24:MI:SS.FF6'"
+    ]
+    assert isedc.cursor(connection).outputtypehandler == isedc.output_type_handler
+
+    isedc = ISEDC(hostname="localhost", password="password", timestamp_format=ISEDC.TIMESTAMP_FORMATS["yaml"])
+    connection = Connection()
+    isedc.init_session(connection)
+    assert connection.cursors == [], "datetimes for YAML"
+    assert isedc.cursor(connection).outputtypehandler is None
+
+
+def test_isedc_time_slices():
+    """Assert the time slices are contiguous and cover the range."""
+    start = datetime.datetime(2024, 9, 1)
+    end = datetime.datetime(2024, 9, 8)
+    slices = ISEDC.time_slices(start, end, 7)
+    assert len(slices) == 7
+    assert slices[0] == (start, datetime.datetime(2024, 9, 2))
+    assert slices[-1][1] == end
+    assert all(slices[n][1] == slices[n + 1][0] for n in range(6)), "contiguous"
+
+    with pytest.raises(AssertionError) as excinfo:
+        ISEDC.time_slices(end, start, 7)
+    assert excinfo.type is AssertionError, "start after end"
+
+
+def test_isedc_query_slices(tmp_path):
+    """Assert sliced queries return all rows in time order with the FakeDataConnect backend."""
+    backend = FakeDataConnect(str(tmp_path / "fake_dc.db"))
+    backend.generate(500, days=7, seed=1)
+    start = datetime.datetime.now() - datetime.timedelta(days=3)
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, level=LEVEL, pool_max=4) as isedc:
+        rows = []
+        for headers, batch in isedc.query_slices("SELECT timestamp, id FROM radius_authentications ORDER BY timestamp", "timestamp", start, slices=7):
+            rows.extend(batch)
+        assert headers == ["timestamp", "id"]
+        assert [row[0] for row in rows] == sorted(row[0] for row in rows), "slices in time order"
+        cursor = isedc.query("SELECT COUNT(*) FROM radius_authentications WHERE timestamp >= :start", {"start": start})
+        assert 0 < len(rows) == cursor.fetchone()[0]
+
+
+def test_isedc_query_incremental(tmp_path):
+    """Assert incremental queries return only new rows across runs without connecting."""
+    t0 = datetime.datetime(2024, 9, 1, 12, 0, 0)
+    table = [(f"id{n}", t0 + datetime.timedelta(seconds=n // 2)) for n in range(10)]  # 2 rows per timestamp
+
+    class Cursor:  # returns the rows at or after the bound watermark
+        arraysize = 3
+        description = [("ID",), ("CREATE_TIME",)]
+
+        def __init__(self, watermark):
+            self.rows = [row for row in table if row[1] >= watermark]
+
+        def fetchmany(self, size):
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return batch
+
+    class FakeISEDC(ISEDC):
+        def query(self, q: str = None, parameters: dict = None):
+            assert ":watermark" in q
+            return Cursor(parameters["watermark"])
+
+    filepath = str(tmp_path / "watermarks.json")
+    isedc = FakeISEDC(hostname="localhost", password="password")
+
+    def run():
+        return [row for headers, rows in isedc.query_incremental("test", "SELECT * FROM t", "create_time", "id", start=t0, filepath=filepath) for row in rows]
+
+    del table[7:]  # rows committed so far; id6 shares the last timestamp with id7
+    assert len(run()) == 7
+    assert run() == [], "boundary rows are not repeated"
+    table.extend([(f"id{n}", t0 + datetime.timedelta(seconds=n // 2)) for n in range(7, 10)])
+    assert [row[0] for row in run()] == ["id7", "id8", "id9"], "late boundary row is not missed"
+    watermark = isedc.get_watermark("test", filepath)
+    assert datetime.datetime.fromisoformat(watermark["timestamp"]) == t0 + datetime.timedelta(seconds=4)
+    assert sorted(watermark["keys"]) == ["id8", "id9"]
+
+
+def test_isedc_async_pool():
+    """Assert the async session pool without connecting."""
+
+    async def main():
+        async with AsyncISEDC(hostname="localhost", password="password", pool_max=4) as isedc:
+            pool = isedc.create_pool()  # pool_min=0 does not connect
+            assert pool.max == 4
+            assert isedc.create_pool() is pool, "pool is a singleton"
+        return isedc
+
+    isedc = asyncio.run(main())
+    assert isedc.pool is None, "pool closed on exit"
+
+
+@LIVE_MNT
+def test_isedc_async_query():
+    """Assert concurrent async queries."""
+
+    async def main():
+        async with AsyncISEDC(hostname=HOSTNAME, password=PASSWORD, insecure=INSECURE, level=LEVEL, pool_max=2) as isedc:
+            return await asyncio.gather(isedc.fetchall("SELECT * FROM node_list"), isedc.tables())
+
+    (headers, rows), tables = asyncio.run(main())
+    assert "hostname" in headers
+    assert len(rows) > 0
+    assert "node_list" in tables
+
+
 def test_isedc_connection():
 
     isedc = ISEDC(hostname=HOSTNAME, password=PASSWORD, insecure=INSECURE, level=LEVEL)
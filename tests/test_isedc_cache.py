@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the QueryCache module.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_cache.py
+    pytest tests/test_isedc_cache.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import datetime
+import oracledb
+import os
+import pytest
+
+pytest.importorskip("pyarrow")
+from isedc_cache import QueryCache
+
+DESCRIPTION = [  # (name, type_code, display_size, internal_size, precision, scale, null_ok)
+    ("ID", oracledb.DB_TYPE_NUMBER, 10, 22, 10, 0, False),
+    ("NAME", oracledb.DB_TYPE_VARCHAR, 64, 64, None, None, True),
+    ("TOTAL", oracledb.DB_TYPE_NUMBER, 127, 22, 0, -127, True),
+    ("CREATE_TIME", oracledb.DB_TYPE_TIMESTAMP, 23, None, 0, 6, True),
+]
+ROWS = [
+    (1, "one", 10, datetime.datetime(2024, 9, 1, 12, 0, 0, 123456)),
+    (2, None, 2.5, None),
+    (3, "three", None, datetime.datetime(2024, 9, 3)),
+]
+
+
+def test_isedc_cache_key():
+    q = "SELECT *\n  FROM network_devices -- all devices\n"
+    assert QueryCache.key(q) == QueryCache.key("SELECT * FROM network_devices"), "normalized whitespace and comments"
+    assert QueryCache.key(q, {"name": "a"}) != QueryCache.key(q, {"name": "b"}), "bind values"
+    assert QueryCache.key(q) != QueryCache.key("select * from network_devices"), "literals are case-sensitive"
+    assert QueryCache.key("SELECT * FROM t WHERE name = 'a  b'") != QueryCache.key("SELECT * FROM t WHERE name = 'a b'"), "whitespace in literals"
+    assert QueryCache.key("SELECT '--a' FROM t") != QueryCache.key("SELECT '--b' FROM t"), "`--` in literals is not a comment"
+    assert QueryCache.key(q, timestamp_format="YYYY-MM-DD") != QueryCache.key(q), "timestamp strings are cached separately"
+    assert QueryCache.key(q, source="ise-pmnt:2484") != QueryCache.key(q, source="ise-lab:2484"), "each MNT has its own results"
+
+
+def test_isedc_cache_write_read(tmp_path):
+    cache = QueryCache(str(tmp_path))
+    key = QueryCache.key("SELECT * FROM t")
+    assert cache.get(key) is None, "miss"
+
+    batches = list(cache.write(key, DESCRIPTION, [ROWS[:2], ROWS[2:]]))
+    assert batches[0] == (["id", "name", "total", "create_time"], ROWS[:2]), "rows are passed through"
+    filepath = cache.get(key, ttl=60)
+    assert filepath is not None, "hit"
+    assert cache.get(key, ttl=-1) is None, "expired"
+
+    rows = [row for headers, rows in cache.read(filepath) for row in rows]
+    assert rows == ROWS
+    assert isinstance(rows[0][2], int), "integral NUMBER is an int"
+
+
+def test_isedc_cache_partial(tmp_path):
+    cache = QueryCache(str(tmp_path))
+    key = QueryCache.key("SELECT * FROM t")
+    batches = cache.write(key, DESCRIPTION, [ROWS[:2], ROWS[2:]])
+    next(batches)
+    batches.close()  # the consumer stops early
+    assert cache.get(key) is None, "partial results are not cached"
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_isedc_cache_evict(tmp_path):
+    cache = QueryCache(str(tmp_path), max_bytes=1)
+    for n in range(3):
+        list(cache.write(QueryCache.key(f"SELECT {n} FROM dual"), DESCRIPTION, [ROWS]))
+    assert len(cache.entries()) == 0, "all results exceed max_bytes"
+
+    cache.max_bytes = 1024 * 1024
+    for n in range(3):
+        list(cache.write(QueryCache.key(f"SELECT {n} FROM dual"), DESCRIPTION, [ROWS]))
+    assert len(cache.entries()) == 3
+    assert cache.clear() == 3
+
+
+def test_isedc_cache_timestamp_format(tmp_path):
+    cache = QueryCache(str(tmp_path))
+    key = QueryCache.key("SELECT * FROM t", timestamp_format="YYYY-MM-DD HH24:MI:SS")
+    rows = [(1, "one", 10, "2024-09-01 12:00:00"), (2, None, 2.5, None)]  # DATE/TIMESTAMP columns fetched as strings
+    assert list(cache.write(key, DESCRIPTION, [rows], timestamp_format="YYYY-MM-DD HH24:MI:SS"))[0][1] == rows
+    assert [row for headers, rows in cache.read(cache.get(key)) for row in rows] == rows
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the QueryCatalog module.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_catalog.py
+    pytest tests/test_isedc_catalog.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import datetime
+import os
+import pytest
+import re
+from isedc import ISEDC
+from isedc_catalog import QueryCatalog
+
+SQL = """--
+-- Authentications by username
+-- @param username str : the username
+-- @param days int 7 : last N days
+-- @param after datetime
+--
+
+SELECT * FROM radius_authentications WHERE username = :username AND timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY')
+"""
+
+
+def test_isedc_catalog_index():
+    catalog = QueryCatalog()
+    assert len(catalog) >= 97, "data/SQL is indexed"
+    assert "radius_auths_by_policy" in catalog
+    params = catalog.queries["radius_auths_by_policy"]["params"]
+    assert params["days"] == {"type": "int", "default": "30", "help": "last N days"}
+    assert ":days" in catalog.sql("radius_auths_by_policy")
+    with pytest.raises(KeyError):
+        catalog.sql("not_a_query")
+
+
+def test_isedc_catalog_bind(tmp_path):
+    (tmp_path / "auths_by_username.sql").write_text(SQL)
+    catalog = QueryCatalog(str(tmp_path))
+    query = catalog.queries["auths_by_username"]
+    assert query["description"] == "Authentications by username"
+    assert list(query["params"]) == ["username", "days", "after"]
+
+    with pytest.raises(ValueError):
+        catalog.bind("auths_by_username", {"after": "2024-09-01 00:00:00"})  # username is required
+    with pytest.raises(ValueError):
+        catalog.bind("auths_by_username", {"username": "thomas", "days": "x", "after": "2024-09-01 00:00:00"})
+
+    values = vars(catalog.argparser("auths_by_username").parse_args(["--username", "thomas", "--after", "2024-09-01 00:00:00"]))
+    sql, parameters = catalog.bind("auths_by_username", values)
+    assert sql == SQL
+    assert parameters == {"username": "thomas", "days": 7, "after": datetime.datetime(2024, 9, 1)}
+
+
+def test_isedc_catalog_sql_file_defaults():
+    isedc = ISEDC(hostname="localhost", password="password")
+    sql, parameters = isedc.load_sql("data/SQL/radius_auths_by_policy.sql")
+    assert parameters == {"days": 30}, "declared defaults are bound"
+    sql, parameters = isedc.load_sql("data/SQL/radius_auths_by_policy.sql", {"days": 7})
+    assert parameters == {"days": 7}
+    assert isedc.load_sql("SELECT 1 FROM dual") == ("SELECT 1 FROM dual", None)
+
+
+@pytest.mark.parametrize("filename", sorted(name for name in os.listdir("data/SQL") if name.endswith(".sql")))
+def test_isedc_catalog_sql_file_params(filename):
+    """Assert the `-- @param` header of each data/SQL file declares exactly its bind variables."""
+    catalog = QueryCatalog()
+    name = filename[: -len(QueryCatalog.SUFFIX)]
+    sql = re.sub(r"'(?:[^']|'')*'|\"[^\"]*\"|--[^\n]*", "", catalog.sql(name))  # literals and comments have no binds
+    binds = set(re.findall(r"(?<![:\w]):(\w+)", sql))
+    assert binds == set(catalog.queries[name]["params"]), f"{filename} @param header"
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Test ISEDC offline with the FakeDataConnect SQLite backend.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_fake.py
+    pytest tests/test_isedc_fake.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import concurrent.futures
+import datetime
+import gzip
+import oracledb
+import os
+import pytest
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from isedc import ISEDC
+from isedc_fake import FakeCursor, FakeDataConnect
+from isedc_schema import SchemaCatalog
+
+ROWS = 1000
+SQL_XFAIL = {  # data/SQL files the fake cannot run : reason
+    "compliance_counts_by_username.sql": "SQLite has no PIVOT",
+    "profiling_endpoint_profiles_by_probe.sql": "SQLite has no PIVOT",
+}
+
+
+@pytest.fixture(scope="module")
+def backend(tmp_path_factory):
+    backend = FakeDataConnect(str(tmp_path_factory.mktemp("fake") / "fake_dc.db"))
+    backend.generate(ROWS, days=7, seed=1)
+    return backend
+
+
+def test_isedc_fake_rewrite():
+    assert FakeDataConnect.rewrite("SELECT * FROM node_list FETCH FIRST 10 ROWS ONLY") == "SELECT * FROM node_list LIMIT 10"
+    assert "datetime('now', 'localtime', '-' || (:days) || ' days')" in FakeDataConnect.rewrite("WHERE timestamp > sysdate - NUMTODSINTERVAL(:days, 'DAY')")
+    assert FakeDataConnect.rewrite("TO_CHAR(timestamp, 'YYYY-MM-DD HH24:MI:SS')") == "strftime('%Y-%m-%d %H:%M:%S', timestamp)"
+    assert FakeDataConnect.rewrite("CAST(create_time AS TIMESTAMP)") == "create_time"
+    assert FakeDataConnect.rewrite("TO_CHAR(MIN(timestamp), 'YYYY-MM-DD')") == "strftime('%Y-%m-%d', MIN(timestamp))"
+    assert FakeDataConnect.rewrite("TO_CHAR(cpu_utilization, 'fm999D00')") == "TO_CHAR(cpu_utilization, 'fm999D00')", "number formats use TO_CHAR()"
+    assert FakeDataConnect.rewrite("CAST(SYSTIMESTAMP AS DATE) - CAST(MAX(timestamp) AS DATE)") == (
+        "(julianday(datetime('now', 'localtime')) - julianday(MAX(timestamp)))"
+    )
+    assert FakeDataConnect.rewrite("timestamp < (SYSDATE - 1)") == "timestamp < (datetime('now', 'localtime', '-1 days'))"
+
+
+def test_isedc_fake_functions(backend):
+    connection = backend.connect()
+    try:
+        assert connection.execute("SELECT TO_CHAR(12.5, 'fm999D00'), TO_CHAR(12.5, '999D00'), TO_CHAR(7, 'FM999')").fetchone() == ("12.50", "  12.50", "7")
+        assert connection.execute("SELECT TO_CHAR('2024-09-01 12:30:00', 'YYYY-MM-DD HH24'), TO_CHAR(NULL, 'FM999')").fetchone() == ("2024-09-01 12", None)
+        assert connection.execute("SELECT REGEXP_LIKE('0a:00', '^.[26AE].*', 'i'), REGEXP_LIKE('0a:00', '^.[26AE].*')").fetchone() == (1, 0)
+        assert connection.execute("SELECT MEDIAN(n) FROM (SELECT 1 AS n UNION ALL SELECT 5 UNION ALL SELECT 9 UNION ALL SELECT NULL)").fetchone() == (5,)
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        pytest.param(name, marks=pytest.mark.xfail(reason=SQL_XFAIL[name], strict=True)) if name in SQL_XFAIL else name
+        for name in sorted(name for name in os.listdir("data/SQL") if name.endswith(".sql"))
+    ],
+)
+def test_isedc_fake_sql_file(backend, filename):
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        q, parameters = isedc.load_sql(os.path.join("data/SQL", filename))
+        cursor = isedc.query(q, parameters)
+        assert cursor.description, "columns"
+        cursor.fetchall()
+
+
+def test_isedc_fake_query(backend, capsys):
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, arraysize=200) as isedc:
+        assert isedc.query("SELECT COUNT(*) FROM radius_authentications").fetchone()[0] == ROWS
+        isedc.csv_stream(isedc.query("data/SQL/radius_auths.sql", {"hours": 7 * 24 + 1}))
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("timestamp,calling_station_id,username"), "data/SQL query rewritten for SQLite"
+        assert len(lines) == ROWS + 1
+
+        cursor = isedc.query("SELECT id, timestamp FROM radius_authentications ORDER BY id FETCH FIRST 5 ROWS ONLY")
+        assert cursor.arraysize == 200, "cursor tuning"
+        rows = cursor.fetchall()
+        assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+        assert isinstance(rows[0][1], datetime.datetime), "TIMESTAMP columns are datetimes"
+
+
+def test_isedc_fake_pass_fail(backend):
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        passed, failed, flags = isedc.query(
+            "SELECT COUNT(CASE WHEN passed = 'Pass' THEN 1 END), COUNT(CASE WHEN passed = 'Fail' THEN 1 END), SUM(failed) FROM radius_authentications"
+        ).fetchone()
+        assert passed + failed == ROWS and failed > 0, "passed is 'Pass' or 'Fail' like Data Connect"
+        assert flags == failed, "failed is a numeric flag"
+        rows = isedc.query("data/SQL/radius_auths_pass_fail_counts_by_username.sql", {"days": 8}).fetchall()
+        assert sum(row[2] for row in rows) == failed, "data/SQL pass/fail queries count the fake failures"
+
+
+def test_isedc_fake_slices(backend):
+    end = datetime.datetime.now() + datetime.timedelta(minutes=1)
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, pool_max=4) as isedc:
+        batches = isedc.query_slices("SELECT id, timestamp FROM radius_authentications", "timestamp", end - datetime.timedelta(days=8), end, slices=4)
+        timestamps = [row[1] for headers, rows in batches for row in rows]
+    assert len(timestamps) == ROWS
+    assert len(set(timestamps)) == ROWS, "no duplicates between slices"
+
+
+def test_isedc_fake_slices_spooled(backend):
+    released = threading.Semaphore(0)
+
+    class ReleasingISEDC(ISEDC):
+        def release(self, connection=None, dead=False):
+            super().release(connection, dead)
+            released.release()
+
+    end = datetime.datetime.now() + datetime.timedelta(minutes=1)
+    with ReleasingISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, pool_max=4, arraysize=10) as isedc:
+        batches = isedc.query_slices("SELECT id, timestamp FROM radius_authentications", "timestamp", end - datetime.timedelta(days=8), end, slices=4)
+        try:
+            first = next(batches)
+            for slice in range(4):
+                assert released.acquire(timeout=10), "later slices finish while the consumer is still on the first slice"
+            timestamps = [row[1] for row in first[1]] + [row[1] for headers, rows in batches for row in rows]
+        finally:
+            batches.close()  # stop the slices after a failure
+    assert len(timestamps) == ROWS
+    assert len(set(timestamps)) == ROWS, "no duplicates between slices"
+    bounds = isedc.time_slices(end - datetime.timedelta(days=8), end, 4)
+    slices = [next(n for n, (start, stop) in enumerate(bounds) if start <= timestamp < stop) for timestamp in timestamps]
+    assert slices == sorted(slices), "slices in time order"
+
+
+def test_isedc_fake_release(backend):
+    released = []
+
+    class ReleasingISEDC(ISEDC):
+        def release(self, connection=None, dead=False):
+            released.append(connection)
+            super().release(connection, dead)
+
+    with ReleasingISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, pool_max=2) as isedc:
+        assert isedc.version()
+        assert len(released) == 1, "version() releases its session"
+        cursor = isedc.query("SELECT id FROM radius_authentications")
+        connection = cursor.connection
+        assert sum(len(rows) for rows in isedc.fetch_batches(cursor)) == ROWS
+        assert released[1:] == [connection], "exhausted query() cursors release their session"
+        isedc.release_cursor(cursor)
+        assert len(released) == 2, "released once"
+
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        connection = isedc.connect()
+        isedc.release(connection, dead=True)
+        assert isedc.connection is None, "only the dead connection is closed"
+        assert isedc.connect() is not connection
+        assert isedc.query("SELECT COUNT(*) FROM radius_authentications").fetchone()[0] == ROWS
+
+
+def test_isedc_fake_not_connected(backend):
+    attempts = []
+
+    class DroppedISEDC(ISEDC):
+        def _execute(self, cursor=None, q=None, parameters=None, reconnects=0):
+            attempts.append(reconnects)
+            if len(attempts) == 1:
+                raise oracledb.InterfaceError("DPY-1001: not connected to database")
+            return super()._execute(cursor, q, parameters, reconnects)
+
+    with DroppedISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, pool_max=2) as isedc:
+        assert isedc.query("SELECT COUNT(*) FROM radius_authentications").fetchone()[0] == ROWS, "DPY-1001 is retried"
+    assert attempts == [0, 1]
+
+
+def test_isedc_pools_concurrent(monkeypatch):
+    created = []
+
+    class Pool:
+        busy = 0
+
+        def acquire(self):
+            self.busy += 1
+            return Pool()  # a weakly referenceable session
+
+    def create_pool(**kwargs):
+        time.sleep(0.1)  # pool creation takes a while
+        created.append(kwargs["params"].host)
+        return Pool()
+
+    monkeypatch.setattr(oracledb, "create_pool", create_pool)
+    isedc = ISEDC(hostname="mnt1", hostnames=["mnt2"], password="password", pool_max=4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        sessions = list(executor.map(lambda n: isedc.acquire(), range(8)))
+    assert sorted(created) == ["mnt1", "mnt2"], "one pool per node"
+    assert sorted(isedc.node(session) for session in sessions) == ["mnt1"] * 4 + ["mnt2"] * 4, "sessions being acquired are counted"
+    assert isedc._acquiring == {hostname: 0 for hostname in isedc._acquiring}
+
+
+def test_isedc_fake_cached_timestamps(backend, tmp_path):
+    pytest.importorskip("pyarrow")
+    from isedc_cache import QueryCache
+
+    class Cursor:  # an oracledb cursor with DATE/TIMESTAMP columns fetched as strings
+        arraysize = 100
+        description = [("ID", oracledb.DB_TYPE_NUMBER, 10, 22, 10, 0, False), ("TIMESTAMP", oracledb.DB_TYPE_TIMESTAMP, 23, None, 0, 6, True)]
+
+        def __init__(self):
+            self.rows = [(1, "2024-09-01 12:00:00"), (2, None)]
+
+        def fetchmany(self, size):
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return batch
+
+    class StringTimestampsISEDC(ISEDC):
+        def query(self, q=None, parameters=None):
+            return Cursor()
+
+    isedc = StringTimestampsISEDC(hostname="localhost", password="password", cache=QueryCache(str(tmp_path)), timestamp_format="YYYY-MM-DD HH24:MI:SS")
+    miss = [row for headers, rows in isedc.cached("SELECT id, timestamp FROM t") for row in rows]
+    hit = [row for headers, rows in isedc.cached("SELECT id, timestamp FROM t") for row in rows]
+    assert miss == hit == [(1, "2024-09-01 12:00:00"), (2, None)]
+
+
+def test_isedc_fake_cached_source(backend, tmp_path):
+    pytest.importorskip("pyarrow")
+    from isedc_cache import QueryCache
+
+    other = FakeDataConnect(str(tmp_path / "other_dc.db"))
+    other.generate(10, days=1, seed=2)
+    cache = QueryCache(str(tmp_path / "cache"))
+    q = "SELECT COUNT(*) AS total FROM radius_authentications"
+    for source, rows in [(backend, ROWS), (other, 10), (backend, ROWS)]:
+        with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=source, cache=cache) as isedc:
+            assert [int(row[0]) for headers, batch in isedc.cached(q) for row in batch] == [rows], "results are cached per database"
+    assert len(cache.entries()) == 2
+    assert QueryCache.key(q, source="ise-pmnt:2484") != QueryCache.key(q, source="ise-lab:2484")
+
+
+def test_isedc_fake_cli_cache(backend, tmp_path):
+    pytest.importorskip("pyarrow")
+    env = {**os.environ, "HOME": str(tmp_path)}  # an empty cache and schema catalog
+    command = [sys.executable, "isedc.py", "--fake", backend.filepath, "--cache", "300", "-f", "csv"]
+    q = "SELECT id, timestamp FROM radius_authentications ORDER BY id FETCH FIRST 5 ROWS ONLY"
+    miss = subprocess.run([*command, q], env=env, capture_output=True, text=True, check=True)
+    hit = subprocess.run([*command, q], env=env, capture_output=True, text=True, check=True)
+    assert miss.stdout.splitlines()[0] == "id,timestamp"
+    assert len(miss.stdout.splitlines()) == 6
+    assert hit.stdout == miss.stdout, "cached DATE/TIMESTAMP values are unchanged"
+    assert [name for name in os.listdir(tmp_path / ".cache" / "isedc") if name.endswith(".parquet")], "cached"
+
+
+def test_isedc_fake_cli_error(backend, tmp_path):
+    env = {**os.environ, "HOME": str(tmp_path)}
+    command = [sys.executable, "isedc.py", "--fake", backend.filepath, "SELECT * FROM radius_authentication"]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    assert "Traceback" not in result.stderr, "SQLite errors are reported like Oracle errors"
+    assert "no such table: radius_authentication" in result.stdout + result.stderr
+    assert "radius_authentications" in result.stderr, "table name suggestions"
+
+
+def test_isedc_fake_schema(backend, tmp_path):
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        isedc.connect()
+        isedc.schema = SchemaCatalog(str(tmp_path / "schema.json"))
+        assert "radius_authentications" in isedc.tables(), "catalog built from all_tab_columns"
+        assert "timestamp_timezone" in isedc.schema.columns("radius_authentications", tz=True)
+        profile = isedc.profile("network_devices")
+        assert profile["rows"] == 200
+        assert profile["columns"]["name"]["width"] == len("switch001")
+
+
+def test_isedc_fake_metrics(backend, tmp_path):
+    hooked = []
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, arraysize=300, metrics_hook=hooked.append) as isedc:
+        isedc.add_metrics_hook(ISEDC.metrics_jsonl(str(tmp_path / "metrics.jsonl")))
+        isedc.add_metrics_hook(lambda metrics: 1 / 0)  # a failed hook does not fail the query
+        batches = list(isedc.fetch_batches(isedc.query("SELECT * FROM radius_authentications")))
+    assert len(batches) == 4
+    assert hooked == isedc.metrics
+    metrics = hooked[0]
+    assert metrics["rows"] == ROWS and metrics["batches"] == 4 and metrics["arraysize"] == 300
+    assert metrics["bytes"] > 0 and metrics["reconnects"] == 0
+    assert 0 <= metrics["execute"] <= metrics["first_row"] <= metrics["elapsed"]
+    assert metrics["sql"] == "SELECT * FROM radius_authentications"
+    assert (tmp_path / "metrics.jsonl").read_text().count("\n") == 1
+    assert ISEDC.format_metrics(metrics).startswith(f"{ROWS} rows in ")
+
+
+def test_isedc_fake_resumable(backend):
+    class DroppingISEDC(ISEDC):
+        drops = 2  # session errors to raise, each after 3 batches
+
+        def fetch_batches(self, cursor=None, adaptive=False, max_bytes=ISEDC.FETCH_BYTES_MAX):
+            for n, rows in enumerate(super().fetch_batches(cursor, adaptive, max_bytes)):
+                if n == 3 and self.drops > 0:
+                    self.drops -= 1
+                    raise oracledb.DatabaseError("ORA-02399: exceeded maximum connect time, you are being logged off")
+                yield rows
+
+    assert "(timestamp > :key_0) OR (timestamp = :key_0 AND id > :key_1)" in ISEDC.keyset_sql("SELECT 1", ["timestamp", "id"], resume=True)
+    with DroppingISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, arraysize=100) as isedc:
+        batches = list(isedc.query_resumable("SELECT id, timestamp FROM radius_authentications", ["timestamp", "id"]))
+        assert [metrics["reconnects"] for metrics in isedc.metrics] == [0, 1, 2]
+    rows = [row for headers, rows in batches for row in rows]
+    assert batches[0] == (["id", "timestamp"], [])
+    assert len(rows) == ROWS and len(set(rows)) == ROWS, "no rows repeated or lost"
+    assert rows == sorted(rows, key=lambda row: (row[1], row[0]))
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_isedc_fake_compressed_csv(backend, tmp_path, compression):
+    if compression == "zstd":
+        pa = pytest.importorskip("pyarrow")
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        isedc.csv_stream(isedc.query("SELECT * FROM radius_authentications"), str(tmp_path / "auths.csv"))
+        isedc.csv_stream(isedc.query("SELECT * FROM radius_authentications"), str(tmp_path / "auths.csv.z"), compression=compression)
+    if compression == "gzip":
+        data = gzip.decompress((tmp_path / "auths.csv.z").read_bytes())
+    else:
+        data = pa.input_stream(str(tmp_path / "auths.csv.z"), compression="zstd").read()  # one zstd frame per chunk
+    assert data == (tmp_path / "auths.csv").read_bytes()
+    assert len(data) > 4 * (tmp_path / "auths.csv.z").stat().st_size
+
+
+def test_isedc_fake_lob_sidecars(backend, tmp_path):
+    q = "SELECT id, substr(hex(zeroblob(id * 10)), 1, id * 10) AS details, zeroblob(id * 10) AS data FROM radius_authentications WHERE id <= 10 ORDER BY id"
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend, arraysize=4) as isedc:
+        rows = [row for headers, rows in isedc.lob_sidecars(isedc.query(q), str(tmp_path / "lobs"), max_size=50) for row in rows]
+    assert len(rows) == 10
+    assert rows[4] == (5, "0" * 50, b"\x00" * 50), "inline up to max_size"
+    assert rows[5][1] == str(tmp_path / "lobs" / "details_00000006.txt")
+    assert (tmp_path / "lobs" / "details_00000006.txt").read_text() == "0" * 60
+    assert (tmp_path / "lobs" / "data_00000010.bin").read_bytes() == b"\x00" * 100
+    assert len(list((tmp_path / "lobs").iterdir())) == 10
+
+
+def test_isedc_fake_guard(backend):
+    q = "SELECT id FROM radius_authentications"
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        estimate = isedc.explain(q)
+        assert estimate["rows"] == ROWS and estimate["cost"] > 0
+        assert "TABLE ACCESS FULL RADIUS_AUTHENTICATIONS" in estimate["plan"][1]
+        assert isedc.guard(q) == q, "no limits"
+        assert isedc.guard(q, max_rows=ROWS, max_cost=estimate["cost"]) == q, "within the limits"
+        assert len(isedc.query(isedc.guard(q, max_rows=10)).fetchall()) == 10, "capped"
+        with pytest.raises(ValueError, match="exceeds the maximum cost"):
+            isedc.guard(q, max_cost=1)
+        with pytest.raises(ValueError, match="exceeds the maximum rows"):
+            isedc.guard(q, max_rows=10, cap=False)
+        assert isedc.query("SELECT COUNT(*) FROM plan_table").fetchone()[0] == 0, "plan rows discarded"
+
+
+def test_isedc_fake_explain_binds(backend, monkeypatch):
+    executed = []
+    execute = FakeCursor.execute
+
+    def recording_execute(self, q=None, parameters=(), **kwargs):
+        executed.append((q, parameters))
+        return execute(self, q, parameters, **kwargs)
+
+    monkeypatch.setattr(FakeCursor, "execute", recording_execute)
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        estimate = isedc.explain("data/SQL/radius_auths.sql")  # `-- @param hours` is bound by query()
+        assert estimate["rows"] == ROWS, "bind variables estimate a full scan"
+        q = isedc.guard("data/SQL/radius_auths.sql", max_rows=10)
+        assert len(isedc.query(q, {"hours": 7 * 24 + 1}).fetchall()) == 10, "capped"
+    explains = [(q, parameters) for q, parameters in executed if q.startswith("EXPLAIN PLAN")]
+    assert len(explains) == 2
+    assert all(":hours" in q and not parameters for q, parameters in explains), "EXPLAIN PLAN without bind values"
+    with pytest.raises(sqlite3.ProgrammingError, match="ORA-01006"):
+        backend.connect().cursor().execute("EXPLAIN PLAN SET STATEMENT_ID = 'X' FOR SELECT * FROM node_list WHERE hostname = :name", {"name": "x"})
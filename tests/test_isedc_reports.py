@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test the isedc_reports report engine offline.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_reports.py
+    pytest tests/test_isedc_reports.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import io
+import time
+import pytest
+
+pd = pytest.importorskip("pandas")
+from isedc import ISEDC
+from isedc_fake import FakeDataConnect
+from isedc_reports import REPORT, run_report
+from isedc_rollup import RollupStore
+
+
+def test_isedc_reports_concurrent_order():
+    class SlowISEDC(ISEDC):
+        def to_dataframe(self, q=None, parameters=None):
+            time.sleep(float(q))  # the query is the section time
+            if q == "0.0":
+                raise ValueError("ORA-00942: table or view does not exist")
+            return pd.DataFrame({"SECONDS": [q], "DROPPED": [1]})
+
+    sections = [{"title": f"Section {n}", "sql": seconds, "drop": ["DROPPED"]} for n, seconds in enumerate(["0.3", "0.1", "0.0", "0.2"])]
+    fh = io.StringIO()
+    start = time.time()
+    run_report(SlowISEDC(hostname="localhost", password="password", pool_max=4), sections, fh, workers=4)
+    assert time.time() - start < 0.5, "about the time of the slowest section"
+    output = fh.getvalue()
+    assert [line for line in output.splitlines() if line.startswith("## ")] == [f"## Section {n}" for n in range(4)], "declared order"
+    assert "DROPPED" not in output
+    assert "✖ ORA-00942" in output, "a failed section does not stop the report"
+
+
+def test_isedc_reports_fake(tmp_path):
+    backend = FakeDataConnect(str(tmp_path / "fake_dc.db"))
+    backend.generate(1000, seed=1)
+    fh = io.StringIO()
+    store = RollupStore(str(tmp_path / "rollups.db"))
+    with ISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, pool_max=4, backend=backend) as isedc:
+        run_report(isedc, REPORT, fh, workers=4)
+        output = fh.getvalue()
+        assert output.count("\n## ") + 1 == len([section for section in REPORT if not section.get("rollup")]), "no rollups"
+
+        fh = io.StringIO()
+        store.refresh(isedc)
+        run_report(isedc, REPORT, fh, workers=4, store=store)
+    output = fh.getvalue()
+    assert output.count("\n## ") + 1 == len(REPORT)
+    assert "✖" not in output
+    assert "UDI_VID" not in output, "dropped node_list columns"
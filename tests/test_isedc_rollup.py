@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test the RollupStore module with the FakeDataConnect backend.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_rollup.py
+    pytest tests/test_isedc_rollup.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import datetime
+from isedc import ISEDC
+from isedc_fake import FakeDataConnect
+from isedc_rollup import RollupStore
+
+
+def test_isedc_rollup_refresh(tmp_path):
+    backend = FakeDataConnect(str(tmp_path / "fake_dc.db"))
+    backend.generate(2000, days=3, seed=1)
+    queries = []
+
+    class CountingISEDC(ISEDC):
+        def query(self, q=None, parameters=None):
+            queries.append(parameters)
+            return super().query(q, parameters)
+
+    store = RollupStore(str(tmp_path / "rollups.db"))
+    now = datetime.datetime.now() + datetime.timedelta(hours=2)  # all generated rows are in complete hours
+    with CountingISEDC(hostname="fake_dc", password=FakeDataConnect.PASSWORD, backend=backend) as isedc:
+        counts = store.refresh(isedc, names=["radius_auths_hourly"], days=4, now=now)
+        assert counts["radius_auths_hourly"] > 0
+        assert len(queries) == 4 * 24 // RollupStore.WINDOW_HOURS, "one query per window"
+        connection = store.connect()
+        assert connection.execute("SELECT SUM(total) FROM radius_auths_hourly").fetchone()[0] == 2000, "all rows counted once"
+        assert connection.execute("SELECT COUNT(*) FROM radius_auths_hourly WHERE failure_reason IS NULL").fetchone()[0] == 0
+        source = backend.connect()
+        failed, passed = source.execute("SELECT COUNT(CASE WHEN passed = 'Fail' THEN 1 END), COUNT(CASE WHEN passed = 'Pass' THEN 1 END) FROM radius_authentications").fetchone()
+        source.close()
+        assert failed > 0
+        assert connection.execute("SELECT SUM(failed), SUM(passed) FROM radius_auths_hourly").fetchone() == (failed, passed), "failures counted"
+
+        queries.clear()
+        assert store.refresh(isedc, names=["radius_auths_hourly"], now=now)["radius_auths_hourly"] == 0, "no new hours"
+        assert queries == []
+        store.refresh(isedc, names=["radius_auths_hourly"], now=now + datetime.timedelta(hours=3))
+        assert len(queries) == 1, "only the new hours"
+        assert queries[0]["until"] - queries[0]["since"] == datetime.timedelta(hours=3)
+        assert connection.execute("SELECT SUM(total) FROM radius_auths_hourly").fetchone()[0] == 2000, "windows are replaced, not added"
+
+    assert store.get_watermark("radius_auths_hourly") == (now + datetime.timedelta(hours=3)).replace(minute=0, second=0, microsecond=0)
+    assert store.prune(keep_days=1, now=now) > 0
+    assert connection.execute("SELECT MIN(hour) FROM radius_auths_hourly").fetchone()[0] >= RollupStore.hour(now - datetime.timedelta(days=1))
+    connection.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test the SchemaCatalog module.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_isedc_schema.py
+    pytest tests/test_isedc_schema.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import os
+import time
+from isedc_schema import SchemaCatalog
+
+ROWS = [  # (table_name, column_name, data_type, nullable) from all_tab_columns
+    ("NETWORK_DEVICES", "ID", "VARCHAR2", "N"),
+    ("NETWORK_DEVICES", "NAME", "VARCHAR2", "Y"),
+    ("RADIUS_AUTHENTICATIONS", "ID", "NUMBER", "N"),
+    ("RADIUS_AUTHENTICATIONS", "TIMESTAMP_TIMEZONE", "TIMESTAMP(6) WITH TIME ZONE", "Y"),
+    ("RADIUS_AUTHENTICATIONS", "USERNAME", "VARCHAR2", "Y"),
+    ("RADIUS_AUTHENTICATIONS", "TIMESTAMP", "TIMESTAMP(6)", "Y"),
+    ("RADIUS_ACCOUNTING", "ID", "NUMBER", "N"),
+]
+
+
+def test_isedc_schema_lookups(tmp_path):
+    catalog = SchemaCatalog(str(tmp_path / "schema.json"))
+    assert catalog.is_stale(), "empty"
+    assert catalog.rebuild(ROWS, version="19.0.0.0.0") == 3
+    assert not catalog.is_stale()
+    assert catalog.is_stale(version="21.0.0.0.0"), "new database version"
+    assert catalog.tables() == ["network_devices", "radius_accounting", "radius_authentications"]
+    assert "RADIUS_AUTHENTICATIONS" in catalog
+    assert catalog.columns("radius_authentications") == ["id", "timestamp_timezone", "username", "timestamp"], "defined order"
+    assert catalog.columns("radius_authentications", tz=True) == ["timestamp_timezone"]
+    assert catalog.select("radius_authentications") == "SELECT id, username, timestamp FROM radius_authentications"
+    assert catalog.columns("not_a_view") == []
+
+
+def test_isedc_schema_suggest(tmp_path):
+    catalog = SchemaCatalog(str(tmp_path / "schema.json"))
+    catalog.rebuild(ROWS)
+    assert catalog.suggest("radius_authentication")[0] == "radius_authentications"
+    assert "radius_accounting" in catalog.suggest("radius_acct")
+    assert catalog.suggest("usrname", view="radius_authentications")[0] == "username"
+
+
+def test_isedc_schema_save_load(tmp_path):
+    filepath = str(tmp_path / "schema.json")
+    catalog = SchemaCatalog(filepath)
+    catalog.rebuild(ROWS, version="19.0.0.0.0")
+    catalog.save()
+    assert not os.path.exists(f"{filepath}.tmp")
+
+    loaded = SchemaCatalog(filepath)
+    assert loaded.version == "19.0.0.0.0"
+    assert loaded.views == catalog.views
+    loaded.created = time.time() - SchemaCatalog.TTL_DEFAULT - 1
+    assert loaded.is_stale(), "expired"
+
+
+def test_isedc_schema_default_filepath(tmp_path, monkeypatch):
+    import isedc_schema
+    from isedc import ISEDC
+
+    monkeypatch.setattr(isedc_schema, "SCHEMA_DIRECTORY_DEFAULT", str(tmp_path))
+    assert SchemaCatalog.default_filepath("ise-mnt") == str(tmp_path / "schema-ise-mnt.json")
+    assert SchemaCatalog.default_filepath() == str(tmp_path / "schema.json")
+    catalog = SchemaCatalog(SchemaCatalog.default_filepath("ise-mnt"))
+    catalog.rebuild(ROWS)
+    catalog.save()  # e.g. `isedc_schema.py refresh` with ISE_PMNT=ise-mnt
+    isedc = ISEDC(hostname="ise-mnt", password="password")
+    assert isedc.schema_catalog().filepath == SchemaCatalog.default_filepath("ise-mnt"), "the CLI and ISEDC share the catalog"
+    assert len(isedc.schema_catalog()) == 3
+
+
+def test_isedc_schema_isedc(tmp_path):
+    from isedc import ISEDC
+
+    isedc = ISEDC(hostname="localhost", password="password")
+    isedc.schema = SchemaCatalog(str(tmp_path / "schema.json"))
+    isedc.schema.rebuild(ROWS)  # a fresh catalog needs no database round trip
+    assert isedc.tables() == ["network_devices", "radius_accounting", "radius_authentications"]
+    assert isedc.columns("radius_authentications") == ["id", "timestamp", "timestamp_timezone", "username"]
+
+
+def test_isedc_schema_profile(tmp_path, capsys):
+    from isedc import ISEDC
+
+    class FakeCursor:
+        def __init__(self, row):
+            self.row = row
+
+        def fetchone(self):
+            return self.row
+
+    queries = []
+
+    class FakeISEDC(ISEDC):
+        def query(self, q=None, parameters=None):
+            queries.append(q)
+            return FakeCursor((3, 5, 0, 3, None, 1, 2, None, 0, 3))  # rows, (width, nulls, distinct) per non-TZ column
+
+    isedc = FakeISEDC(hostname="localhost", password="password")
+    isedc.schema = SchemaCatalog(str(tmp_path / "schema.json"))
+    isedc.schema.rebuild(ROWS)
+    profile = isedc.profile("radius_authentications")
+    assert len(queries) == 1, "one round trip for all columns"
+    assert "timestamp_timezone" not in queries[0]
+    assert profile["rows"] == 3
+    assert profile["columns"]["username"] == {"type": "VARCHAR2", "width": 0, "nulls": 1, "distinct": 2}
+    assert profile["columns"]["timestamp"]["width"] == 26, "Python datetime string width"
+
+    assert isedc.column_widths("radius_authentications") == {"id": 5, "username": 0, "timestamp": 26}
+    assert len(queries) == 1, "saved profile"
+    assert SchemaCatalog(isedc.schema.filepath).get_profile("radius_authentications") == profile
+
+    batches = [(["id", "username"], [(12345, "alice"), (7, None)]), (["id", "username"], [(42, "bob")])]
+    isedc.fixed_stream(iter(batches), {"id": 5, "username": 0}, format="table")
+    assert capsys.readouterr().out.splitlines() == ["id     username", "-----  --------", "12345  alice", "    7", "   42  bob"]
+
+
+def test_isedc_schema_profile_long(tmp_path):
+    from isedc import ISEDC
+
+    queries = []
+
+    class FakeCursor:
+        def fetchone(self):
+            return (2, None, None, None, None, None, None, 10, 0, None)
+
+    class FakeISEDC(ISEDC):
+        def query(self, q=None, parameters=None):
+            queries.append(q)
+            return FakeCursor()
+
+    isedc = FakeISEDC(hostname="localhost", password="password")
+    isedc.schema = SchemaCatalog(str(tmp_path / "schema.json"))
+    isedc.schema.rebuild([("LOGS", "TEXT", "LONG", "Y"), ("LOGS", "DATA", "LONG RAW", "Y"), ("LOGS", "NOTE", "CLOB", "Y")])
+    profile = isedc.profile("logs")
+    assert queries == ["SELECT COUNT(*), NULL, NULL, NULL, NULL, NULL, NULL, MAX(LENGTH(note)), COUNT(*) - COUNT(note), NULL FROM logs"]
+    assert profile["columns"]["text"] == {"type": "LONG", "width": 0, "nulls": None, "distinct": None}
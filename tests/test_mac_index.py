@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the MACIndex module.
+
+Usage:
+    python -m pytest -v --log-level=DEBUG --log-file=tests/test_output.txt tests/test_mac_index.py
+    pytest tests/test_mac_index.py            # run a single tests file
+
+"""
+__license__ = "MIT - https://mit-license.org/"
+
+import os
+import pytest
+from mac_index import MACIndex
+
+MACS = [
+    "11:22:33:44:55:66",  # onebyte
+    "11-22-33-44-55-77",  # IEEE
+    "1122.3344.5588",  # twobyte
+    "DEADBEEFCAFE",  # no separators
+]
+
+
+def test_mac_index_to_int():
+    assert MACIndex.to_int("00:00:00:00:00:01") == 1
+    assert MACIndex.to_int("ff:ff:ff:ff:ff:ff") == 2**48 - 1
+    assert MACIndex.to_int("1122.3344.5566") == MACIndex.to_int("11:22:33:44:55:66")
+    assert MACIndex.to_mac(MACIndex.to_int("11-22-33-44-55-66")) == "11:22:33:44:55:66"
+    with pytest.raises(ValueError):
+        MACIndex.to_int("11:22:33:44:55")
+    with pytest.raises(ValueError):
+        MACIndex.to_int(None)
+
+
+def test_mac_index_contains(tmp_path):
+    index = MACIndex(str(tmp_path / "test.macidx"))
+    assert len(index) == 0
+    assert index.update(MACS) == len(MACS)
+    assert index.update(MACS) == 0, "no duplicates"
+    for mac in MACS:
+        assert mac in index, f"{mac} in pending"
+    index.merge()
+    for mac in MACS:
+        assert mac in index, f"{mac} in sorted array"
+    assert "00:00:00:00:00:00" not in index
+    assert "11:22:33:44:55" not in index, "invalid MACs are never in the index"
+    assert "not-a-mac" not in index
+    assert None not in index
+    assert list(index.macs) == sorted(index.macs)
+
+
+def test_mac_index_save_load(tmp_path):
+    filepath = str(tmp_path / "test.macidx")
+    index = MACIndex(filepath)
+    index.rebuild(MACS)
+    index.add("AA:BB:CC:DD:EE:FF")
+    index.save()
+    assert os.path.exists(filepath)
+    assert not os.path.exists(f"{filepath}.tmp")
+
+    loaded = MACIndex(filepath)
+    assert len(loaded) == len(MACS) + 1
+    assert loaded.created == index.created
+    assert "aa:bb:cc:dd:ee:ff" in loaded
+
+
+def test_mac_index_invalid_file(tmp_path):
+    filepath = tmp_path / "invalid.macidx"
+    filepath.write_bytes(b"not an index")
+    with pytest.raises(ValueError):
+        MACIndex(str(filepath))